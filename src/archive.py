@@ -0,0 +1,408 @@
+# archive.py
+"""Compact binary archive of step traces with a random-access index.
+
+An archive holds any number of simulations.  Each record stores the operands
+and the A and Q registers of every step as fixed-width little-endian 64-bit
+words (ceil(N / 64) words per register), followed by one op-code byte per
+step.  An index of record offsets sits at the end of the file, so readers
+mmap the archive and jump straight to one simulation, or one step, without
+parsing anything else.
+
+    python src/batch.py pairs.txt --trace --archive runs.wmt -o /dev/null
+    python src/archive.py info runs.wmt
+    python src/archive.py to-csv runs.wmt -o runs.csv               # batch.py --trace layout
+    python src/archive.py to-csv runs.wmt --layout gui -o gui.csv   # GUI Export CSV layout
+    python src/archive.py from-csv runs.csv -o runs.wmt
+
+Layout (all integers little-endian):
+
+    header   8s magic, I version, 4x
+    record   A operand, B operand (W words each), A column, Q column
+             (steps * W words each), op codes (steps bytes), padded to 8
+    index    one INDEX_ENTRY per record
+    meta     JSON {"algorithms": [...]} naming the algorithm ids
+    footer   Q index offset, Q record count, Q meta length, 8s magic
+"""
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from batch import HEADER, format_trace, parse_trace
+from wordmult import (ALGORITHMS, get_algorithm, int_to_twos_complement, product_from_registers,
+                      twos_complement_to_int)
+from wordmult.limbs import limb_labels
+from wordmult.steptrace import OP_LABELS, WORD_BITS, StepTrace
+
+MAGIC = b"WMTRACE1"
+FOOTER_MAGIC = b"WMINDEX1"
+VERSION = 1
+HEADER_STRUCT = struct.Struct("<8sI4x")
+INDEX_ENTRY = struct.Struct("<QIIBB6x")  # offset, bits, steps, algorithm id, signed
+FOOTER = struct.Struct("<QQQ8s")
+LITTLE = sys.byteorder == "little"
+OP_CODES = {label: code for code, label in enumerate(OP_LABELS)}
+
+ArchiveEntry = namedtuple("ArchiveEntry", "index algorithm bits signed steps A_bin B_bin")
+
+def words_per_register(bits):
+    return (bits + WORD_BITS - 1) // WORD_BITS
+
+def _pad8(n):
+    return -n % 8
+
+# ========== Encoding ==========
+def _encode_column(values, bits):
+    if bits <= WORD_BITS:
+        col = values if isinstance(values, array) else array("Q", values)
+        if not LITTLE:
+            col = array("Q", col)
+            col.byteswap()
+        return col.tobytes()
+    size = words_per_register(bits) * 8
+    return b"".join(v.to_bytes(size, "little") for v in values)
+
+def encode_record(A_bin, B_bin, N, steps):
+    """Serialise one trace (a StepTrace or (step, A, Q, op) rows) into record bytes."""
+    if not isinstance(steps, StepTrace):
+        trace = StepTrace(N)
+        for _, a, q, op in steps:
+            trace.append(int(a, 2), int(q, 2), OP_CODES[op])
+        steps = trace
+    a_col, q_col, ops = steps.columns()
+    return b"".join((
+        _encode_column((int(A_bin, 2), int(B_bin, 2)), N),
+        _encode_column(a_col, N),
+        _encode_column(q_col, N),
+        bytes(ops),
+    ))
+
+# ========== Writing ==========
+class TraceArchiveWriter:
+    """Append-only writer; the index is written by close()."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(HEADER_STRUCT.pack(MAGIC, VERSION))
+        self._offset = HEADER_STRUCT.size
+        self._index = []
+        self._algorithms = []
+
+    def _algorithm_id(self, key):
+        if key not in self._algorithms:
+            self._algorithms.append(key)
+        return self._algorithms.index(key)
+
+    def add(self, algorithm_key, A_bin, B_bin, N, signed, steps):
+        """Append one simulation and return its record number."""
+        return self.add_encoded(algorithm_key, N, signed, len(steps), encode_record(A_bin, B_bin, N, steps))
+
+    def add_encoded(self, algorithm_key, N, signed, step_count, payload):
+        """Append a record already produced by encode_record (e.g. in a worker process)."""
+        self._index.append(INDEX_ENTRY.pack(self._offset, N, step_count, self._algorithm_id(algorithm_key),
+                                            bool(signed)))
+        self._file.write(payload)
+        self._file.write(b"\0" * _pad8(len(payload)))
+        self._offset += len(payload) + _pad8(len(payload))
+        return len(self._index) - 1
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        if self._file is None:
+            return
+        meta = json.dumps({"algorithms": self._algorithms}).encode()
+        self._file.write(b"".join(self._index))
+        self._file.write(meta)
+        self._file.write(FOOTER.pack(self._offset, len(self._index), len(meta), FOOTER_MAGIC))
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ========== Reading ==========
+class TraceArchive:
+    """Read-only, mmap-backed view of an archive."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER_STRUCT.size + FOOTER.size:
+                raise ValueError(f"{path} is not a trace archive or is truncated")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_index()
+        except ValueError:
+            self._mm.close()
+            raise
+        self._lookup = None
+
+    def _read_index(self):
+        """Check the header and footer and load the metadata; every offset must lie inside the file."""
+        magic, version = HEADER_STRUCT.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a trace archive (version {VERSION})")
+        footer_start = len(self._mm) - FOOTER.size
+        self._index_offset, self._count, meta_len, footer_magic = FOOTER.unpack_from(self._mm, footer_start)
+        if footer_magic != FOOTER_MAGIC:
+            raise ValueError(f"{self.path} has no index (was the writer closed?)")
+        meta_start = self._index_offset + self._count * INDEX_ENTRY.size
+        if self._index_offset < HEADER_STRUCT.size or meta_start + meta_len > footer_start:
+            raise ValueError(f"{self.path} is not a trace archive or is truncated")
+        try:
+            self.algorithms = json.loads(self._mm[meta_start:meta_start + meta_len])["algorithms"]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError(f"{self.path} has unreadable metadata") from None
+        if not isinstance(self.algorithms, list):
+            raise ValueError(f"{self.path} has unreadable metadata")
+
+    def __len__(self):
+        return self._count
+
+    def _entry_fields(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError("record index out of range")
+        return INDEX_ENTRY.unpack_from(self._mm, self._index_offset + i * INDEX_ENTRY.size)
+
+    def _word(self, offset, bits):
+        size = words_per_register(bits) * 8
+        return int.from_bytes(self._mm[offset:offset + size], "little")
+
+    def entry(self, i):
+        """Return the ArchiveEntry of record i (no step data is read)."""
+        offset, bits, steps, algo, signed = self._entry_fields(i)
+        size = words_per_register(bits) * 8
+        A_bin = format(self._word(offset, bits), f"0{bits}b")
+        B_bin = format(self._word(offset + size, bits), f"0{bits}b")
+        return ArchiveEntry(i, self.algorithms[algo], bits, bool(signed), steps, A_bin, B_bin)
+
+    def entries(self):
+        for i in range(self._count):
+            yield self.entry(i)
+
+    def _column(self, offset, bits, steps):
+        size = words_per_register(bits) * 8
+        if bits <= WORD_BITS:
+            col = array("Q")
+            col.frombytes(self._mm[offset:offset + steps * size])
+            if not LITTLE:
+                col.byteswap()
+            return col
+        return [int.from_bytes(self._mm[o:o + size], "little") for o in range(offset, offset + steps * size, size)]
+
+    def trace(self, i):
+        """Return record i as a StepTrace."""
+        offset, bits, steps, _, _ = self._entry_fields(i)
+        size = words_per_register(bits) * 8
+        a_off = offset + 2 * size
+        q_off = a_off + steps * size
+        ops_off = q_off + steps * size
+        return StepTrace.from_columns(bits, self._column(a_off, bits, steps), self._column(q_off, bits, steps),
+                                      array("B", self._mm[ops_off:ops_off + steps]))
+
+    def load(self, i):
+        """Return record i as (steps, product_bin, product_val), like Algorithm.run()."""
+        steps = self.trace(i)
+        _, signed = self._entry_fields(i)[3:]
+        A, Q, _ = steps.registers(len(steps) - 1)
+        return (steps, *product_from_registers(A, Q, steps.bits, bool(signed)))
+
+    def step(self, i, k):
+        """Return step k of record i as (step, A_bin, Q_bin, operation), reading only that step."""
+        offset, bits, steps, _, _ = self._entry_fields(i)
+        if k < 0:
+            k += steps
+        if not 0 <= k < steps:
+            raise IndexError("step index out of range")
+        size = words_per_register(bits) * 8
+        a_off = offset + (2 + k) * size
+        q_off = offset + (2 + steps + k) * size
+        op = self._mm[offset + (2 + 2 * steps) * size + k]
+        return (k, format(self._word(a_off, bits), f"0{bits}b"), format(self._word(q_off, bits), f"0{bits}b"),
+                OP_LABELS[op])
+
+    # ---------- lookup by operands ----------
+    def find(self, algorithm_key, A_bin, B_bin, N, signed=False):
+        """Record number of a simulation, or None.  The lookup table is built on first use."""
+        if self._lookup is None:
+            self._lookup = {(e.A_bin, e.B_bin, e.bits, e.signed, e.algorithm): e.index for e in self.entries()}
+        return self._lookup.get((A_bin, B_bin, N, bool(signed), algorithm_key))
+
+    def get(self, key):
+        """TraceCache-style lookup: key is (A_bin, B_bin, N, signed, algorithm_key)."""
+        A_bin, B_bin, N, signed, algorithm_key = key
+        i = self.find(algorithm_key, A_bin, B_bin, N, signed)
+        return None if i is None else self.load(i)
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ========== CSV conversion ==========
+def _operand(binstr, signed):
+    return twos_complement_to_int(binstr) if signed else int(binstr, 2)
+
+def write_csv(archive, out):
+    """Write every record to the csv writer out in the batch --trace layout."""
+    out.writerow(HEADER + ["trace"])
+    for e in archive.entries():
+        steps, product_bin, product_val = archive.load(e.index)
+        costs = get_algorithm(e.algorithm).costs(steps)
+        out.writerow([_operand(e.A_bin, e.signed), _operand(e.B_bin, e.signed), "signed" if e.signed else "unsigned",
+                      e.bits, e.algorithm, product_bin, product_val, costs["iterations"], costs["additions"],
+                      costs["subtractions"], format_trace(steps)])
+
+def write_gui_csv(archive, out):
+    """Write every record to the csv writer out in the GUI "Export CSV" layout.
+
+    Consecutive records of the same operands and mode (one batch pair, every
+    algorithm) share one export block, as in the GUI; blocks follow each other.
+    """
+    from wordmult.export import iter_export_rows
+
+    def flush(block):
+        if block:
+            e = block[0]
+            results = {entry.algorithm: archive.load(entry.index) for entry in block}
+            out.writerows(iter_export_rows(_operand(e.A_bin, e.signed), _operand(e.B_bin, e.signed),
+                                           "signed" if e.signed else "unsigned", e.bits, results))
+
+    block, run = [], None
+    for e in archive.entries():
+        pair = (e.A_bin, e.B_bin, e.bits, e.signed)
+        if pair != run or any(entry.algorithm == e.algorithm for entry in block):
+            flush(block)
+            block, run = [], pair
+        block.append(e)
+    flush(block)
+
+def _steps_from_cells(N, rows):
+    trace = StepTrace(N)
+    for A_bin, Q_bin, label in rows:
+        trace.append(int(A_bin, 2), int(Q_bin, 2), OP_CODES[label])
+    return trace
+
+def _batch_records(rows, header):
+    col = {name: i for i, name in enumerate(header)}
+    if "trace" not in col:
+        raise ValueError("CSV has no trace column (rerun batch.py with --trace)")
+    for row in rows:
+        if not row:
+            continue
+        N, signed = int(row[col["bits"]]), row[col["mode"]] == "signed"
+        A_bin = int_to_twos_complement(int(row[col["a"]]), N)
+        B_bin = int_to_twos_complement(int(row[col["b"]]), N)
+        yield row[col["algorithm"]], A_bin, B_bin, N, signed, _steps_from_cells(N, parse_trace(row[col["trace"]]))
+
+def _export_records(rows):
+    """Records from a GUI export (main.iter_export_rows layout), possibly several back to back."""
+    labels = {a.label: key for key, a in ALGORITHMS.items()}
+    labels.update(limb_labels())  # limb engines at every limb width
+    operands = None
+    section = None
+    for row in rows:
+        if row and row[0] == "Operands":
+            fields = dict(cell.split("=", 1) for cell in row[1:])
+            operands = (int(fields["A"]), int(fields["B"]), fields["Mode"] == "signed", int(fields["Bits"]))
+        elif row and len(row) == 1 and row[0].endswith(" Steps") and row[0][:-6] in labels:
+            section = (labels[row[0][:-6]], [])
+        elif section is not None and row and row[0] != "Step":
+            section[1].append(row[1:4])
+        elif section is not None and not row:
+            a, b, signed, N = operands
+            yield (section[0], int_to_twos_complement(a, N), int_to_twos_complement(b, N), N, signed,
+                   _steps_from_cells(N, section[1]))
+            section = None
+
+def read_csv(rows, writer):
+    """Append every simulation in a batch --trace CSV or a GUI export CSV to writer; return the count."""
+    rows = iter(rows)
+    first = next(rows, [])
+    if first[:len(HEADER)] == HEADER:
+        records = _batch_records(rows, first)
+    elif first == ["Word Multiplier Simulation Export"]:
+        records = _export_records(rows)
+    else:
+        raise ValueError("unrecognised CSV layout")
+    count = 0
+    for key, A_bin, B_bin, N, signed, steps in records:
+        writer.add(get_algorithm(key).key, A_bin, B_bin, N, signed, steps)
+        count += 1
+    return count
+
+# ========== CLI ==========
+def build_parser():
+    p = argparse.ArgumentParser(description="Inspect and convert binary step-trace archives.")
+    sub = p.add_subparsers(dest="command", required=True)
+    i = sub.add_parser("info", help="list the simulations in an archive")
+    i.add_argument("archive")
+    i.add_argument("--step", type=int, nargs=2, metavar=("RECORD", "STEP"), help="print a single step")
+    t = sub.add_parser("to-csv", help="convert an archive to the batch --trace CSV or the GUI export CSV layout")
+    t.add_argument("archive")
+    t.add_argument("-o", "--output", default="-", help="CSV output path (default: stdout)")
+    t.add_argument("--layout", choices=("batch", "gui"), default="batch",
+                   help="batch: one row per simulation (batch.py --trace); gui: the GUI's Export CSV blocks")
+    f = sub.add_parser("from-csv", help="convert a batch --trace CSV or a GUI CSV export to an archive")
+    f.add_argument("csv", help="CSV input path (default: stdin)", nargs="?", default="-")
+    f.add_argument("-o", "--output", required=True, help="archive path")
+    return p
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "from-csv":
+        src = sys.stdin if args.csv == "-" else open(args.csv, newline="")
+        try:
+            with TraceArchiveWriter(args.output) as writer:
+                count = read_csv(csv.reader(src), writer)
+        except (ValueError, KeyError) as e:
+            parser.error(f"bad CSV: {e}")
+        finally:
+            if src is not sys.stdin:
+                src.close()
+        print(f"{count} simulations archived", file=sys.stderr)
+        return 0
+    try:
+        archive = TraceArchive(args.archive)
+    except ValueError as e:
+        parser.error(str(e))
+    with archive:
+        if args.command == "to-csv":
+            dst = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+            try:
+                (write_gui_csv if args.layout == "gui" else write_csv)(archive, csv.writer(dst))
+            finally:
+                if dst is not sys.stdout:
+                    dst.close()
+        elif args.step:
+            try:
+                print(*archive.step(*args.step), sep="  ")
+            except IndexError as e:
+                record, step = args.step
+                parser.error(f"record {record}, step {step}: {e} (the archive has {len(archive)} records)")
+        else:
+            print(f"{len(archive)} simulations")
+            for e in archive.entries():
+                mode = "signed" if e.signed else "unsigned"
+                print(f"{e.index:6d}  {e.algorithm:12s} {e.bits:5d}-bit {mode:8s} {e.steps:5d} steps  "
+                      f"A={_operand(e.A_bin, e.signed)} B={_operand(e.B_bin, e.signed)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
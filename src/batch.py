@@ -0,0 +1,230 @@
+# batch.py
+"""Headless batch runner for the Shift-and-Add and Booth simulators.
+
+Reads operand pairs (one "a b" or "a,b" per line) from a file or stdin,
+spreads them across a process pool in chunks and streams CSV results to
+stdout or a file as the chunks complete.  With --archive the full traces are
+also bulk-written to a binary trace archive (see archive.py).
+
+    python src/batch.py pairs.txt --signed --workers 8 -o results.csv
+    python src/batch.py pairs.txt --archive runs.wmt -o results.csv
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+from collections import deque
+
+from wordmult import (ALGORITHMS, DEFAULT_ALGORITHMS, MAX_BITS, get_algorithm, int_to_twos_complement,
+                      min_bits_for_signed, min_bits_for_unsigned)
+from wordmult.analysis import chunked
+from wordmult.tracecache import TraceCache
+
+HEADER = ["a", "b", "mode", "bits", "algorithm", "product_bin", "product", "steps", "additions", "subtractions"]
+
+# ========== Input ==========
+def fits(x, bits, signed=False):
+    """True if x is representable in a bits-bit word (two's complement when signed)."""
+    if signed:
+        return -(1 << (bits - 1)) <= x < (1 << (bits - 1))
+    return 0 <= x < (1 << bits)
+
+def parse_pairs(lines, signed=False, errors=None, bits=None):
+    """Yield (line_no, a, b) for every valid operand line; report bad lines to errors.
+
+    With a fixed bits, pairs that do not fit that width are reported and skipped.
+    """
+    errors = errors or sys.stderr
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.replace(",", " ").split()
+        try:
+            if len(parts) != 2:
+                raise ValueError("expected two operands")
+            if not signed and ("-" in parts[0] or "-" in parts[1]):
+                raise ValueError("Unsigned mode doesn't accept negative")
+            a, b = int(parts[0]), int(parts[1])
+            # reject pairs wider than MAX_BITS here rather than inside a worker
+            min_bits_for_signed(a, b) if signed else min_bits_for_unsigned(a, b)
+            if bits is not None and not (fits(a, bits, signed) and fits(b, bits, signed)):
+                raise ValueError(f"does not fit {bits}-bit {'signed' if signed else 'unsigned'} words")
+        except ValueError as e:
+            print(f"line {line_no}: skipped {line!r} ({e})", file=errors)
+            continue
+        yield line_no, a, b
+
+# ========== Workers ==========
+def format_trace(steps):
+    """Flatten a step list into a single CSV cell: 'A:Q:Operation' joined by ';'."""
+    return ";".join(f"{s[1]}:{s[2]}:{s[3]}" for s in steps)
+
+def parse_trace(cell):
+    """Inverse of format_trace: return [(A_bin, Q_bin, operation), ...]."""
+    return [tuple(step.split(":", 2)) for step in cell.split(";")] if cell else []
+
+_worker_caches = {}
+
+def worker_cache(cache_dir):
+    """Per-process TraceCache for a disk directory (None: no caching)."""
+    if cache_dir is None:
+        return None
+    if cache_dir not in _worker_caches:
+        _worker_caches[cache_dir] = TraceCache(disk_dir=cache_dir)
+    return _worker_caches[cache_dir]
+
+def run_pair(a, b, signed=False, bits=None, trace=False, algorithms=DEFAULT_ALGORITHMS, cache=None,
+             records=None):
+    """Run each named algorithm on one operand pair and return its output rows.
+
+    With a TraceCache, pairs already computed (in this or an earlier run) are not recomputed.
+    When records is a list, an archive record (key, bits, signed, steps, payload) is appended
+    to it for every trace.
+    """
+    if bits is None:
+        bits = min_bits_for_signed(a, b) if signed else min_bits_for_unsigned(a, b)
+    A_bin = int_to_twos_complement(a, bits)
+    B_bin = int_to_twos_complement(b, bits)
+    mode = "signed" if signed else "unsigned"
+    rows = []
+    for key in algorithms:
+        algorithm = get_algorithm(key)
+        if cache is not None:
+            steps, product_bin, product_val = cache.run(algorithm, A_bin, B_bin, bits, signed=signed)
+        else:
+            steps, product_bin, product_val = algorithm.run(A_bin, B_bin, bits, signed=signed)
+        costs = algorithm.costs(steps)
+        row = [a, b, mode, bits, key, product_bin, product_val, costs["iterations"],
+               costs["additions"], costs["subtractions"]]
+        if trace:
+            row.append(format_trace(steps))
+        rows.append(row)
+        if records is not None:
+            from archive import encode_record  # archive.py imports this module
+            records.append((key, bits, signed, len(steps), encode_record(A_bin, B_bin, bits, steps)))
+    return rows
+
+def run_chunk(job):
+    """Pool entry point: job is (pairs, signed, bits, trace, algorithms, cache_dir, archive).
+
+    Returns (rows, records); records is None unless archive is true.
+    """
+    pairs, signed, bits, trace, algorithms, cache_dir, archive = job
+    cache = worker_cache(cache_dir)
+    rows = []
+    records = [] if archive else None
+    for _, a, b in pairs:
+        rows.extend(run_pair(a, b, signed=signed, bits=bits, trace=trace, algorithms=algorithms, cache=cache,
+                             records=records))
+    return rows, records
+
+def imap_bounded(pool, func, jobs, max_pending):
+    """Ordered map over a pool that never has more than max_pending jobs in flight.
+
+    Pool.imap drains its whole input up front, which defeats streaming; this
+    keeps memory flat by only pulling the next job when one completes.
+    """
+    pending = deque()
+    for job in jobs:
+        pending.append(pool.apply_async(func, (job,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+def run_batch(lines, out, signed=False, bits=None, trace=False, workers=None, chunk_size=1000,
+              algorithms=DEFAULT_ALGORITHMS, cache_dir=None, archive=None):
+    """Stream results for every pair in lines to the csv writer out; return the pair count.
+
+    archive, if given, is an archive.TraceArchiveWriter that receives every trace.
+    """
+    algorithms = [get_algorithm(key).key for key in algorithms]
+    pairs = parse_pairs(lines, signed=signed, bits=bits)
+    jobs = ((chunk, signed, bits, trace, algorithms, cache_dir, archive is not None)
+            for chunk in chunked(pairs, chunk_size))
+    workers = workers or os.cpu_count() or 1
+    count = 0
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        results = imap_bounded(pool, run_chunk, jobs, max_pending=workers * 2) if pool else map(run_chunk, jobs)
+        for rows, records in results:
+            out.writerows(rows)
+            count += len(rows) // len(algorithms)
+            for record in records or ():
+                archive.add_encoded(*record)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    return count
+
+# ========== CLI ==========
+def word_width(text):
+    """argparse type for --bits: an integer in 1..MAX_BITS."""
+    try:
+        bits = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid width {text!r}") from None
+    if not 1 <= bits <= MAX_BITS:
+        raise argparse.ArgumentTypeError(f"width must be 1..{MAX_BITS} bits, got {bits}")
+    return bits
+
+def positive_int(text):
+    """argparse type for counts such as --chunk-size: an integer of at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid count {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def build_parser():
+    p = argparse.ArgumentParser(description="Batch-run Shift-and-Add and Booth multiplication traces.")
+    p.add_argument("input", nargs="?", default="-", help="operand pair file, one 'a b' per line (default: stdin)")
+    p.add_argument("-o", "--output", default="-", help="CSV output path (default: stdout)")
+    p.add_argument("--signed", action="store_true", help="treat operands as signed two's complement")
+    p.add_argument("--bits", type=word_width, default=None, help="fixed word width (default: detect per pair)")
+    p.add_argument("--algorithms", default=",".join(DEFAULT_ALGORITHMS),
+                   help=f"comma-separated algorithm keys ({', '.join(ALGORITHMS)})")
+    p.add_argument("--trace", action="store_true", help="include the full step trace column")
+    p.add_argument("--cache-dir", default=None, help="persistent trace cache; pairs already cached are skipped")
+    p.add_argument("--archive", default=None, help="also write every trace to this binary trace archive")
+    p.add_argument("--workers", type=positive_int, default=None, help="worker processes (default: CPU count)")
+    p.add_argument("--chunk-size", type=positive_int, default=1000, help="pairs per worker task")
+    return p
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        algorithms = [get_algorithm(key.strip()).key for key in args.algorithms.split(",")]
+    except ValueError as e:
+        parser.error(str(e))
+    src = sys.stdin if args.input == "-" else open(args.input, newline="")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    archive = None
+    if args.archive:
+        from archive import TraceArchiveWriter
+        archive = TraceArchiveWriter(args.archive)
+    try:
+        writer = csv.writer(dst)
+        header = HEADER + ["trace"] if args.trace else HEADER
+        writer.writerow(header)
+        count = run_batch(src, writer, signed=args.signed, bits=args.bits, trace=args.trace,
+                          workers=args.workers, chunk_size=args.chunk_size, algorithms=algorithms,
+                          cache_dir=args.cache_dir, archive=archive)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+        if archive is not None:
+            archive.close()
+    print(f"{count} pairs processed", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
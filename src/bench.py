@@ -0,0 +1,243 @@
+# bench.py
+"""Benchmarks for the algorithm core, the exporters and the GUI update path.
+
+    python src/bench.py run -o benchmarks/baseline.json
+    python src/bench.py run --widths 8,64,1024 -o current.json
+    python src/bench.py compare benchmarks/baseline.json current.json --threshold 0.15
+    python src/bench.py limbs --widths 1024,4096 --limb-bits 32
+
+"run" times every case at every width and stores the results as JSON.
+"compare" prints the ratio of each case against a stored baseline and exits
+with status 1 if any case got slower than the threshold allows.  "limbs"
+puts the limb engines (wordmult.limbs) next to the bit-serial algorithms:
+operation counts and wall time of one multiply per width.
+
+GUI cases (virtual table/log updates, _draw_bits_on_canvas) need a display;
+run under Xvfb on headless machines (xvfb-run python src/bench.py run --gui).
+They are skipped when no display is available.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from wordmult import (ALGORITHMS, booth_steps, get_algorithm, int_to_twos_complement, limb_algorithm,
+                      shift_and_add_steps, twos_complement_to_int)
+from wordmult.export import PDF_AVAILABLE, build_export_rows, write_csv_rows, write_pdf_rows, write_txt_rows
+
+DEFAULT_WIDTHS = (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+MIN_TIME = 0.05  # seconds per timing sample
+
+# ========== Timing ==========
+def time_call(func, repeat=5, min_time=MIN_TIME):
+    """Return {"best", "median", "loops"} seconds per call, timeit-style."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return {"best": min(samples), "median": statistics.median(samples), "loops": loops}
+
+def operands(width):
+    """Deterministic pseudo-random N-bit operand patterns for a width."""
+    rng = random.Random(width)
+    return f"{rng.getrandbits(width):0{width}b}", f"{rng.getrandbits(width):0{width}b}"
+
+# ========== Cases ==========
+def core_cases(width):
+    A_bin, B_bin = operands(width)
+    value = twos_complement_to_int(A_bin)
+    cases = {
+        "shift_and_add_steps": lambda: shift_and_add_steps(A_bin, B_bin, width, signed=True),
+        "booth_steps": lambda: booth_steps(A_bin, B_bin, width, signed=True),
+        "int_to_twos_complement": lambda: int_to_twos_complement(value, width),
+        "twos_complement_to_int": lambda: twos_complement_to_int(A_bin),
+    }
+    for key, algorithm in ALGORITHMS.items():
+        if key not in ("shift_add", "booth"):
+            cases[f"algorithm:{key}"] = lambda algorithm=algorithm: algorithm.run(A_bin, B_bin, width, signed=True)
+    return cases
+
+def export_cases(width, tmpdir):
+    A_bin, B_bin = operands(width)
+    results = {key: ALGORITHMS[key].run(A_bin, B_bin, width, signed=True) for key in ("shift_add", "booth")}
+    a, b = twos_complement_to_int(A_bin), twos_complement_to_int(B_bin)
+    rows = build_export_rows(a, b, "signed", width, results)
+    cases = {
+        "_gather_export_rows": lambda: build_export_rows(a, b, "signed", width, results),
+        "write_csv": lambda: write_csv_rows(os.path.join(tmpdir, "bench.csv"), rows),
+        "write_txt": lambda: write_txt_rows(os.path.join(tmpdir, "bench.txt"), rows),
+    }
+    if PDF_AVAILABLE:
+        cases["write_pdf"] = lambda: write_pdf_rows(os.path.join(tmpdir, "bench.pdf"), rows)
+    return cases
+
+def gui_cases(width, app):
+    """Cases for the Tk update path, run against a live (possibly offscreen) app."""
+    A_bin, B_bin = operands(width)
+    steps = shift_and_add_steps(A_bin, B_bin, width)[0]
+    pane = app.panes["shift_add"]
+
+    def table_update():
+        pane.table.set_source(steps.__getitem__)
+        for i in range(len(steps)):
+            pane.table.set_count(i + 1)
+        app.update_idletasks()
+
+    def log_update():
+        pane.log.set_source(steps.__getitem__)
+        for i in range(len(steps)):
+            pane.log.set_count(i + 1)
+        app.update_idletasks()
+
+    frames = [s[1] + " " + s[2] for s in steps[len(steps) // 2:len(steps) // 2 + 2]]
+    flip = [0]
+
+    def draw_bits():
+        # alternate between two consecutive steps so every call has bits to update
+        flip[0] ^= 1
+        app._draw_bits_on_canvas(pane.anim_canvas, frames[flip[0] % len(frames)])
+        app.update_idletasks()
+
+    return {"table_update": table_update, "log_update": log_update, "_draw_bits_on_canvas": draw_bits}
+
+def make_app():
+    """Return a withdrawn MacStyleApp, or None when no display is available."""
+    try:
+        from main import MacStyleApp
+        app = MacStyleApp()
+    except Exception as e:  # TclError without a display
+        print(f"skipping GUI benchmarks: {e}", file=sys.stderr)
+        return None
+    app.withdraw()
+    return app
+
+# ========== Commands ==========
+def run(widths, repeat=5, gui=False, only=None, progress=sys.stderr):
+    results = {}
+    app = make_app() if gui else None
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for width in widths:
+            groups = [core_cases(width), export_cases(width, tmpdir)]
+            if app is not None and width <= 1024:  # wider rows are unreadable in a Treeview anyway
+                groups.append(gui_cases(width, app))
+            for cases in groups:
+                for name, func in cases.items():
+                    if only and only not in name:
+                        continue
+                    key = f"{name}[{width}]"
+                    results[key] = time_call(func, repeat=repeat)
+                    print(f"{key:40s} {results[key]['best'] * 1e6:12.1f} us", file=progress)
+    if app is not None:
+        app.destroy()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def limb_table(widths, keys, limb_bits, repeat=5, out=sys.stdout):
+    """Print steps, adds, subtracts, shifts, limb products and best wall time of one signed multiply per width."""
+    from wordmult.limbs import METHODS
+    algorithms = [limb_algorithm(key, limb_bits) if key in METHODS else get_algorithm(key) for key in keys]
+    print(f"{'bits':>5}  {'algorithm':28s} {'steps':>7} {'adds':>7} {'subs':>7} {'shifts':>7} {'limb mul':>8} "
+          f"{'ms':>9}", file=out)
+    for width in widths:
+        A_bin, B_bin = operands(width)
+        expected = twos_complement_to_int(A_bin) * twos_complement_to_int(B_bin)
+        for algorithm in algorithms:
+            steps, _, product_val = algorithm.run(A_bin, B_bin, width, signed=True)
+            costs = algorithm.costs(steps)
+            best = time_call(lambda: algorithm.run(A_bin, B_bin, width, signed=True), repeat=repeat)["best"]
+            note = "" if product_val == expected else "  (wrong signed product)"
+            print(f"{width:5d}  {algorithm.label:28s} {costs['iterations']:7d} {costs['additions']:7d} "
+                  f"{costs['subtractions']:7d} {costs['shifts']:7d} {costs.get('limb_products', 0):8d} "
+                  f"{best * 1000:9.2f}{note}", file=out)
+
+def compare(baseline, current, threshold=0.10, out=sys.stdout):
+    """Print per-case ratios; return the list of cases slower than 1 + threshold."""
+    regressions = []
+    base, cur = baseline["results"], current["results"]
+    print(f"{'case':40s} {'baseline':>12s} {'current':>12s} {'ratio':>7s}", file=out)
+    for key in sorted(base.keys() & cur.keys()):
+        ratio = cur[key]["best"] / base[key]["best"] if base[key]["best"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{key:40s} {base[key]['best'] * 1e6:10.1f}us {cur[key]['best'] * 1e6:10.1f}us {ratio:7.2f}{flag}",
+              file=out)
+    missing = base.keys() - cur.keys()
+    if missing:
+        print(f"{len(missing)} baseline case(s) not in the current run", file=out)
+    return regressions
+
+def build_parser():
+    p = argparse.ArgumentParser(description="Benchmark the multiplier core, exporters and GUI update path.")
+    sub = p.add_subparsers(dest="command", required=True)
+    r = sub.add_parser("run", help="run the benchmarks and save JSON results")
+    r.add_argument("-o", "--output", default=None, help="JSON results path (default: print only)")
+    r.add_argument("--widths", default=",".join(map(str, DEFAULT_WIDTHS)), help="comma-separated word widths")
+    r.add_argument("--repeat", type=int, default=5, help="timing samples per case")
+    r.add_argument("--gui", action="store_true", help="also time the Tk update path (needs a display)")
+    r.add_argument("--only", default=None, help="run only cases whose name contains this text")
+    c = sub.add_parser("compare", help="compare a run against a stored baseline")
+    c.add_argument("baseline")
+    c.add_argument("current")
+    c.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown fraction (default 0.10)")
+    m = sub.add_parser("limbs", help="operation counts and wall time of the limb engines vs the bit-serial ones")
+    m.add_argument("--widths", default="1024,4096", help="comma-separated word widths")
+    m.add_argument("--limb-bits", type=int, default=32, help="limb width of the limb engines (default 32)")
+    m.add_argument("--algorithms", default="shift_add,booth,booth4,schoolbook,karatsuba,toom3",
+                   help="comma-separated algorithm keys")
+    m.add_argument("--repeat", type=int, default=3, help="timing samples per algorithm")
+    return p
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "run":
+        widths = [int(w) for w in args.widths.split(",")]
+        data = run(widths, repeat=args.repeat, gui=args.gui, only=args.only)
+        if args.output:
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            with open(args.output, "w") as f:
+                json.dump(data, f, indent=2)
+            print(f"saved {len(data['results'])} results to {args.output}", file=sys.stderr)
+        return 0
+    if args.command == "limbs":
+        limb_table([int(w) for w in args.widths.split(",")], [k.strip() for k in args.algorithms.split(",")],
+                   args.limb_bits, repeat=args.repeat)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, threshold=args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# loadtest.py
+"""Load-test client for server.py.
+
+Opens --clients concurrent connections; each sends --requests multiply
+requests (up to --pipeline in flight per connection) with random operands of
+--bits width, then prints throughput and latency percentiles.
+
+    python src/loadtest.py --clients 50 --requests 200 --bits 16
+    python src/loadtest.py --clients 10 --requests 20 --bits 64 --stream --json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from server import DEFAULT_PORT
+from wordmult.throughput import percentile
+
+async def run_client(host, port, client_id, requests, bits, signed, stream, algorithms, pipeline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 22)
+    rng = random.Random(client_id)
+    # symmetric signed range: -2**(bits-1) alone would need the next register size
+    lo, hi = (1 - (1 << (bits - 1)), (1 << (bits - 1)) - 1) if signed else (0, (1 << bits) - 1)
+    sent = {}
+    window = asyncio.Semaphore(pipeline)
+
+    async def send():
+        for n in range(requests):
+            await window.acquire()
+            req = {"id": n, "a": rng.randint(lo, hi), "b": rng.randint(lo, hi), "signed": signed,
+                   "bits": bits, "stream": stream}
+            if algorithms:
+                req["algorithms"] = algorithms
+            sent[n] = time.perf_counter()
+            writer.write(json.dumps(req).encode() + b"\n")
+            await writer.drain()
+
+    async def receive():
+        done = 0
+        while done < requests:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("server closed the connection")
+            reply = json.loads(line)
+            if "ok" not in reply:  # a streamed step
+                continue
+            latencies.append(time.perf_counter() - sent.pop(reply["id"]))
+            if not reply["ok"]:
+                errors[reply["error"]] = errors.get(reply["error"], 0) + 1
+            done += 1
+            window.release()
+
+    try:
+        await asyncio.gather(send(), receive())
+    finally:
+        writer.close()
+
+async def load_test(host="127.0.0.1", port=DEFAULT_PORT, clients=10, requests=100, bits=16, signed=True,
+                    stream=False, algorithms=None, pipeline=1):
+    latencies, errors = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, c, requests, bits, signed, stream, algorithms, pipeline,
+                                      latencies, errors) for c in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {name: percentile(latencies, q) * 1e3
+                       for name, q in (("p50", 50), ("p90", 90), ("p95", 95), ("p99", 99), ("max", 100))},
+    }
+
+def build_parser():
+    p = argparse.ArgumentParser(description="Load-test a running simulation server.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--clients", type=int, default=10, help="concurrent connections")
+    p.add_argument("--requests", type=int, default=100, help="requests per connection")
+    p.add_argument("--pipeline", type=int, default=1, help="requests in flight per connection")
+    p.add_argument("--bits", type=int, default=16, help="operand width")
+    p.add_argument("--unsigned", action="store_true", help="send unsigned operands")
+    p.add_argument("--algorithms", default=None, help="comma-separated algorithm keys (default: server default)")
+    p.add_argument("--stream", action="store_true", help="ask for streamed step traces")
+    p.add_argument("--json", action="store_true", help="print the report as JSON")
+    return p
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    algorithms = args.algorithms.split(",") if args.algorithms else None
+    try:
+        report = asyncio.run(load_test(args.host, args.port, args.clients, args.requests, args.bits,
+                                       signed=not args.unsigned, stream=args.stream, algorithms=algorithms,
+                                       pipeline=args.pipeline))
+    except OSError as e:
+        print(f"cannot reach server at {args.host}:{args.port}: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        lat = report["latency_ms"]
+        print(f"{report['requests']:,} requests from {report['clients']} clients in {report['elapsed']:.2f}s: "
+              f"{report['throughput']:,.0f} req/s")
+        print("latency ms  " + "  ".join(f"{k}={v:.2f}" for k, v in lat.items()))
+        for error, count in report["errors"].items():
+            print(f"  {count:,} x {error}")
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,20 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
 import time
-import csv
-import math
+import os
 import sys
 
+from wordmult import (ALGORITHMS, DEFAULT_ALGORITHMS, MAX_BITS, get_algorithm, int_to_twos_complement,
+                      limb_algorithm, min_bits_for_signed, min_bits_for_unsigned)
+from wordmult.analysis import METRIC_LABELS, BatchStats, analyze_chunk, chunked, csv_pairs, range_pairs
+from wordmult.export import PDF_AVAILABLE, XLSX_AVAILABLE, AnalysisExportJob, ExportJob, build_export_rows
+from wordmult.gates import ADDERS, INTERACTIVE_BITS as GATE_MAX_BITS, timing_costs
+from wordmult.limbs import DEFAULT_LIMB_BITS, LIMB_SIZES, MAX_LIMBS, limb_count
+from wordmult.profiling import PROFILER
+from wordmult.throughput import iter_random_pairs
+from wordmult.tracecache import TraceCache
+from wordmult.workspace import HIDDEN, VISIBLE, Session, WorkerPool, compute_preview, compute_run
+
 # Try to import winsound for Windows beep; fallback to simple print('\a')
 try:
     import winsound
@@ -21,117 +31,838 @@ except Exception:
         except Exception:
             pass
 
-# Try to import reportlab for PDF export; we'll fallback to TXT otherwise
-PDF_AVAILABLE = False
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.pdfgen import canvas as pdfcanvas
-    PDF_AVAILABLE = True
-except Exception:
-    PDF_AVAILABLE = False
-
-# ========== Theme Setup ==========
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
-
-# ========== Utilities ==========
-def int_to_twos_complement(x, bits):
-    """Return bits-bit two's complement representation for integer x (works for negative as well)."""
-    return format((x + (1 << bits)) % (1 << bits), f"0{bits}b")
-
-def twos_complement_to_int(binstr):
-    """Interpret binary string as two's complement signed integer."""
-    return int(binstr, 2) - (1 << len(binstr)) if binstr[0] == "1" else int(binstr, 2)
-
-def min_bits_for_signed(a, b):
-    """Return minimum bits to represent signed operands a and b (include sign)."""
-    max_val = max(abs(a), abs(b))
-    if max_val == 0:
-        return 2  # allow for sign
-    bits = math.ceil(math.log2(max_val + 1)) + 1  # +1 for sign
-    # round up to conventional sizes
-    if bits <= 8:
-        return 8
-    if bits <= 16:
-        return 16
-    return 32
-
-def min_bits_for_unsigned(a, b):
-    max_val = max(a, b)
-    if max_val == 0:
-        return 1
-    bits = math.ceil(math.log2(max_val + 1))
-    if bits <= 8:
-        return 8
-    if bits <= 16:
-        return 16
-    return 32
-
-# ========== Algorithms (pure functions returning steps) ==========
-def shift_and_add_steps(A_bin, B_bin, N, signed=False):
-    steps = []
-    mask = (1 << N) - 1
-    A_val = int(A_bin, 2)
-    B_val = int(B_bin, 2)
-    A_reg = 0
-    Q_reg = B_val
-    steps.append((0, f"{A_reg:0{N}b}", f"{Q_reg:0{N}b}", "Initialize"))
-    for i in range(N):
-        if Q_reg & 1:
-            A_reg = (A_reg + A_val) & mask
-            op = "Add"
+# ========== Export progress ==========
+class ExportProgressDialog(ctk.CTkToplevel):
+    """Small window with a progress bar and Cancel button that tracks an ExportJob."""
+    POLL_MS = 50
+
+    def __init__(self, master, job, on_done):
+        super().__init__(master)
+        self.job = job
+        self.on_done = on_done
+        self.title("Exporting…")
+        self.geometry("360x130")
+        self.resizable(False, False)
+        self.label = ctk.CTkLabel(self, text=f"Writing {os.path.basename(job.path)}")
+        self.label.pack(padx=16, pady=(16, 6))
+        self.bar = ctk.CTkProgressBar(self)
+        self.bar.set(0)
+        self.bar.pack(fill="x", padx=16, pady=6)
+        ctk.CTkButton(self, text="Cancel", command=self._cancel).pack(pady=(6, 12))
+        self.protocol("WM_DELETE_WINDOW", self._cancel)
+        self.after(self.POLL_MS, self._poll)
+
+    def _cancel(self):
+        self.job.cancel()
+        self.label.configure(text="Cancelling…")
+
+    def _poll(self):
+        self.bar.set(min(1.0, self.job.done_rows / max(1, self.job.total)))
+        if not self.job.finished:
+            self.after(self.POLL_MS, self._poll)
+            return
+        self.destroy()
+        self.on_done(self.job)
+
+# ========== Profiling stats ==========
+class StatsPanel(ctk.CTkToplevel):
+    """Live table of PROFILER phases with reset, JSON dump and one-shot cProfile capture."""
+    REFRESH_MS = 500
+    COLUMNS = ("Phase", "Calls", "Total ms", "Mean ms", "Max ms", "Items")
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.app = master
+        self.title("Profiling stats")
+        self.geometry("620x360")
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings", height=10)
+        for c in self.COLUMNS:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, anchor="e" if c != "Phase" else "w", width=90 if c != "Phase" else 170)
+        self.tree.pack(fill="both", expand=True, padx=8, pady=(8, 4))
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(fill="x", padx=8, pady=(4, 8))
+        ctk.CTkButton(buttons, text="Reset", width=80, command=self._reset).pack(side="left", padx=4)
+        ctk.CTkButton(buttons, text="Save JSON…", width=110, command=self._save).pack(side="left", padx=4)
+        ctk.CTkButton(buttons, text="cProfile next run…", width=150, command=self._capture).pack(side="left", padx=4)
+        self.status = ctk.CTkLabel(buttons, text="", font=("Helvetica Neue", 11))
+        self.status.pack(side="right", padx=4)
+        self._refresh()
+
+    def _refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for name, p in PROFILER.snapshot()["phases"].items():
+            self.tree.insert("", "end", values=(name, p["calls"], f"{p['total'] * 1e3:.1f}", f"{p['mean'] * 1e3:.3f}",
+                                                f"{p['max'] * 1e3:.2f}", p["items"] or ""))
+        self.status.configure(text="recording" if PROFILER.enabled else "off (enable “Profile phases”)")
+        self.after(self.REFRESH_MS, self._refresh)
+
+    def _reset(self):
+        PROFILER.reset()
+
+    def _save(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if path:
+            PROFILER.dump(path)
+
+    def _capture(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".prof",
+                                            filetypes=[("cProfile stats", "*.prof")])
+        if path:
+            self.app.capture_path = path
+            self.status.configure(text="cProfile armed for the next run")
+
+# ========== Batch analysis ==========
+class BatchAnalysisWindow(ctk.CTkToplevel):
+    """Runs the main form's algorithms over a CSV file, an operand range or a random sample.
+
+    Pairs are read lazily and cut into chunks; a bounded number of chunks is
+    in flight on the app's worker pool at hidden priority (interactive runs
+    go first), and each finished chunk's BatchStats is merged into the
+    running aggregates, so the table and histogram fill in while the batch
+    is still going.  No traces are kept.
+    """
+    POLL_MS = 100
+    SOURCES = ("Range", "Random", "CSV file")
+    COLUMNS = ("Algorithm", "Metric", "Pairs", "Mean", "Min", "P50", "P90", "Max")
+    BAR_FILL = "#4a90d9"
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.app = master
+        self.title("Batch analysis")
+        self.geometry("760x620")
+        self.stats = None
+        self.source = ""
+        self.mode = ""
+        self.total = None        # pairs in the batch, None while unknown (CSV)
+        self._chunks = None      # iterator of pair lists still to submit
+        self._in_flight = []     # (Task, pairs in chunk)
+        self._csv_file = None
+        self._csv_rejected = [0]
+        self._csv_path = ""
+        self._signed = False
+        self._bits = None
+        self._started = 0.0
+        self.cancelled = False
+
+        # source
+        src = ctk.CTkFrame(self, fg_color="transparent")
+        src.pack(fill="x", padx=8, pady=(8, 2))
+        self.source_var = tk.StringVar(value=self.SOURCES[0])
+        ctk.CTkLabel(src, text="Pairs:").pack(side="left", padx=(4, 4))
+        ctk.CTkOptionMenu(src, values=list(self.SOURCES), variable=self.source_var, width=100).pack(side="left", padx=4)
+        self.lo = tk.StringVar(value="-128")
+        self.hi = tk.StringVar(value="127")
+        self.count = tk.StringVar(value="10000")
+        self.bits = tk.StringVar(value="32")
+        self.seed = tk.StringVar(value="0")
+        for label, var, width in (("from", self.lo, 70), ("to", self.hi, 70), ("  count", self.count, 80),
+                                  ("bits", self.bits, 50), ("seed", self.seed, 50)):
+            ctk.CTkLabel(src, text=label).pack(side="left", padx=(4, 2))
+            ctk.CTkEntry(src, textvariable=var, width=width).pack(side="left")
+        ctk.CTkButton(src, text="Load CSV…", width=90, command=self._load_csv).pack(side="left", padx=(10, 4))
+
+        controls = ctk.CTkFrame(self, fg_color="transparent")
+        controls.pack(fill="x", padx=8, pady=2)
+        self.start_btn = ctk.CTkButton(controls, text="Start", width=80, command=self._start)
+        self.start_btn.pack(side="left", padx=4)
+        ctk.CTkButton(controls, text="Cancel", width=80, command=self._cancel).pack(side="left", padx=4)
+        self.bar = ctk.CTkProgressBar(controls)
+        self.bar.set(0)
+        self.bar.pack(side="left", fill="x", expand=True, padx=8)
+        self.status = ctk.CTkLabel(self, text="Algorithms and mode are taken from the main window.", anchor="w",
+                                   font=("Helvetica Neue", 11))
+        self.status.pack(fill="x", padx=12)
+
+        # aggregates
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings", height=8)
+        for c in self.COLUMNS:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, anchor="w" if c in ("Algorithm", "Metric") else "e",
+                             width=150 if c in ("Algorithm", "Metric") else 65)
+        self.tree.pack(fill="both", expand=True, padx=8, pady=(6, 2))
+        self.mismatch_label = ctk.CTkLabel(self, text="", anchor="w", font=("Helvetica Neue", 11))
+        self.mismatch_label.pack(fill="x", padx=12)
+
+        # histogram of one algorithm and metric
+        pick = ctk.CTkFrame(self, fg_color="transparent")
+        pick.pack(fill="x", padx=8, pady=(4, 0))
+        ctk.CTkLabel(pick, text="Histogram:").pack(side="left", padx=4)
+        self.hist_algorithm = tk.StringVar(value="")
+        self.hist_metric = tk.StringVar(value=METRIC_LABELS["steps"])
+        self.algorithm_menu = ctk.CTkOptionMenu(pick, values=[""], variable=self.hist_algorithm, width=200,
+                                                command=lambda _: self._draw_histogram())
+        self.algorithm_menu.pack(side="left", padx=4)
+        self.metric_menu = ctk.CTkOptionMenu(pick, values=list(METRIC_LABELS.values()), variable=self.hist_metric,
+                                             width=180, command=lambda _: self._draw_histogram())
+        self.metric_menu.pack(side="left", padx=4)
+        self.canvas = tk.Canvas(self, height=170, bg="#fff", highlightthickness=0)
+        self.canvas.pack(fill="x", padx=8, pady=4)
+
+        exports = ctk.CTkFrame(self, fg_color="transparent")
+        exports.pack(fill="x", padx=8, pady=(2, 8))
+        for text, export in (("Export CSV", self.app._export_csv), ("Export JSONL", self.app._export_jsonl),
+                             ("Export XLSX", self.app._export_xlsx), ("Export PDF/TXT", self.app._export_pdf_or_txt)):
+            ctk.CTkButton(exports, text=text, width=110,
+                          command=lambda export=export: self._export(export)).pack(side="left", padx=4)
+        self.protocol("WM_DELETE_WINDOW", self._close)
+
+    # ----- inputs -----
+    def _load_csv(self):
+        path = filedialog.askopenfilename(parent=self, filetypes=[("CSV", "*.csv"), ("Text", "*.txt"), ("All", "*")])
+        if path:
+            self._csv_path = path
+            self.source_var.set("CSV file")
+            self.status.configure(text=f"CSV: {os.path.basename(path)}")
+
+    def _pairs(self, signed):
+        """(pairs iterator, total or None, fixed bits or None, source description) for the chosen source."""
+        source = self.source_var.get()
+        if source == "CSV file":
+            if not self._csv_path:
+                raise ValueError("Load a CSV file first.")
+            self._csv_file = open(self._csv_path, newline="")
+            self._csv_rejected = [0]
+            return (csv_pairs(self._csv_file, self._csv_rejected), None, None,
+                    f"csv:{os.path.basename(self._csv_path)}")
+        if source == "Random":
+            count, bits, seed = int(self.count.get()), int(self.bits.get()), int(self.seed.get())
+            if count < 1 or not 2 <= bits <= MAX_BITS:
+                raise ValueError(f"Count must be positive and bits 2..{MAX_BITS}.")
+            return iter_random_pairs(count, bits, signed, seed), count, bits, f"random:{count}x{bits}-bit seed={seed}"
+        lo, hi = int(self.lo.get()), int(self.hi.get())
+        if lo > hi:
+            raise ValueError("The range is empty (from > to).")
+        if lo < 0 and not signed:
+            raise ValueError("Unsigned mode doesn't accept negative operands; switch the main window to Signed.")
+        return range_pairs(lo, hi), (hi - lo + 1) ** 2, None, f"range:{lo}..{hi}"
+
+    # ----- running -----
+    @property
+    def running(self):
+        return self._chunks is not None or bool(self._in_flight)
+
+    def _start(self):
+        if self.running:
+            return
+        app = self.app
+        keys = app._variant_keys(app._active_algorithms(), app._limb_width())
+        if not keys:
+            messagebox.showerror("Batch analysis", "Select at least one algorithm in the main window.", parent=self)
+            return
+        signed = app.mode.get() == "signed"
+        try:
+            pairs, self.total, bits, self.source = self._pairs(signed)
+        except ValueError as e:
+            messagebox.showerror("Batch analysis", str(e), parent=self)
+            return
+        except OSError as e:
+            messagebox.showerror("Batch analysis", f"Cannot read CSV: {e}", parent=self)
+            return
+        self.mode = app.mode.get()
+        self.stats = BatchStats(keys, signed)
+        self._signed, self._bits = signed, bits
+        self.cancelled = False
+        self._chunks = chunked(pairs)
+        self._started = time.perf_counter()
+        labels = [get_algorithm(key).label for key in keys]
+        self.algorithm_menu.configure(values=labels)
+        if self.hist_algorithm.get() not in labels:
+            self.hist_algorithm.set(labels[0])
+        self.start_btn.configure(state="disabled")
+        self._submit()
+        self.after(self.POLL_MS, self._poll)
+
+    def _submit(self):
+        """Keep about two chunks per worker queued, reading more pairs only as chunks finish."""
+        limit = 2 * self.app.pool.workers
+        while self._chunks is not None and len(self._in_flight) < limit:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._finish_reading()
+                break
+            task = self.app.pool.submit(analyze_chunk, chunk, self._signed, self.stats.keys, self._bits,
+                                        priority=HIDDEN, group=self, cpu=True)
+            self._in_flight.append((task, len(chunk)))
+
+    def _finish_reading(self):
+        self._chunks = None
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self.stats.rejected_pairs += self._csv_rejected[0]
+
+    def _poll(self):
+        if not self.winfo_exists():
+            return
+        error = None
+        for task, size in [item for item in self._in_flight if item[0].done]:
+            self._in_flight.remove((task, size))
+            if task.error is not None:
+                error = task.error
+            elif task.result is not None:
+                self.stats.merge(task.result)
+        if error is not None:
+            self._cancel()
+            messagebox.showerror("Batch analysis", str(error), parent=self)
+        else:
+            self._submit()
+        self._refresh()
+        if self.running:
+            self.after(self.POLL_MS, self._poll)
+        else:
+            self.start_btn.configure(state="normal")
+
+    def _cancel(self):
+        if not self.running:
+            return
+        self.cancelled = True
+        for task, _ in self._in_flight:
+            task.cancel()
+        self._in_flight = []
+        if self._chunks is not None:
+            self._finish_reading()
+
+    def _close(self):
+        self._cancel()
+        self.destroy()
+
+    # ----- display -----
+    def _refresh(self):
+        stats = self.stats
+        if stats is None:
+            return
+        seen = stats.pairs + stats.rejected_pairs
+        if self.total:
+            self.bar.set(min(1.0, seen / self.total))
+        elif not self.running:
+            self.bar.set(1.0)
+        elapsed = time.perf_counter() - self._started
+        state = "running" if self.running else "cancelled" if self.cancelled else "done"
+        of = f" / {self.total:,}" if self.total else ""
+        self.status.configure(text=f"{state}: {seen:,}{of} pairs, {stats.rejected_pairs:,} rejected, "
+                                   f"{len(self._in_flight)} chunks in flight, {elapsed:.1f} s")
+        self.tree.delete(*self.tree.get_children())
+        for key in stats.keys:
+            label = get_algorithm(key).label
+            for metric in stats.metrics(key):
+                h = stats.histograms[key][metric].summary()
+                self.tree.insert("", "end", values=(label, METRIC_LABELS[metric], f"{h['count']:,}",
+                                                    f"{h['mean']:.2f}", h["min"], h["p50"], h["p90"], h["max"]))
+        self.mismatch_label.configure(text="Mismatches vs a*b:  " + "   ".join(
+            f"{get_algorithm(key).short} {stats.mismatches[key]:,}" for key in stats.keys))
+        self._draw_histogram()
+
+    def _draw_histogram(self):
+        self.canvas.delete("all")
+        stats = self.stats
+        if stats is None:
+            return
+        by_label = {get_algorithm(key).label: key for key in stats.keys}
+        by_metric = {label: metric for metric, label in METRIC_LABELS.items()}
+        key, metric = by_label.get(self.hist_algorithm.get()), by_metric.get(self.hist_metric.get())
+        if key is None or metric not in stats.histograms[key]:
+            self.canvas.create_text(10, 10, anchor="nw", text="No values for this algorithm and metric.")
+            return
+        buckets = stats.histograms[key][metric].buckets()
+        width, height = max(200, self.canvas.winfo_width()), max(100, self.canvas.winfo_height())
+        top, bottom, left = 16, height - 20, 10
+        peak = max(c for _, _, c in buckets)
+        slot = (width - 2 * left) / len(buckets)
+        for i, (lo, hi, c) in enumerate(buckets):
+            x0 = left + i * slot
+            y0 = bottom - (bottom - top) * c / peak
+            self.canvas.create_rectangle(x0 + 1, y0, x0 + slot - 1, bottom, fill=self.BAR_FILL, outline="")
+        first, last = buckets[0], buckets[-1]
+        self.canvas.create_text(left, height - 4, anchor="sw", text=str(first[0]))
+        self.canvas.create_text(width - left, height - 4, anchor="se", text=str(last[1]))
+        self.canvas.create_text(left, 2, anchor="nw", text=f"max {peak:,} pairs per bucket")
+
+    def _export(self, export):
+        if self.stats is None or not self.stats.pairs:
+            messagebox.showerror("Nothing to export", "Run a batch first.", parent=self)
+            return
+        stats, mode = self.stats, self.mode
+        source = self.source + (" (cancelled)" if self.cancelled else " (partial)" if self.running else "")
+        export(lambda fmt, path: AnalysisExportJob(fmt, path, stats, source, mode))
+
+# ========== Live preview ==========
+PREVIEW_DEBOUNCE_MS = 250  # quiet time after the last edit before computing
+PREVIEW_POLL_MS = 16       # about one frame
+
+class PreviewJob:
+    """Computes the traces for one set of inputs on a worker thread (or a workspace pool process).
+
+    The app keeps only its newest job; superseded jobs are cancelled (they stop
+    before the next algorithm, or never start on the pool) and whatever they
+    produced is never rendered.  Traces in cached are reused, not recomputed.
+    """
+
+    def __init__(self, a, b, signed, bits, keys, cached=None):
+        self.a, self.b, self.signed, self.bits, self.keys = a, b, signed, bits, keys
+        self.A_bin = int_to_twos_complement(a, bits)
+        self.B_bin = int_to_twos_complement(b, bits)
+        self.cached = cached or {}
+        self.computed = {}  # traces this job produced (the ones worth caching)
+        self.error = None
+        self.cancelled = False
+        self._thread = None
+        self._task = None
+
+    @property
+    def missing(self):
+        return [key for key in self.keys if key not in self.cached]
+
+    @property
+    def results(self):
+        return {key: self.cached[key] if key in self.cached else self.computed[key]
+                for key in self.keys if key in self.cached or key in self.computed}
+
+    def start(self, pool=None):
+        if pool is not None:
+            # a process, not a pool thread: wide previews would otherwise hold the GIL against Tk
+            self._task = pool.submit(compute_preview, self.A_bin, self.B_bin, self.bits, self.signed,
+                                     tuple(self.missing), PROFILER.enabled, priority=VISIBLE, cpu=True)
+        else:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def finished(self):
+        if self._task is None:
+            return not self._thread.is_alive()
+        if not self._task.done:
+            return False
+        if self._task.error is not None:
+            self.error = self._task.error
+        elif self._task.result is not None and not self.computed:
+            self.computed, phases = self._task.result
+            if phases:
+                PROFILER.merge(phases)
+        return True
+
+    def cancel(self):
+        self.cancelled = True
+        if self._task is not None:
+            self._task.cancel()
+
+    def _run(self):
+        try:
+            for key in self.missing:
+                if self.cancelled:
+                    return
+                self.computed[key] = get_algorithm(key).run(self.A_bin, self.B_bin, self.bits, signed=self.signed)
+        except Exception as e:
+            self.error = e
+
+# ========== Playback ==========
+# steps per second; the original fixed pause was 0.6 s per step ("1x")
+PLAYBACK_SPEEDS = {
+    "0.5x": 1 / 1.2,
+    "1x": 1 / 0.6,
+    "2x": 2 / 0.6,
+    "5x": 5 / 0.6,
+    "20x": 20 / 0.6,
+    "100x": 100 / 0.6,
+    "Max": None,
+}
+BEEP_MAX_RATE = 4  # stay quiet when steps go by faster than this
+
+# ========== Throughput model ==========
+# menu label -> Microarchitecture arguments
+UNIT_PRESETS = {
+    "Iterative": {},
+    "Iterative, early termination": {"early_termination": True},
+    "Pipelined, 4 stages": {"depth": 4, "unroll": None},
+    "Pipelined, 4 stages x2": {"depth": 4, "unroll": None, "units": 2},
+    "Fully pipelined": {"depth": None, "unroll": None},
+}
+
+# ========== Workspace ==========
+RUN_POLL_MS = 30  # how often the Tk thread checks pool tasks for finished runs
+
+class StepPlayer:
+    """Plays a trace back on the Tk main loop with after(), never from another thread.
+
+    on_step(i) applies step i (table row, log line); on_frame(i) redraws the
+    widgets that only need the latest state (canvas, progress).  When the rate
+    is faster than the display can show, every frame applies all due steps and
+    redraws once.  rate is in steps per second; None plays as fast as possible,
+    spending at most FRAME_BUDGET seconds of each frame applying steps.
+    """
+    FRAME_MS = 16         # ~60 fps
+    FRAME_BUDGET = 0.012  # seconds of step work per frame at max speed
+
+    def __init__(self, widget, total, on_step, on_frame, on_finish=None, on_seek=None, rate=1 / 0.6):
+        self.widget = widget
+        self.total = total
+        self.on_step = on_step
+        self.on_frame = on_frame
+        self.on_finish = on_finish
+        self.on_seek = on_seek  # on_seek(k): rebuild the view so exactly k steps are shown
+        self.rate = rate
+        self.shown = 0          # steps applied so far
+        self.playing = False
+        self._credit = 0.0
+        self._last = None
+        self._job = None
+
+    @property
+    def finished(self):
+        return self.shown >= self.total
+
+    def play(self):
+        if self.playing or self.finished:
+            return
+        self.playing = True
+        self._credit = 1.0  # show the next step immediately
+        self._last = time.perf_counter()
+        self._tick()
+
+    def pause(self):
+        self.playing = False
+        self._cancel()
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def stop(self):
+        self.pause()
+        self.on_finish = None
+
+    def set_rate(self, rate):
+        self.rate = rate
+
+    def advance(self, n=1):
+        """Apply the next n steps right away (manual stepping); return how many were applied."""
+        start = self.shown
+        while self.shown < min(self.total, start + n):
+            self.on_step(self.shown)
+            self.shown += 1
+        if self.shown > start:
+            self.on_frame(self.shown - 1)
+        if self.finished and self.shown > start:
+            self._finish()
+        return self.shown - start
+
+    def seek(self, k):
+        """Jump so that exactly k steps are shown."""
+        k = max(0, min(self.total, int(k)))
+        if k == self.shown:
+            return
+        if self.on_seek is not None:
+            self.on_seek(k)
+            self.shown = k
+        elif k > self.shown:
+            while self.shown < k:
+                self.on_step(self.shown)
+                self.shown += 1
+        else:
+            return  # rewinding needs on_seek
+        if k:
+            self.on_frame(k - 1)
+        if self.finished:
+            self.pause()
+            self._finish()
+
+    # ----- internals -----
+    def _delay(self):
+        if self.rate is None:
+            return self.FRAME_MS
+        return max(self.FRAME_MS, int(1000 / self.rate))
+
+    def _tick(self):
+        self._job = None
+        if not self.playing:
+            return
+        now = time.perf_counter()
+        start = self.shown
+        if self.rate is None:
+            while self.shown < self.total and time.perf_counter() - now < self.FRAME_BUDGET:
+                self.on_step(self.shown)
+                self.shown += 1
         else:
-            op = "No Add"
-        combined = ((A_reg << N) | Q_reg) >> 1
-        A_reg, Q_reg = (combined >> N) & mask, combined & mask
-        steps.append((i + 1, f"{A_reg:0{N}b}", f"{Q_reg:0{N}b}", f"{op}, Shift"))
-    product_bin = f"{(A_reg << N) | Q_reg:0{2 * N}b}"
-    if signed:
-        product_val = twos_complement_to_int(product_bin)
-    else:
-        product_val = int(product_bin, 2)
-    return steps, product_bin, product_val
-
-def booth_steps(A_bin, B_bin, N, signed=False):
-    steps = []
-    mask = (1 << N) - 1
-    M = twos_complement_to_int(A_bin)
-    Q = twos_complement_to_int(B_bin)
-    A = 0
-    q_1 = 0
-    steps.append((0, f"{A & mask:0{N}b}", f"{Q & mask:0{N}b}", "Initialize"))
-    for step in range(1, N + 1):
-        q0 = Q & 1
-        if (q0, q_1) == (1, 0):
-            A = A - M
-            op = "A = A - M"
-        elif (q0, q_1) == (0, 1):
-            A = A + M
-            op = "A = A + M"
+            self._credit += (now - self._last) * self.rate
+            due = min(int(self._credit), self.total - self.shown)
+            self._credit -= int(self._credit)
+            for _ in range(due):
+                self.on_step(self.shown)
+                self.shown += 1
+        self._last = now
+        if self.shown > start:
+            self.on_frame(self.shown - 1)  # coalesced: one redraw per frame
+        if self.finished:
+            self.playing = False
+            self._finish()
+        else:
+            self._job = self.widget.after(self._delay(), self._tick)
+
+    def _cancel(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _finish(self):
+        if self.on_finish:
+            self.on_finish()
+
+# ========== Register view ==========
+class RegisterView(tk.Canvas):
+    """Canvas of bit cells that are created once and updated in place.
+
+    show_bits() only touches the cells whose bit changed since the last call
+    and highlights them; resizing moves the existing items instead of
+    recreating them.  Cells that would fall past the right edge are never
+    created, so very wide registers cost no more than the visible part.
+    """
+    CELL_FILL = "#fff"
+    CHANGED_FILL = "#ffe08a"
+
+    def __init__(self, master, **kw):
+        super().__init__(master, **kw)
+        self.bits = ""
+        self._cells = []      # (rect_id, text_id) per visible character
+        self._changed = []    # indices currently highlighted
+        self._spacing = 0
+        self.bind("<Configure>", lambda e: self._layout())
+
+    def clear(self):
+        self.delete("all")
+        self.bits = ""
+        self._cells = []
+        self._changed = []
+        self._spacing = 0
+
+    def _width(self):
+        # an unmapped canvas reports a width of 1, not 0: lay out for the requested width until it is shown
+        return self.winfo_width() if self.winfo_ismapped() else self.winfo_reqwidth()
+
+    def _spacing_for(self, n):
+        w = self._width()
+        # show bits evenly spaced
+        return max(10, min(28, w // max(n, 1)))
+
+    def _visible_count(self, n, spacing):
+        w = self._width()
+        return min(n, max(1, (w - 6) // spacing + 1))
+
+    def _layout(self):
+        """Place existing cells for the current width, creating or dropping cells as needed."""
+        if not self.bits:
+            return
+        n = len(self.bits)
+        spacing = self._spacing_for(n)
+        visible = self._visible_count(n, spacing)
+        while len(self._cells) > visible:
+            for item in self._cells.pop():
+                self.delete(item)
+        created = len(self._cells) < visible
+        while len(self._cells) < visible:
+            i = len(self._cells)
+            rect = self.create_rectangle(0, 4, 0, 40, outline="#444", width=1, fill=self.CELL_FILL)
+            text = self.create_text(0, 22, text=self.bits[i], font=("Courier", 12))
+            self._cells.append((rect, text))
+        if spacing == self._spacing and not created:
+            return
+        x = 6
+        for rect, text in self._cells:
+            self.coords(rect, x, 4, x + spacing - 2, 40)
+            self.coords(text, x + (spacing - 2) / 2, 22)
+            x += spacing
+        self._spacing = spacing
+
+    def show_bits(self, binstr):
+        """Display binstr, updating and highlighting only the cells that changed."""
+        for i in self._changed:
+            if i < len(self._cells):
+                self.itemconfigure(self._cells[i][0], fill=self.CELL_FILL)
+        self._changed = []
+        if len(binstr) != len(self.bits):
+            # new width: start from a clean set of cells
+            self.clear()
+            self.bits = binstr
+            self._layout()
+            return
+        old = self.bits
+        self.bits = binstr
+        for i, (rect, text) in enumerate(self._cells):
+            if binstr[i] != old[i]:
+                self.itemconfigure(text, text=binstr[i])
+                self.itemconfigure(rect, fill=self.CHANGED_FILL)
+                self._changed.append(i)
+
+# ========== Virtualized step views ==========
+def format_log_line(s):
+    return f"Step {s[0]} | A={s[1]} | Q={s[2]} | {s[3]}"
+
+class VirtualRows(ctk.CTkFrame):
+    """Scrollable window over a row source that only holds widgets for the visible rows.
+
+    Rows are read on demand with row_source(i), so the cost of an update does not
+    depend on how many rows exist.  Subclasses implement _render(first, rows).
+    While the view is scrolled to the end it follows new rows like see("end").
+    """
+
+    def __init__(self, master, visible=10, row_height=30, **kw):
+        super().__init__(master, fg_color="transparent", **kw)
+        self.row_source = None
+        self.count = 0
+        self.first = 0
+        self.visible = visible
+        self.row_height = row_height
+        self.follow = True
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+    def _bind_scrolling(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda e: self.scroll(-1, "units"))
+        widget.bind("<Button-5>", lambda e: self.scroll(1, "units"))
+        widget.bind("<Configure>", self._on_resize)
+
+    def set_source(self, row_source, count=0):
+        self.row_source = row_source
+        self.first = 0
+        self.follow = True
+        self.set_count(count)
+
+    def set_count(self, count):
+        """Show rows 0..count-1, scrolling to the newest row when following."""
+        self.count = count
+        if self.follow:
+            self.first = max(0, count - self.visible)
+        self.first = max(0, min(self.first, count - self.visible))
+        self.refresh()
+
+    def scroll(self, amount, what="units"):
+        step = self.visible if what == "pages" else 1
+        self.scroll_to(self.first + int(amount) * step)
+
+    def scroll_to(self, first):
+        self.first = max(0, min(int(first), self.count - self.visible))
+        self.follow = self.first + self.visible >= self.count
+        self.refresh()
+
+    def refresh(self):
+        end = min(self.count, self.first + self.visible)
+        rows = [self.row_source(i) for i in range(self.first, end)] if self.row_source else []
+        self._render(self.first, rows)
+        if self.count:
+            self.scrollbar.set(self.first / self.count, end / self.count)
         else:
-            op = "No operation"
-        # Arithmetic right shift on combined A,Q,q_1
-        combined = ((A & mask) << (N + 1)) | ((Q & mask) << 1) | q_1
-        # preserve sign in Python manual style: >>1 arithmetic simulated by checking sign of A
-        sign = (A >> (N - 1)) & 1
-        combined >>= 1
-        if sign:
-            combined |= (1 << (2 * N))  # keep sign extension if negative
-        A = (combined >> (N + 1)) & mask
-        Q = (combined >> 1) & mask
-        q_1 = combined & 1
-        steps.append((step, f"{A:0{N}b}", f"{Q:0{N}b}", f"{op}, Shift"))
-    product = (A << N) | Q
-    product_bin = f"{product & ((1 << (2 * N)) - 1):0{2 * N}b}"
-    if signed:
-        product_val = twos_complement_to_int(product_bin)
-    else:
-        product_val = int(product_bin, 2)
-    return steps, product_bin, product_val
+            self.scrollbar.set(0, 1)
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.count)
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]), args[2])
+
+    def _on_resize(self, event):
+        visible = max(1, event.height // self.row_height - self._header_rows)
+        if visible != self.visible:
+            self.visible = visible
+            self.set_count(self.count)
+
+class VirtualStepTable(VirtualRows):
+    """Step table backed by a fixed pool of Treeview items that are re-labelled on scroll."""
+    _header_rows = 1
+
+    def __init__(self, master, columns=("Step", "A", "Q", "Operation"), style="Steps.Treeview", **kw):
+        super().__init__(master, **kw)
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=self.visible, style=style)
+        for c in columns:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, anchor="center", width=140)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self._items = []
+        self._bind_scrolling(self.tree)
+
+    def _render(self, first, rows):
+        # grow/shrink the item pool to the number of visible rows, then relabel in place
+        while len(self._items) < len(rows):
+            self._items.append(self.tree.insert("", "end", values=()))
+        while len(self._items) > len(rows):
+            self.tree.delete(self._items.pop())
+        for iid, row in zip(self._items, rows):
+            self.tree.item(iid, values=row)
+
+class VirtualLog(VirtualRows):
+    """Read-only log that only keeps the visible lines in its text widget."""
+    _header_rows = 0
+
+    def __init__(self, master, font=None, line_format=format_log_line, height=120, **kw):
+        super().__init__(master, visible=max(1, height // 20), row_height=20, **kw)
+        self.line_format = line_format
+        self.text = ctk.CTkTextbox(self, height=height, font=font, activate_scrollbars=False, wrap="none")
+        self.text.pack(side="left", fill="both", expand=True)
+        self._bind_scrolling(self.text)
+
+    def _render(self, first, rows):
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(self.line_format(r) for r in rows))
+        self.text.configure(state="disabled")
 
 # ========== App ==========
+class AlgorithmPane(ctk.CTkFrame):
+    """Step table, progress bar, register canvas and log for one algorithm."""
+
+    def __init__(self, master, algorithm, mono_font, beep_freq=750):
+        super().__init__(master, fg_color=("#f5f5f7", "#1c1c1e"))
+        self.algorithm = algorithm
+        self.beep_freq = beep_freq
+        self.steps = None
+        self.title = ctk.CTkLabel(self, text=algorithm.label, font=("Helvetica Neue", 16, "bold"))
+        self.title.pack(pady=(8, 6))
+        # virtualized treeview: only the visible rows exist as items
+        self.table = VirtualStepTable(self)
+        self.table.pack(fill="both", expand=True, padx=6, pady=6)
+
+        # progress & animation canvas & log
+        self.progress = ctk.CTkProgressBar(self)
+        self.progress.pack(fill="x", padx=10, pady=(4, 8))
+        self.anim_canvas = RegisterView(self, height=48)
+        self.anim_canvas.pack(fill="x", padx=10, pady=(2, 8))
+        self.log = VirtualLog(self, font=mono_font, height=120)
+        self.log.pack(fill="x", padx=10, pady=(6, 10))
+
+    def set_trace(self, steps, delays=None, algorithm=None):
+        """Attach a trace (and optional per-step adder delays); rows are formatted only when they scroll into view.
+
+        algorithm is the variant that produced the trace (e.g. a limb engine at a
+        non-default limb width); the title follows it.
+        """
+        self.steps = steps
+        self.title.configure(text=(algorithm or self.algorithm).label)
+        row = steps.__getitem__ if steps is not None else None
+        if row is not None and delays is not None:
+            def row(i, plain=row):
+                s = plain(i)
+                return (*s[:3], f"{s[3]}  [{delays[i]} gd]") if delays[i] else s
+        self.table.set_source(row)
+        self.log.set_source(row)
+
+    def show(self, count):
+        """Show the first count steps of the attached trace."""
+        self.table.set_count(count)
+        self.log.set_count(count)
+
+    def reset(self):
+        self.set_trace(None)
+        self.progress.set(0)
+        self.anim_canvas.clear()
+
 class MacStyleApp(ctk.CTk):
     def __init__(self):
+        # theme is global customtkinter state; set it when an app starts, not on import
+        ctk.set_appearance_mode("light")
+        ctk.set_default_color_theme("blue")
         super().__init__()
         self.title("Word Multiplier Simulator by Arhan-Peter-Arjun-Abhinav")
         self.geometry("1200x820")
@@ -143,27 +874,42 @@ class MacStyleApp(ctk.CTk):
         self.entry_font = ("Helvetica Neue", 18)
         self.mono_font = ("Courier New", 14)
 
-        # model state
-        self.operand_a = None
-        self.operand_b = None
+        # form state (shared by the tabs; the visible session is loaded into it)
         self.mode = tk.StringVar(value="unsigned")
         self.compare = tk.BooleanVar(value=True)
         self.auto_mode = tk.BooleanVar(value=True)  # auto vs manual stepping
-        self.bits = 8
+        self.algo_enabled = {key: tk.BooleanVar(value=key in DEFAULT_ALGORITHMS) for key in ALGORITHMS}
 
-        # result containers
-        self.sa_steps = []
-        self.booth_steps = []
-        self.sa_product = None
-        self.booth_product = None
-        self.sa_result = None
-        self.booth_result = None
+        # workspace: every tab is a Session; only the visible one is bound to widgets
+        self.pool = WorkerPool(processes=True)  # shared by every tab's runs and exports
+        self.sessions = [Session()]
+        self.session = self.sessions[0]
+        self._loading = False  # set while a session is copied into the form
+        self.panes = {}
+        self.trace_cache = TraceCache.from_env()
+        if self.trace_cache.disk_dir:
+            self.pool.submit(self.trace_cache.measure_disk, priority=HIDDEN)  # lists the store off the Tk thread
+        self.profiling = tk.BooleanVar(value=PROFILER.enabled)
+        self.capture_path = None  # set by the stats panel to cProfile the next run
+        self._capture_task = None  # the run task a running capture belongs to
+        self.adder_model = tk.StringVar(value="Off")  # gate-level adder timing (wordmult.gates)
+        self.unit_model = tk.StringVar(value="Off")  # throughput model (wordmult.throughput)
+        self.limb_bits = tk.StringVar(value=f"{DEFAULT_LIMB_BITS}-bit")  # limb engines (wordmult.limbs)
+        self.live_preview = tk.BooleanVar(value=True)
+        self._preview_after = None  # pending debounce callback
+        self._preview_job = None    # newest PreviewJob; older results are dropped
 
         # build UI
         self._build_header()
         self._build_body()
         self._build_footer()
 
+        # live preview: any input change restarts the debounce timer
+        self.entry_a.bind("<KeyRelease>", self._schedule_preview, add="+")
+        self.entry_b.bind("<KeyRelease>", self._schedule_preview, add="+")
+        for var in (self.mode, self.compare, self.limb_bits, *self.algo_enabled.values()):
+            var.trace_add("write", self._schedule_preview)
+
     # ---------- Header ----------
     def _build_header(self):
         header = ctk.CTkFrame(self, fg_color=("white", "#1c1c1e"), corner_radius=16)
@@ -214,15 +960,43 @@ class MacStyleApp(ctk.CTk):
         ctk.CTkRadioButton(rb_frame, text="Unsigned", variable=self.mode, value="unsigned").pack(side="left", padx=6)
         ctk.CTkRadioButton(rb_frame, text="Signed", variable=self.mode, value="signed").pack(side="left", padx=6)
 
+        # algorithm selection (one checkbox per registered algorithm)
+        ctk.CTkLabel(left, text="Algorithms:", anchor="w").pack(fill="x", padx=12)
+        for key, algorithm in ALGORITHMS.items():
+            ctk.CTkCheckBox(left, text=algorithm.label, variable=self.algo_enabled[key]).pack(anchor="w", padx=24, pady=2)
+
         # compare toggle
-        ctk.CTkCheckBox(left, text="Compare both algorithms (side-by-side)", variable=self.compare).pack(padx=12, pady=(8, 6))
+        ctk.CTkCheckBox(left, text="Compare algorithms (side-by-side)", variable=self.compare).pack(padx=12, pady=(8, 6))
 
         # auto/manual toggle
-        ctk.CTkCheckBox(left, text="Auto-play steps", variable=self.auto_mode).pack(padx=12, pady=(2, 12))
+        ctk.CTkCheckBox(left, text="Auto-play steps", variable=self.auto_mode).pack(padx=12, pady=(2, 6))
+        ctk.CTkCheckBox(left, text="Live preview while typing", variable=self.live_preview).pack(padx=12, pady=(0, 6))
+        adder_row = ctk.CTkFrame(left, fg_color="transparent")
+        adder_row.pack(padx=12, pady=(0, 6))
+        ctk.CTkLabel(adder_row, text="Adder timing:").pack(side="left", padx=(0, 6))
+        ctk.CTkOptionMenu(adder_row, values=["Off"] + [label for label, _ in ADDERS.values()], width=150,
+                          variable=self.adder_model).pack(side="left")
+        unit_row = ctk.CTkFrame(left, fg_color="transparent")
+        unit_row.pack(padx=12, pady=(0, 6))
+        ctk.CTkLabel(unit_row, text="Throughput:").pack(side="left", padx=(0, 6))
+        ctk.CTkOptionMenu(unit_row, values=["Off", *UNIT_PRESETS], width=150,
+                          variable=self.unit_model).pack(side="left")
+        limb_row = ctk.CTkFrame(left, fg_color="transparent")
+        limb_row.pack(padx=12, pady=(0, 12))
+        ctk.CTkLabel(limb_row, text="Limb size:").pack(side="left", padx=(0, 6))
+        ctk.CTkOptionMenu(limb_row, values=[f"{w}-bit" for w in LIMB_SIZES], width=150,
+                          variable=self.limb_bits).pack(side="left")
 
         # bit-size display & detection button
         self.bits_label = ctk.CTkLabel(left, text="Bit Size: —", font=("Helvetica Neue", 14, "bold"))
-        self.bits_label.pack(padx=12, pady=(4, 12))
+        self.bits_label.pack(padx=12, pady=(4, 2))
+        self.cache_label = ctk.CTkLabel(left, text="Cache: —", font=("Helvetica Neue", 11))
+        self.cache_label.pack(padx=12, pady=(0, 4))
+        prof_row = ctk.CTkFrame(left, fg_color="transparent")
+        prof_row.pack(padx=12, pady=(0, 10))
+        ctk.CTkCheckBox(prof_row, text="Profile phases", variable=self.profiling,
+                        command=self._toggle_profiling).pack(side="left", padx=(0, 6))
+        ctk.CTkButton(prof_row, text="Stats…", width=70, command=lambda: StatsPanel(self)).pack(side="left")
 
         detect_btn = ctk.CTkButton(left, text="Detect & Prepare ▶", command=self._prepare_and_run)
         detect_btn.pack(padx=12, pady=(6, 6), fill="x")
@@ -230,74 +1004,80 @@ class MacStyleApp(ctk.CTk):
         # Export group
         ctk.CTkLabel(left, text="Export Results:", anchor="w").pack(fill="x", padx=12, pady=(16, 4))
         ctk.CTkButton(left, text="Export CSV", command=self._export_csv).pack(padx=12, pady=(4, 4), fill="x")
-        ctk.CTkButton(left, text="Export PDF/TXT", command=self._export_pdf_or_txt).pack(padx=12, pady=(4, 16), fill="x")
+        ctk.CTkButton(left, text="Export PDF/TXT", command=self._export_pdf_or_txt).pack(padx=12, pady=(4, 4), fill="x")
+        ctk.CTkButton(left, text="Export JSONL", command=self._export_jsonl).pack(padx=12, pady=(4, 4), fill="x")
+        ctk.CTkButton(left, text="Export XLSX", command=self._export_xlsx).pack(padx=12, pady=(4, 4), fill="x")
+        ctk.CTkButton(left, text="Open Trace Archive…", command=self._open_archive).pack(padx=12, pady=(4, 4), fill="x")
+        ctk.CTkButton(left, text="Batch Analysis…", command=lambda: BatchAnalysisWindow(self)).pack(
+            padx=12, pady=(4, 16), fill="x")
 
         # Right: simulation panels
         right = ctk.CTkFrame(main)
         right.pack(side="left", fill="both", expand=True, padx=(8, 6), pady=6)
 
+        # Workspace tabs: one independent session each
+        tab_bar = ctk.CTkFrame(right, fg_color="transparent")
+        tab_bar.pack(fill="x", padx=6, pady=(6, 0))
+        ctk.CTkButton(tab_bar, text="＋ New Tab", width=90, command=self._new_session).pack(side="left", padx=(0, 4))
+        ctk.CTkButton(tab_bar, text="Close Tab", width=80, command=self._close_session).pack(side="left", padx=4)
+        ctk.CTkButton(tab_bar, text="Recompute All", width=110, command=self._recompute_all).pack(side="left", padx=4)
+        self.pool_label = ctk.CTkLabel(tab_bar, text="", font=("Helvetica Neue", 11))
+        self.pool_label.pack(side="right", padx=6)
+        tabs_scroll = ctk.CTkScrollableFrame(right, orientation="horizontal", height=34, fg_color="transparent")
+        tabs_scroll.pack(fill="x", padx=6, pady=(2, 0))
+        self.tabs = ctk.CTkSegmentedButton(tabs_scroll, values=[self.session.title()], command=self._on_tab)
+        self.tabs.set(self.session.title())
+        self.tabs.pack(side="left")
+
         # Top summary area
         top_summary = ctk.CTkFrame(right, height=80, fg_color=("transparent"))
         top_summary.pack(fill="x", padx=6, pady=(6, 6))
         self.summary_label = ctk.CTkLabel(top_summary, text="Summary: —", anchor="w", font=("Helvetica Neue", 13))
         self.summary_label.pack(fill="x", padx=6)
 
-        # Middle: two algorithm panes
-        panes = ctk.CTkFrame(right)
-        panes.pack(fill="both", expand=True, padx=6, pady=6)
-
-        # Shift-and-Add pane
-        self.sa_frame = ctk.CTkFrame(panes, fg_color=("#f5f5f7", "#1c1c1e"))
-        self.sa_frame.pack(side="left", fill="both", expand=True, padx=(0, 3), pady=6)
-
-        ctk.CTkLabel(self.sa_frame, text="Shift-and-Add", font=("Helvetica Neue", 16, "bold")).pack(pady=(8, 6))
-        # treeview
-        sa_style = ttk.Style()
-        sa_style.configure("SA.Treeview", font=self.mono_font, rowheight=30)
-        self.sa_table = ttk.Treeview(self.sa_frame, columns=("Step", "A", "Q", "Operation"), show="headings", height=10, style="SA.Treeview")
-        for c in ("Step", "A", "Q", "Operation"):
-            self.sa_table.heading(c, text=c)
-            self.sa_table.column(c, anchor="center", width=140)
-        self.sa_table.pack(fill="both", expand=True, padx=6, pady=6)
-
-        # progress & animation canvas & log
-        self.sa_progress = ctk.CTkProgressBar(self.sa_frame)
-        self.sa_progress.pack(fill="x", padx=10, pady=(4, 8))
-        self.sa_anim_canvas = tk.Canvas(self.sa_frame, height=48)
-        self.sa_anim_canvas.pack(fill="x", padx=10, pady=(2, 8))
-        self.sa_log = ctk.CTkTextbox(self.sa_frame, height=120, font=self.mono_font)
-        self.sa_log.pack(fill="x", padx=10, pady=(6, 10))
-
-        # Booth pane
-        self.booth_frame = ctk.CTkFrame(panes, fg_color=("#f5f5f7", "#1c1c1e"))
-        self.booth_frame.pack(side="left", fill="both", expand=True, padx=(3, 0), pady=6)
-
-        ctk.CTkLabel(self.booth_frame, text="Booth's Algorithm", font=("Helvetica Neue", 16, "bold")).pack(pady=(8, 6))
-        booth_style = ttk.Style()
-        booth_style.configure("B.Treeview", font=self.mono_font, rowheight=30)
-        self.booth_table = ttk.Treeview(self.booth_frame, columns=("Step", "A", "Q", "Operation"), show="headings", height=10, style="B.Treeview")
-        for c in ("Step", "A", "Q", "Operation"):
-            self.booth_table.heading(c, text=c)
-            self.booth_table.column(c, anchor="center", width=140)
-        self.booth_table.pack(fill="both", expand=True, padx=6, pady=6)
-
-        self.booth_progress = ctk.CTkProgressBar(self.booth_frame)
-        self.booth_progress.pack(fill="x", padx=10, pady=(4, 8))
-        self.booth_anim_canvas = tk.Canvas(self.booth_frame, height=48)
-        self.booth_anim_canvas.pack(fill="x", padx=10, pady=(2, 8))
-        self.booth_log = ctk.CTkTextbox(self.booth_frame, height=120, font=self.mono_font)
-        self.booth_log.pack(fill="x", padx=10, pady=(6, 10))
+        # Middle: one pane per registered algorithm, packed on demand
+        self.panes_frame = ctk.CTkFrame(right)
+        self.panes_frame.pack(fill="both", expand=True, padx=6, pady=6)
+        style = ttk.Style()
+        style.configure("Steps.Treeview", font=self.mono_font, rowheight=30)
+        for i, (key, algorithm) in enumerate(ALGORITHMS.items()):
+            self.panes[key] = AlgorithmPane(self.panes_frame, algorithm, self.mono_font, beep_freq=750 + 130 * i)
+        self._layout_panes()
 
         # Bottom result summary table
         bottom = ctk.CTkFrame(right)
         bottom.pack(fill="x", padx=6, pady=(6, 10))
         ctk.CTkLabel(bottom, text="Final Summary", font=("Helvetica Neue", 14, "bold")).pack(anchor="w", padx=6, pady=(4, 2))
-        self.summary_tree = ttk.Treeview(bottom, columns=("Label", "Binary", "Decimal"), show="headings", height=3)
-        for c in ("Label", "Binary", "Decimal"):
+        self.summary_tree = ttk.Treeview(bottom, columns=("Label", "Binary", "Decimal", "Cost"), show="headings", height=4)
+        for c in ("Label", "Binary", "Decimal", "Cost"):
             self.summary_tree.heading(c, text=c)
             self.summary_tree.column(c, anchor="center", width=200)
         self.summary_tree.pack(fill="x", padx=6, pady=(4, 8))
 
+    def _active_algorithms(self):
+        """Keys of the algorithms to run: every checked one, or just the first if not comparing."""
+        keys = [key for key in ALGORITHMS if self.algo_enabled[key].get()]
+        if not self.compare.get():
+            keys = keys[:1]
+        return keys
+
+    def _limb_width(self):
+        return int(self.limb_bits.get().split("-")[0])
+
+    @staticmethod
+    def _variant_keys(keys, limb_bits):
+        """Pane keys -> the algorithm keys to run: limb engines at the chosen limb width."""
+        return [key if ALGORITHMS[key].serial else limb_algorithm(key, limb_bits).key for key in keys]
+
+    def _layout_panes(self):
+        active = self._active_algorithms()
+        for key, pane in self.panes.items():
+            pane.pack_forget()
+        for i, key in enumerate(active):
+            pad_left = 0 if i == 0 else 3
+            pad_right = 0 if i == len(active) - 1 else 3
+            self.panes[key].pack(side="left", fill="both", expand=True, padx=(pad_left, pad_right), pady=6)
+
     # ---------- Footer ----------
     def _build_footer(self):
         footer = ctk.CTkFrame(self, fg_color=("transparent"))
@@ -306,11 +1086,22 @@ class MacStyleApp(ctk.CTk):
         self.run_btn.pack(side="left", padx=8)
         self.step_btn = ctk.CTkButton(footer, text="Next Step ►", command=self._manual_next_step)
         self.step_btn.pack(side="left", padx=6)
-        self.stop_flag = False
+        self.pause_btn = ctk.CTkButton(footer, text="Pause ❚❚", width=100, command=self._toggle_pause)
+        self.pause_btn.pack(side="left", padx=6)
+        # playback speed and seek
+        ctk.CTkLabel(footer, text="Speed:").pack(side="left", padx=(12, 2))
+        self.speed_menu = ctk.CTkOptionMenu(footer, values=list(PLAYBACK_SPEEDS), width=80, command=self._on_speed_change)
+        self.speed_menu.set("1x")
+        self.speed_menu.pack(side="left", padx=4)
+        self.seek_slider = ctk.CTkSlider(footer, from_=0, to=1, width=220, command=self._on_seek)
+        self.seek_slider.set(0)
+        self.seek_slider.pack(side="left", padx=8)
+        self.player = None
         ctk.CTkLabel(footer, text="Tip: Press Enter in B to start", font=("Helvetica Neue", 11)).pack(side="right", padx=6)
 
     # ---------- Prepare & Run ----------
     def _prepare_and_run(self, event=None):
+        self._cancel_preview()  # the run's own summary must not be overwritten by a late preview
         # validate inputs
         a_raw = self.entry_a.get().strip()
         b_raw = self.entry_b.get().strip()
@@ -327,251 +1118,546 @@ class MacStyleApp(ctk.CTk):
                     raise ValueError("Unsigned mode doesn't accept negative")
                 a = int(a_raw)
                 b = int(b_raw)
-            self.operand_a = a
-            self.operand_b = b
         except ValueError as e:
             messagebox.showerror("Invalid input", f"Enter valid integers.\n{e}")
             return
+        active = self._active_algorithms()
+        if not active:
+            messagebox.showerror("No algorithm", "Select at least one algorithm to simulate.")
+            return
 
         # determine bits
-        if self.mode.get() == "signed":
-            bits = min_bits_for_signed(self.operand_a, self.operand_b)
-        else:
-            bits = min_bits_for_unsigned(self.operand_a, self.operand_b)
-        self.bits = bits
+        try:
+            if self.mode.get() == "signed":
+                bits = min_bits_for_signed(a, b)
+            else:
+                bits = min_bits_for_unsigned(a, b)
+        except ValueError as e:
+            messagebox.showerror("Operands too wide", str(e))
+            return
         self.bits_label.configure(text=f"Bit Size: {bits}-bit")
         # show summary line
-        A_bin = int_to_twos_complement(self.operand_a, bits)
-        B_bin = int_to_twos_complement(self.operand_b, bits)
-        self.summary_label.configure(text=f"A={self.operand_a} ({A_bin})  |  B={self.operand_b} ({B_bin})  | Mode={self.mode.get()}")
+        A_bin = int_to_twos_complement(a, bits)
+        B_bin = int_to_twos_complement(b, bits)
+        self.summary_label.configure(text=f"A={a} ({A_bin})  |  B={b} ({B_bin})  | Mode={self.mode.get()}")
         # warnings for overflow / large numbers
-        if bits >= 32:
-            messagebox.showwarning("Large bit size", "Operands require 32-bit representation; consider smaller inputs for readability.")
-
-        # compute both algorithms if compare enabled, else only chosen? We'll compute both for comparison
-        signed_flag = (self.mode.get() == "signed")
-        self.sa_steps, self.sa_product, self.sa_result = shift_and_add_steps(A_bin, B_bin, bits, signed=signed_flag)
-        self.booth_steps, self.booth_product, self.booth_result = booth_steps(A_bin, B_bin, bits, signed=signed_flag)
+        if bits > 64:
+            messagebox.showwarning("Large bit size", f"Operands require {bits}-bit representation; consider smaller inputs for readability.")
+        limb_bits = self._limb_width()
+        if any(not ALGORITHMS[key].serial for key in active) and limb_count(bits, limb_bits) > MAX_LIMBS:
+            messagebox.showerror("Limb size", f"{bits}-bit operands need {limb_count(bits, limb_bits)} limbs of "
+                                              f"{limb_bits} bits; pick limbs of at least {limb_count(bits, MAX_LIMBS)} bits.")
+            return
+        if bits > GATE_MAX_BITS and self.adder_model.get() != "Off":
+            messagebox.showwarning("Adder timing", f"Gate-level timing is limited to {GATE_MAX_BITS}-bit words "
+                                                   f"for interactive use; this run is {bits}-bit.")
 
-        # prepare UI tables and logs
+        # compute every selected algorithm on the shared pool; playback starts when it is done
+        if self.capture_path:
+            PROFILER.start_capture()  # stopped by _run_finished, or _drop_capture if the run never gets there
+        self._save_form(self.session)
         self._reset_tables_and_logs()
-        # if comparison unchecked, hide booth pane visually
-        if not self.compare.get():
-            self.booth_frame.pack_forget()
+        self.summary_tree.insert("", "end", values=("Computing…", "", "", ""))
+        self._submit_run(self.session, a, b, bits)
+
+    def _submit_run(self, session, a, b, bits):
+        """Queue the session's run (superseding any pending one) and poll it from the Tk thread."""
+        if session.task is not None:
+            session.task.cancel()
+        signed = session.mode == "signed"
+        A_bin, B_bin = int_to_twos_complement(a, bits), int_to_twos_complement(b, bits)
+        keys = [key for key in ALGORITHMS if key in session.algorithms]
+        if not session.compare:
+            keys = keys[:1]
+        keys = self._variant_keys(keys, session.limb_bits)
+        # traces already in the cache (or an attached archive) are handed over instead of recomputed
+        cached = {}
+        for key in keys:
+            value = self.trace_cache.get(TraceCache.make_key(A_bin, B_bin, bits, signed, key))
+            if value is not None:
+                cached[key] = value
+        adder = {label: key for key, (label, _) in ADDERS.items()}.get(session.adder_model)
+        unit = UNIT_PRESETS.get(session.unit_model)
+        session.error = None
+        # workers have their own PROFILER: tell them what to record and merge it in _poll_run
+        capture = PROFILER.capturing and session is self.session
+        session.task = self.pool.submit(compute_run, a, b, bits, signed, tuple(keys), cached, adder, unit,
+                                        PROFILER.enabled, capture, priority=VISIBLE if session is self.session else HIDDEN,
+                                        group=session, cpu=True)
+        if capture:
+            self._capture_task = session.task
+        self.after(RUN_POLL_MS, self._poll_run, session, session.task, (a, b, bits, signed, A_bin, B_bin, cached))
+        self._refresh_tabs()
+
+    def _poll_run(self, session, task, run):
+        if session.task is not task:
+            self._drop_capture(task)
+            return  # superseded by a newer run, or the tab was closed
+        if not task.done:
+            self.after(RUN_POLL_MS, self._poll_run, session, task, run)
+            return
+        session.task = None
+        a, b, bits, signed, A_bin, B_bin, cached = run
+        if task.error is not None:
+            session.error = task.error
+            self._drop_capture(task)
+            self._refresh_tabs()
+            if session is self.session:
+                self.summary_tree.delete(*self.summary_tree.get_children())
+                messagebox.showerror("Simulation error", str(task.error))
+            return
+        results, timings, throughput, unit_latency, (phases, stats) = task.result
+        if phases:
+            PROFILER.merge(phases)
+        PROFILER.add_capture(stats)
+        self._cache_traces([(TraceCache.make_key(A_bin, B_bin, bits, signed, key), value)
+                            for key, value in results.items() if key not in cached])
+        session.operand_a, session.operand_b, session.bits = a, b, bits
+        session.results, session.timings = results, timings
+        session.throughput, session.unit_latency = throughput, unit_latency
+        self._refresh_tabs()
+        if session is self.session:
+            session.shown = 0
+            self._show_session(session, play=True)
         else:
-            # ensure both packed
-            if not self.booth_frame.winfo_ismapped():
-                self.booth_frame.pack(side="left", fill="both", expand=True, padx=(3, 0), pady=6)
+            session.shown = max(len(steps) for steps, _, _ in results.values())  # finished in the background
+
+    def _show_session(self, session, play=False):
+        """Bind the session's traces to the panes; play from the start or restore where it was left."""
+        stats = self.trace_cache.stats()
+        hits = stats["hits"] + stats["disk_hits"] + stats["archive_hits"]
+        self.cache_label.configure(text=f"Cache: {hits} hits / {stats['misses']} misses")
+
+        # prepare UI tables and logs, showing only the panes that ran
+        self._reset_tables_and_logs()
+        if self.player is not None:
+            self.player.stop()
+            self.player = None
+        self.seek_slider.set(0)
+        if not session.results:
+            self._layout_panes()
+            return
+        for key, (steps, _, _) in session.results.items():
+            timing = session.timings.get(key)
+            algorithm = get_algorithm(key)
+            self.panes[algorithm.family].set_trace(steps, timing.delays if timing else None, algorithm)
+        self._layout_panes()
 
         # fill initial rows and start animate (auto or manual)
-        if self.auto_mode.get():
-            # start threaded animation to keep UI responsive
-            self.stop_flag = False
-            threading.Thread(target=self._animate_both_auto, daemon=True).start()
+        total = max(len(steps) for steps, _, _ in session.results.values())
+        self.player = StepPlayer(self, total, self._apply_step, self._render_frame,
+                                 on_finish=self._run_finished, on_seek=self._seek_view,
+                                 rate=PLAYBACK_SPEEDS[self.speed_menu.get()])
+        if not play:
+            self.pause_btn.configure(text="Resume ▶")
+            self.player.seek(session.shown)  # a finished trace fills the summary through on_finish
+        elif self.auto_mode.get():
+            # after()-driven playback keeps every widget update on the Tk thread
+            self.pause_btn.configure(text="Pause ❚❚")
+            self.player.play()
         else:
             # manual: show first (initial) rows
-            for s in self.sa_steps[:1]:
-                self.sa_table.insert("", "end", values=s)
-                self.sa_log.insert("end", f"Step {s[0]} | A={s[1]} | Q={s[2]} | {s[3]}\n")
-            for s in self.booth_steps[:1]:
-                self.booth_table.insert("", "end", values=s)
-                self.booth_log.insert("end", f"Step {s[0]} | A={s[1]} | Q={s[2]} | {s[3]}\n")
-            self.sa_progress.set(1 / max(len(self.sa_steps), 1))
-            self.booth_progress.set(1 / max(len(self.booth_steps), 1))
+            self.player.advance(1)
             # show summary
-            self._update_final_summary()
+            self._run_finished()
+
+    # ---------- Workspace tabs ----------
+    def _save_form(self, session):
+        session.a_raw = self.entry_a.get().strip()
+        session.b_raw = self.entry_b.get().strip()
+        session.mode = self.mode.get()
+        session.algorithms = [key for key in ALGORITHMS if self.algo_enabled[key].get()]
+        session.compare = self.compare.get()
+        session.adder_model = self.adder_model.get()
+        session.unit_model = self.unit_model.get()
+        session.limb_bits = self._limb_width()
+
+    def _load_form(self, session):
+        self._loading = True  # the variable traces below must not start previews
+        try:
+            for entry, text in ((self.entry_a, session.a_raw), (self.entry_b, session.b_raw)):
+                entry.delete(0, "end")
+                entry.insert(0, text)
+            self.mode.set(session.mode)
+            for key, var in self.algo_enabled.items():
+                var.set(key in session.algorithms)
+            self.compare.set(session.compare)
+            self.adder_model.set(session.adder_model)
+            self.unit_model.set(session.unit_model)
+            self.limb_bits.set(f"{session.limb_bits}-bit")
+        finally:
+            self._loading = False
+        if session.operand_a is None:
+            self.bits_label.configure(text="Bit Size: —")
+            self.summary_label.configure(text="Summary: —")
+        else:
+            A_bin = int_to_twos_complement(session.operand_a, session.bits)
+            B_bin = int_to_twos_complement(session.operand_b, session.bits)
+            self.bits_label.configure(text=f"Bit Size: {session.bits}-bit")
+            self.summary_label.configure(text=f"A={session.operand_a} ({A_bin})  |  B={session.operand_b} ({B_bin})"
+                                              f"  | Mode={session.mode}")
+
+    def _refresh_tabs(self):
+        titles = [session.title() for session in self.sessions]
+        self.tabs.configure(values=titles)
+        self.tabs.set(titles[self.sessions.index(self.session)])
+        stats = self.pool.stats()
+        self.pool_label.configure(text=f"Workers: {stats['running']}/{stats['workers']} busy, {stats['pending']} queued")
+
+    def _on_tab(self, title):
+        titles = [session.title() for session in self.sessions]
+        if title in titles:
+            self._switch_session(self.sessions[titles.index(title)])
+
+    def _switch_session(self, session):
+        """Hide the current tab (keeping only its data) and bind session to the widgets."""
+        if session is self.session:
+            return
+        self._cancel_preview()
+        old = self.session
+        self._save_form(old)
+        if self.player is not None:
+            old.shown = self.player.shown
+            self.player.stop()
+            self.player = None
+        self._reset_tables_and_logs()  # panes drop their trace references
+        self.pool.reprioritize(old, HIDDEN)
+        self.session = session
+        self.pool.reprioritize(session, VISIBLE)
+        self._load_form(session)
+        self._show_session(session)
+        if session.busy:
+            self.summary_tree.insert("", "end", values=("Computing…", "", "", ""))
+        self._refresh_tabs()
+
+    def _new_session(self):
+        session = Session()
+        # a new tab starts from the current form settings, with empty operands
+        self._save_form(session)
+        session.a_raw = session.b_raw = ""
+        self.sessions.append(session)
+        self._switch_session(session)
+
+    def _close_session(self):
+        if len(self.sessions) == 1:
+            messagebox.showinfo("Close tab", "The last tab cannot be closed.")
+            return
+        session = self.session
+        if session.task is not None:
+            session.task.cancel()
+            session.task = None
+        index = self.sessions.index(session)
+        self._switch_session(self.sessions[index - 1 if index else 1])
+        self.sessions.remove(session)
+        self._refresh_tabs()
+
+    def _recompute_all(self):
+        """Queue every tab that has operands again; the visible one goes first."""
+        self._save_form(self.session)
+        for session in sorted(self.sessions, key=lambda s: s is not self.session):
+            if session.operand_a is None:
+                continue
+            a, b = session.operand_a, session.operand_b
+            try:
+                # the tab's mode (or limb size) may have changed since its last run: size the words afresh
+                bits = self._session_bits(session, a, b)
+            except ValueError as e:
+                if session.task is not None:
+                    session.task.cancel()
+                    session.task = None
+                session.error = e
+                continue
+            self._submit_run(session, a, b, bits)
+        self._refresh_tabs()
+        if self.session.error is not None and not self.session.busy:
+            messagebox.showerror("Recompute", f"{self.session.name}: {self.session.error}")
+        if self.session.busy:
+            self._reset_tables_and_logs()
+            self.summary_tree.insert("", "end", values=("Computing…", "", "", ""))
+
+    @staticmethod
+    def _session_bits(session, a, b):
+        """Word width for a and b in the session's current mode and limb size; ValueError if they do not fit."""
+        signed = session.mode == "signed"
+        if not signed and (a < 0 or b < 0):
+            raise ValueError("Unsigned mode doesn't accept negative operands")
+        bits = min_bits_for_signed(a, b) if signed else min_bits_for_unsigned(a, b)
+        limbs = limb_count(bits, session.limb_bits)
+        if any(not ALGORITHMS[key].serial for key in session.algorithms) and limbs > MAX_LIMBS:
+            raise ValueError(f"{bits}-bit operands need {limbs} limbs of {session.limb_bits} bits")
+        return bits
 
     def _reset_tables_and_logs(self):
-        for tbl in (self.sa_table, self.booth_table):
-            tbl.delete(*tbl.get_children())
-        for log in (self.sa_log, self.booth_log):
-            log.delete("1.0", "end")
-        # reset progress bars and canvases
-        self.sa_progress.set(0)
-        self.booth_progress.set(0)
-        self.sa_anim_canvas.delete("all")
-        self.booth_anim_canvas.delete("all")
+        # reset tables, logs, progress bars and canvases
+        for pane in self.panes.values():
+            pane.reset()
         self.summary_tree.delete(*self.summary_tree.get_children())
 
     # ---------- Animation Helpers ----------
-    def _draw_bits_on_canvas(self, canvas: tk.Canvas, binstr: str):
-        canvas.delete("all")
-        w = canvas.winfo_width() or canvas.winfo_reqwidth()
-        # show bits evenly spaced
-        spacing = max(10, min(28, w // max(len(binstr), 1)))
-        x = 6
-        y = 22
-        for ch in binstr:
-            # draw rectangle and bit
-            canvas.create_rectangle(x, 4, x + spacing - 2, 40, outline="#444", width=1, fill="#fff")
-            canvas.create_text(x + (spacing - 2) / 2, y, text=ch, font=("Courier", 12))
-            x += spacing
+    def _draw_bits_on_canvas(self, canvas: RegisterView, binstr: str):
+        # incremental: only cells whose bit changed are touched (and highlighted)
+        with PROFILER.phase("draw_bits"):
+            canvas.show_bits(binstr)
 
-    def _animate_both_auto(self):
-        # run animation step by step for both algorithms (synchronized by step index)
-        total_sa = len(self.sa_steps)
-        total_booth = len(self.booth_steps)
-        total = max(total_sa, total_booth)
-        for i in range(total):
-            if self.stop_flag:
-                break
-            # SAFELY insert row if exists
-            if i < total_sa:
-                s = self.sa_steps[i]
-                self.sa_table.insert("", "end", values=s)
-                self.sa_table.see(self.sa_table.get_children()[-1])
-                self.sa_log.insert("end", f"Step {s[0]} | A={s[1]} | Q={s[2]} | {s[3]}\n")
+    def _apply_step(self, i):
+        """Steps are read straight from the traces, so applying one is just advancing the player."""
+
+    def _render_frame(self, i):
+        """Show steps 0..i in every pane and redraw canvases and progress for the latest one."""
+        with PROFILER.phase("frame"):
+            for key, (steps, _, _) in self.session.results.items():
+                pane = self.panes[get_algorithm(key).family]
+                last = min(i, len(steps) - 1)
+                with PROFILER.phase("frame:views"):
+                    pane.show(last + 1)
+                s = steps[last]
                 # draw combined A|Q for simple visual
-                self._draw_bits_on_canvas(self.sa_anim_canvas, s[1] + " " + s[2])
-                self.sa_progress.set((i + 1) / total_sa)
-                beep()  # sound feedback
-            if i < total_booth:
-                b = self.booth_steps[i]
-                self.booth_table.insert("", "end", values=b)
-                self.booth_table.see(self.booth_table.get_children()[-1])
-                self.booth_log.insert("end", f"Step {b[0]} | A={b[1]} | Q={b[2]} | {b[3]}\n")
-                self._draw_bits_on_canvas(self.booth_anim_canvas, b[1] + " " + b[2])
-                self.booth_progress.set((i + 1) / total_booth)
-                beep(880, 45)
-            # give a small pause between steps
-            time.sleep(0.6)
-        # final summary update after both end
-        self._update_final_summary()
+                self._draw_bits_on_canvas(pane.anim_canvas, s[1] + " " + s[2])
+                pane.progress.set((last + 1) / max(1, len(steps)))
+                if i <= last and self.player.rate is not None and self.player.rate <= BEEP_MAX_RATE:
+                    beep(pane.beep_freq, 45)  # sound feedback
+            self.seek_slider.set((i + 1) / max(1, self.player.total))
+
+    def _seek_view(self, k):
+        """Show exactly k steps; the virtual views make this O(visible rows)."""
+        for key, (steps, _, _) in self.session.results.items():
+            self.panes[get_algorithm(key).family].show(min(k, len(steps)))
+
+    def _toggle_pause(self):
+        if self.player is None or self.player.finished:
+            return
+        self.player.toggle()
+        self.pause_btn.configure(text="Pause ❚❚" if self.player.playing else "Resume ▶")
+
+    def _on_speed_change(self, choice):
+        if self.player is not None:
+            self.player.set_rate(PLAYBACK_SPEEDS[choice])
+
+    def _on_seek(self, value):
+        if self.player is not None:
+            self.player.seek(round(value * self.player.total))
 
     # ---------- Manual stepping ----------
     def _manual_next_step(self):
-        # This advances one step in manual mode for both tables (if available)
+        # This advances one step in manual mode for every table (if available)
         if self.auto_mode.get():
             messagebox.showinfo("Manual step disabled", "Switch off Auto-play to use manual stepping.")
             return
-        # find current counts
-        sa_count = len(self.sa_table.get_children())
-        booth_count = len(self.booth_table.get_children())
-        # insert next if present
-        advanced = False
-        if sa_count < len(self.sa_steps):
-            s = self.sa_steps[sa_count]
-            self.sa_table.insert("", "end", values=s)
-            self.sa_table.see(self.sa_table.get_children()[-1])
-            self.sa_log.insert("end", f"Step {s[0]} | A={s[1]} | Q={s[2]} | {s[3]}\n")
-            self._draw_bits_on_canvas(self.sa_anim_canvas, s[1] + " " + s[2])
-            self.sa_progress.set((sa_count + 1) / max(1, len(self.sa_steps)))
-            beep()
-            advanced = True
-        if self.compare.get() and (booth_count < len(self.booth_steps)):
-            b = self.booth_steps[booth_count]
-            self.booth_table.insert("", "end", values=b)
-            self.booth_table.see(self.booth_table.get_children()[-1])
-            self.booth_log.insert("end", f"Step {b[0]} | A={b[1]} | Q={b[2]} | {b[3]}\n")
-            self._draw_bits_on_canvas(self.booth_anim_canvas, b[1] + " " + b[2])
-            self.booth_progress.set((booth_count + 1) / max(1, len(self.booth_steps)))
-            beep(880, 45)
-            advanced = True
-        if not advanced:
+        if self.player is None or not self.player.advance(1):
             messagebox.showinfo("Done", "No more steps to advance.")
             self._update_final_summary()
 
     # ---------- Final Summary ----------
+    @staticmethod
+    def _format_costs(costs):
+        text = f"iter={costs['iterations']} add={costs['additions']} sub={costs['subtractions']} shift={costs['shifts']}"
+        if "limb_products" in costs:
+            text += f" mul={costs['limb_products']}"
+        return text
+
+    def _drop_capture(self, task):
+        """Discard the cProfile capture of a run that failed or was superseded before it finished."""
+        if task is self._capture_task:
+            self._capture_task = self.capture_path = None
+            PROFILER.stop_capture(None)
+
+    def _run_finished(self):
+        """End of a run: fill the summary and finish a pending cProfile capture."""
+        self._update_final_summary()
+        if PROFILER.capturing:
+            self._capture_task = None
+            path, self.capture_path = self.capture_path, None
+            PROFILER.stop_capture(path)
+            messagebox.showinfo("cProfile", f"Profile of this run saved to:\n{path}\n(view with: python -m pstats)")
+
+    def _toggle_profiling(self):
+        PROFILER.enabled = self.profiling.get()
+
     def _update_final_summary(self):
+        with PROFILER.phase("final_summary"):
+            self._fill_final_summary()
+
+    def _fill_final_summary(self, operand_a=None, operand_b=None, bits=None, results=None):
+        """Fill the summary table for the current run, or for the given preview values."""
+        timings, throughput = {}, {}  # previews run neither gate-level timing nor the unit model
+        session = self.session
+        if results is None:
+            operand_a, operand_b, bits, results = session.operand_a, session.operand_b, session.bits, session.results
+            timings, throughput = session.timings, session.throughput
         # clear
         self.summary_tree.delete(*self.summary_tree.get_children())
-        bits = self.bits
-        A_bin = int_to_twos_complement(self.operand_a, bits)
-        B_bin = int_to_twos_complement(self.operand_b, bits)
-        # choose whichever product to show; if comparing, show both as separate rows
-        # Insert A row, B row, SA result row, Booth result row
-        self.summary_tree.insert("", "end", values=("A", A_bin, str(self.operand_a)))
-        self.summary_tree.insert("", "end", values=("B", B_bin, str(self.operand_b)))
-        # SA product
-        if self.sa_product is not None:
-            self.summary_tree.insert("", "end", values=("ShiftAdd Prod", self.sa_product, str(self.sa_result)))
-        if self.booth_product is not None:
-            self.summary_tree.insert("", "end", values=("Booth Prod", self.booth_product, str(self.booth_result)))
+        A_bin = int_to_twos_complement(operand_a, bits)
+        B_bin = int_to_twos_complement(operand_b, bits)
+        # Insert A row, B row, then one product row per algorithm with its cost metrics
+        self.summary_tree.configure(height=2 + len(results))
+        self.summary_tree.insert("", "end", values=("A", A_bin, str(operand_a), ""))
+        self.summary_tree.insert("", "end", values=("B", B_bin, str(operand_b), ""))
+        for key, (steps, product_bin, product_val) in results.items():
+            algorithm = get_algorithm(key)
+            costs = self._format_costs(algorithm.costs(steps))
+            if key in timings:
+                t = timing_costs(timings[key])
+                costs += f" delay={t['total_delay']} worst={t['max_step_delay']}/{t['critical_path']}"
+            if key in throughput:
+                r = throughput[key]
+                costs += (f" cyc={session.unit_latency[key]} thr={r['throughput']:.3f}/cyc"
+                          f" p99={r['latency']['p99']} util={r['utilization']:.0%}")
+            self.summary_tree.insert("", "end", values=(f"{algorithm.short} Prod", product_bin, str(product_val), costs))
+
+    # ---------- Live preview ----------
+    def _cancel_preview(self):
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+            self._preview_after = None
+        if self._preview_job is not None:
+            self._preview_job.cancel()
+            self._preview_job = None
+
+    def _schedule_preview(self, *_):
+        """Debounce input changes; a pending computation for the old inputs is now stale."""
+        self._cancel_preview()
+        if self.live_preview.get() and not self._loading:
+            self._preview_after = self.after(PREVIEW_DEBOUNCE_MS, self._start_preview)
+
+    def _preview_inputs(self):
+        """Parse the entries quietly; return (a, b, signed, bits) or a message explaining why not."""
+        a_raw = self.entry_a.get().strip()
+        b_raw = self.entry_b.get().strip()
+        if not a_raw or not b_raw:
+            return None
+        signed = self.mode.get() == "signed"
+        if not signed and ("-" in a_raw or "-" in b_raw):
+            return "Unsigned mode doesn't accept negative"
+        try:
+            a, b = int(a_raw), int(b_raw)
+        except ValueError:
+            return "Enter valid integers"
+        try:
+            bits = min_bits_for_signed(a, b) if signed else min_bits_for_unsigned(a, b)
+        except ValueError as e:  # wider than MAX_BITS
+            return str(e)
+        return a, b, signed, bits
+
+    def _start_preview(self):
+        self._preview_after = None
+        parsed = self._preview_inputs()
+        keys = self._variant_keys(self._active_algorithms(), self._limb_width())
+        if not isinstance(parsed, tuple) or not keys:
+            self.summary_label.configure(text=f"Summary: {parsed or '—'}")
+            return
+        a, b, signed, bits = parsed
+        A_bin, B_bin = int_to_twos_complement(a, bits), int_to_twos_complement(b, bits)
+        self.bits_label.configure(text=f"Bit Size: {bits}-bit")
+        self.summary_label.configure(text=f"A={a} ({A_bin})  |  B={b} ({B_bin})  | Mode={self.mode.get()}")
+        # cached traces (e.g. from an earlier run) need no worker at all
+        cached = {}
+        for key in keys:
+            value = self.trace_cache.get(TraceCache.make_key(A_bin, B_bin, bits, signed, key))
+            if value is not None:
+                cached[key] = value
+        job = PreviewJob(a, b, signed, bits, keys, cached)
+        if not job.missing:
+            self._fill_final_summary(a, b, bits, cached)
+            return
+        self._preview_job = job.start(self.pool)
+        self.after(PREVIEW_POLL_MS, self._poll_preview, job)
+
+    def _poll_preview(self, job):
+        if job is not self._preview_job:
+            return  # inputs changed since this job started: drop its result
+        if not job.finished:
+            self.after(PREVIEW_POLL_MS, self._poll_preview, job)
+            return
+        self._preview_job = None
+        if job.error is not None:
+            self.summary_label.configure(text=f"Summary: {job.error}")
+            return
+        # keep the traces so pressing Run replays them instead of recomputing
+        self._cache_traces([(TraceCache.make_key(job.A_bin, job.B_bin, job.bits, job.signed, key), value)
+                            for key, value in job.computed.items()])
+        self._fill_final_summary(job.a, job.b, job.bits, job.results)
+
+    def _cache_traces(self, items):
+        """Remember finished traces in memory now; the disk store is written by a pool thread."""
+        for key, value in items:
+            self.trace_cache.put(key, value, disk=False)
+        if self.trace_cache.disk_dir and items:
+            self.pool.submit(self.trace_cache.store, items, priority=HIDDEN)
 
     # ---------- Exporting ----------
     def _gather_export_rows(self):
-        """Prepare rows for CSV export: steps from SA and Booth with headers and summary."""
-        rows = []
-        rows.append(["Word Multiplier Simulation Export"])
-        rows.append(["Operands", f"A={self.operand_a}", f"B={self.operand_b}", f"Mode={self.mode.get()}", f"Bits={self.bits}"])
-        rows.append([])
-        rows.append(["Shift-and-Add Steps"])
-        rows.append(["Step", "A", "Q", "Operation"])
-        for s in self.sa_steps:
-            rows.append(list(s))
-        rows.append([])
-        rows.append(["Booth Steps"])
-        rows.append(["Step", "A", "Q", "Operation"])
-        for b in self.booth_steps:
-            rows.append(list(b))
-        rows.append([])
-        rows.append(["Summary"])
-        rows.append(["A (bin)", int_to_twos_complement(self.operand_a, self.bits)])
-        rows.append(["B (bin)", int_to_twos_complement(self.operand_b, self.bits)])
-        rows.append(["ShiftAdd Product (bin)", self.sa_product or ""])
-        rows.append(["ShiftAdd Product (dec)", str(self.sa_result) if self.sa_result is not None else ""])
-        rows.append(["Booth Product (bin)", self.booth_product or ""])
-        rows.append(["Booth Product (dec)", str(self.booth_result) if self.booth_result is not None else ""])
-        return rows
-
-    def _export_csv(self):
-        if not self.sa_steps and not self.booth_steps:
-            messagebox.showerror("Nothing to export", "Run a simulation first.")
-            return
-        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        """Prepare rows for CSV export: steps from every algorithm with headers, summary and costs."""
+        session = self.session
+        return build_export_rows(session.operand_a, session.operand_b, session.mode, session.bits, session.results,
+                                 session.throughput)
+
+    def _open_archive(self):
+        """Attach a binary trace archive; archived runs are then loaded instead of recomputed."""
+        path = filedialog.askopenfilename(filetypes=[("Trace archive", "*.wmt"), ("All files", "*.*")])
         if not path:
             return
+        from archive import TraceArchive
         try:
-            rows = self._gather_export_rows()
-            with open(path, "w", newline="") as f:
-                writer = csv.writer(f)
-                for r in rows:
-                    writer.writerow(r)
-            messagebox.showinfo("Exported", f"CSV exported to:\n{path}")
-        except Exception as e:
-            messagebox.showerror("Export error", str(e))
+            archive = TraceArchive(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Archive error", str(e))
+            return
+        self.trace_cache.attach_archive(archive)
+        messagebox.showinfo("Archive opened", f"{len(archive)} archived simulations available from:\n{path}")
+
+    def _export_csv(self, make_job=None):
+        self._export("csv", ".csv", [("CSV", "*.csv")], make_job)
+
+    def _export_pdf_or_txt(self, make_job=None):
+        if PDF_AVAILABLE:
+            self._export("pdf", ".pdf", [("PDF", "*.pdf"), ("Text File", "*.txt")], make_job)
+        else:
+            self._export("txt", ".txt", [("Text File", "*.txt")], make_job)
+
+    def _export_jsonl(self, make_job=None):
+        self._export("jsonl", ".jsonl", [("JSON Lines", "*.jsonl")], make_job)
+
+    def _export_xlsx(self, make_job=None):
+        if not XLSX_AVAILABLE:
+            messagebox.showerror("Export error", "XLSX export needs openpyxl (pip install openpyxl).")
+            return
+        self._export("xlsx", ".xlsx", [("Excel Workbook", "*.xlsx")], make_job)
 
-    def _export_pdf_or_txt(self):
-        if not self.sa_steps and not self.booth_steps:
+    def _export(self, fmt, extension, filetypes, make_job=None):
+        """Ask for a path and stream the export on a background thread with a progress dialog.
+
+        make_job(fmt, path) builds the job for something other than the visible tab's run
+        (the batch-analysis window passes one).
+        """
+        session = self.session
+        if make_job is None and not session.results:
             messagebox.showerror("Nothing to export", "Run a simulation first.")
             return
-        path = filedialog.asksaveasfilename(defaultextension=".pdf" if PDF_AVAILABLE else ".txt",
-                                            filetypes=[("PDF", "*.pdf")] if PDF_AVAILABLE else [("Text File", "*.txt")])
+        path = filedialog.asksaveasfilename(defaultextension=extension, filetypes=filetypes)
         if not path:
             return
-        rows = self._gather_export_rows()
-        try:
-            if PDF_AVAILABLE and path.lower().endswith(".pdf"):
-                c = pdfcanvas.Canvas(path, pagesize=letter)
-                w, h = letter
-                y = h - 40
-                text_obj = c.beginText(30, y)
-                text_obj.setFont("Courier", 10)
-                for r in rows:
-                    line = "  ".join([str(x) for x in r])
-                    text_obj.textLine(line)
-                    y -= 12
-                    if y < 40:
-                        c.drawText(text_obj)
-                        c.showPage()
-                        text_obj = c.beginText(30, h - 40)
-                        text_obj.setFont("Courier", 10)
-                        y = h - 40
-                c.drawText(text_obj)
-                c.save()
-                messagebox.showinfo("Exported", f"PDF saved to:\n{path}")
-            else:
-                # fallback to plain text
-                with open(path, "w") as f:
-                    for r in rows:
-                        f.write("  ".join([str(x) for x in r]) + "\n")
-                messagebox.showinfo("Exported", f"Text saved to:\n{path}")
-        except Exception as e:
-            messagebox.showerror("Export error", str(e))
+        if fmt == "pdf" and not path.lower().endswith(".pdf"):
+            fmt = "txt"  # fallback to plain text
+        if make_job is not None:
+            job = make_job(fmt, path)
+        else:
+            job = ExportJob(fmt, path, session.operand_a, session.operand_b, session.mode, session.bits,
+                            session.results, session.throughput)
+        ExportProgressDialog(self, job.start(self.pool, priority=VISIBLE), self._export_finished)
+
+    def _export_finished(self, job):
+        if job.cancelled:
+            messagebox.showinfo("Export cancelled", f"Nothing was written to:\n{job.path}")
+        elif job.error is not None:
+            messagebox.showerror("Export error", str(job.error))
+        else:
+            messagebox.showinfo("Exported", f"{job.fmt.upper()} saved to:\n{job.path}")
 
     # ---------- Graceful exit helpers (optional) ----------
     def on_closing(self):
-        self.stop_flag = True
+        if self.player is not None:
+            self.player.stop()
+        self.pool.shutdown()
         self.destroy()
 
 # ========== Run App ==========
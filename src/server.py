@@ -0,0 +1,314 @@
+# server.py
+"""Local simulation service: newline-delimited JSON over TCP (asyncio).
+
+Clients send one JSON request per line and get JSON lines back.  Concurrent
+requests are collected into micro-batches and run on a process pool, so a
+classroom of clients shares one set of workers instead of each running the
+simulator itself.  The server binds to localhost and needs no network access.
+
+    python src/server.py --port 8765 --workers 4 --max-bits 256
+    python src/loadtest.py --port 8765 --clients 50 --requests 200
+
+Requests (every field but "a" and "b" is optional):
+
+    {"id": 1, "a": 5, "b": -3, "signed": true, "bits": null,
+     "algorithms": ["shift_add", "booth"], "trace": false, "stream": false}
+    {"id": 2, "op": "info"}
+
+Replies carry the request id.  A multiply reply is
+{"id", "ok": true, "bits", "results": [{"algorithm", "product_bin", "product",
+"steps", "additions", "subtractions"[, "trace"]}]}, "trace" being a list of
+[A, Q, operation] rows; with "stream": true the steps are first sent one per
+line as {"id", "algorithm", "step", "A", "Q", "operation"}.  "a" and "b" are
+JSON integers (or decimal strings, for clients without big integers).
+Failures are {"id", "ok": false, "error"}; a full queue is reported as error
+"busy" so clients can back off.  A request that fails inside a worker only
+fails itself, never the rest of its micro-batch.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from batch import worker_cache
+from wordmult import (ALGORITHMS, DEFAULT_ALGORITHMS, get_algorithm, int_to_twos_complement, min_bits_for_signed,
+                      min_bits_for_unsigned)
+from wordmult.limbs import MAX_LIMBS, limb_count
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BITS = 256
+
+class RequestError(ValueError):
+    pass
+
+class JobError(RuntimeError):
+    """A job failed inside a worker (its micro-batch neighbours are unaffected)."""
+
+# ========== Requests ==========
+def _operand(req, name):
+    """An integer operand: a JSON integer or a decimal string; floats and booleans are rejected."""
+    if name not in req:
+        raise RequestError(f"missing field {name!r}")
+    value = req[name]
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value, 10)
+        except ValueError:
+            pass
+    raise RequestError("a and b must be integers")
+
+def _algorithm_keys(req):
+    """The requested algorithm keys: a JSON list of strings, or the defaults when absent or empty."""
+    keys = req.get("algorithms")
+    if keys is None:
+        return DEFAULT_ALGORITHMS
+    if not isinstance(keys, list) or not all(isinstance(k, str) for k in keys):
+        raise RequestError("algorithms must be a list of algorithm keys (strings)")
+    return keys or DEFAULT_ALGORITHMS
+
+def parse_request(req, max_bits):
+    """Validate a multiply request; return the job tuple (a, b, signed, bits, trace, algorithms)."""
+    a, b = _operand(req, "a"), _operand(req, "b")
+    signed = bool(req.get("signed", False))
+    if not signed and (a < 0 or b < 0):
+        raise RequestError("Unsigned mode doesn't accept negative")
+    keys = _algorithm_keys(req)
+    try:
+        algorithms = tuple(get_algorithm(k).key for k in keys)
+        need = min_bits_for_signed(a, b) if signed else min_bits_for_unsigned(a, b)
+    except ValueError as e:
+        raise RequestError(str(e)) from None
+    bits = req.get("bits") or need
+    if type(bits) is not int or bits < need:
+        raise RequestError(f"bits must be an integer >= {need} for these operands")
+    if bits > max_bits:
+        raise RequestError(f"{bits}-bit words exceed this server's limit of {max_bits} bits")
+    for key in algorithms:
+        algorithm = get_algorithm(key)
+        if not algorithm.serial and limb_count(bits, algorithm.limb_bits) > MAX_LIMBS:
+            raise RequestError(f"{bits}-bit operands need {limb_count(bits, algorithm.limb_bits)} limbs for {key}; "
+                               f"the limit is {MAX_LIMBS}")
+    trace = bool(req.get("trace") or req.get("stream"))
+    return a, b, signed, bits, trace, algorithms
+
+def run_job(a, b, signed, bits, trace, algorithms, cache=None):
+    """Result dicts of one job; with trace, each carries its steps as [A, Q, operation] rows."""
+    A_bin, B_bin = int_to_twos_complement(a, bits), int_to_twos_complement(b, bits)
+    results = []
+    for key in algorithms:
+        algorithm = get_algorithm(key)
+        if cache is not None:
+            steps, product_bin, product_val = cache.run(algorithm, A_bin, B_bin, bits, signed=signed)
+        else:
+            steps, product_bin, product_val = algorithm.run(A_bin, B_bin, bits, signed=signed)
+        costs = algorithm.costs(steps)
+        result = {"algorithm": key, "product_bin": product_bin, "product": product_val,
+                  "steps": costs["iterations"], "additions": costs["additions"], "subtractions": costs["subtractions"]}
+        if trace:
+            result["trace"] = [[A, Q, op] for _, A, Q, op in steps]
+        results.append(result)
+    return results
+
+def run_jobs(jobs, cache_dir=None):
+    """Pool entry point: run one micro-batch and return, per job, its result list or an error message.
+
+    A job that raises is reported on its own so the rest of the batch still gets answers.
+    """
+    cache = worker_cache(cache_dir)
+    out = []
+    for job in jobs:
+        try:
+            out.append(run_job(*job, cache=cache))
+        except Exception as e:
+            out.append(f"{type(e).__name__}: {e}")
+    return out
+
+# ========== Micro-batching ==========
+class Batcher:
+    """Bounded request queue drained into micro-batches on a process pool."""
+
+    def __init__(self, pool, max_queue=1024, batch_size=64, batch_wait=0.005, max_inflight=None, cache_dir=None):
+        self.pool = pool
+        self.queue = asyncio.Queue(max_queue)
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.cache_dir = cache_dir
+        self._slots = asyncio.Semaphore(max_inflight or (os.cpu_count() or 1) * 2)
+        self.stats = {"requests": 0, "rejected": 0, "errors": 0, "batches": 0, "batched_jobs": 0}
+
+    def submit(self, job):
+        """Queue a job and return a future for its results; raises asyncio.QueueFull when saturated."""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((job, future))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise
+        self.stats["requests"] += 1
+        return future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._slots.acquire()  # bounds batches in flight; the queue absorbs the rest
+            self.stats["batches"] += 1
+            self.stats["batched_jobs"] += len(batch)
+            loop.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.pool, run_jobs, [job for job, _ in batch], self.cache_dir)
+        except Exception as e:
+            self.stats["errors"] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if future.done():  # client may have gone away
+                    continue
+                if isinstance(result, str):
+                    self.stats["errors"] += 1
+                    future.set_exception(JobError(result))
+                else:
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+# ========== Connections ==========
+class SimulationServer:
+    def __init__(self, batcher, max_bits=DEFAULT_MAX_BITS):
+        self.batcher = batcher
+        self.max_bits = max_bits
+        self.clients = 0
+        self.started = time.time()
+
+    def info(self):
+        stats = dict(self.batcher.stats)
+        stats["mean_batch"] = stats["batched_jobs"] / stats["batches"] if stats["batches"] else 0.0
+        return {"algorithms": list(ALGORITHMS), "max_bits": self.max_bits,
+                "max_queue": self.batcher.queue.maxsize, "queued": self.batcher.queue.qsize(),
+                "clients": self.clients, "uptime": time.time() - self.started, "stats": stats}
+
+    async def handle_client(self, reader, writer):
+        self.clients += 1
+        lock = asyncio.Lock()  # keeps each reply (and its streamed steps) contiguous
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(self.handle_line(line, writer, lock))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, ValueError):  # ValueError: line longer than the stream limit
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def handle_line(self, line, writer, lock):
+        rid = None
+        try:
+            req = json.loads(line)
+            if not isinstance(req, dict):
+                raise RequestError("request must be a JSON object")
+            rid = req.get("id")
+            if req.get("op", "multiply") == "info":
+                replies = [{"id": rid, "ok": True, **self.info()}]
+            else:
+                replies = await self.multiply(req, rid)
+        except json.JSONDecodeError:
+            replies = [{"id": rid, "ok": False, "error": "invalid JSON"}]
+        except RequestError as e:
+            replies = [{"id": rid, "ok": False, "error": str(e)}]
+        except asyncio.QueueFull:
+            replies = [{"id": rid, "ok": False, "error": "busy"}]
+        except Exception as e:  # a failed job or a broken pool: every request still gets a reply
+            replies = [{"id": rid, "ok": False, "error": str(e) or type(e).__name__}]
+        async with lock:
+            for n, reply in enumerate(replies, 1):
+                writer.write(json.dumps(reply).encode() + b"\n")
+                if n % 64 == 0:
+                    await writer.drain()  # let slow readers apply backpressure mid-stream
+            await writer.drain()
+
+    async def multiply(self, req, rid):
+        """Run one multiply request; return its reply lines (streamed steps first, if asked for)."""
+        job = parse_request(req, self.max_bits)
+        results = await self.batcher.submit(job)
+        replies = []
+        if req.get("stream"):
+            for result in results:
+                for step, (A, Q, op) in enumerate(result["trace"]):
+                    replies.append({"id": rid, "algorithm": result["algorithm"], "step": step,
+                                    "A": A, "Q": Q, "operation": op})
+            if not req.get("trace"):
+                for result in results:
+                    del result["trace"]
+        replies.append({"id": rid, "ok": True, "bits": job[3], "results": results})
+        return replies
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, workers=None, max_bits=DEFAULT_MAX_BITS, max_queue=1024,
+                batch_size=64, batch_wait=0.005, cache_dir=None, ready=None):
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        batcher = Batcher(pool, max_queue=max_queue, batch_size=batch_size, batch_wait=batch_wait,
+                          max_inflight=workers * 2, cache_dir=cache_dir)
+        app = SimulationServer(batcher, max_bits=max_bits)
+        server = await asyncio.start_server(app.handle_client, host, port, limit=1 << 20)
+        batch_task = asyncio.ensure_future(batcher.run())
+        print(f"serving on {host}:{server.sockets[0].getsockname()[1]} with {workers} workers", file=sys.stderr)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+# ========== CLI ==========
+def build_parser():
+    p = argparse.ArgumentParser(description="Serve the multiplier simulators to local clients (JSON lines over TCP).")
+    p.add_argument("--host", default="127.0.0.1", help="bind address (default: localhost only)")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    p.add_argument("--max-bits", type=int, default=DEFAULT_MAX_BITS, help="widest word accepted")
+    p.add_argument("--max-queue", type=int, default=1024, help="queued requests before replying 'busy'")
+    p.add_argument("--batch-size", type=int, default=64, help="most requests per micro-batch")
+    p.add_argument("--batch-wait-ms", type=float, default=5.0, help="how long to wait to fill a micro-batch")
+    p.add_argument("--cache-dir", default=None, help="persistent trace cache shared by the workers")
+    return p
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_bits=args.max_bits,
+                          max_queue=args.max_queue, batch_size=args.batch_size,
+                          batch_wait=args.batch_wait_ms / 1000, cache_dir=args.cache_dir))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+# verify.py
+"""Exhaustive / sampled verification of the multiplier algorithms against a * b.
+
+The N-bit x N-bit operand space is split into shards of consecutive A rows.
+Shards run on a process pool and every completed shard is written to a JSON
+checkpoint, so an interrupted run picks up where it stopped when started again
+with the same arguments.
+
+    python src/verify.py --bits 16 --signed --checkpoint v16s.json
+    python src/verify.py --bits 32 --density 1e-9 --workers 8
+    python src/verify.py --bits 1024 --samples 10000    # wide words: a fixed number of random pairs
+
+Widths up to 32 bits use the NumPy kernels from wordmult/vectorized.py when NumPy is
+installed (Shift-and-Add and radix-2 Booth); everything else runs the scalar
+step generators without keeping any rows.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from fractions import Fraction
+
+from wordmult import ALGORITHMS, DEFAULT_ALGORITHMS, get_algorithm, last_step, product_from_registers
+from wordmult.vectorized import MAX_BITS as VECTOR_MAX_BITS, NUMPY_AVAILABLE, booth_batch, shift_and_add_batch
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+VECTOR_KERNELS = {"shift_add": shift_and_add_batch, "booth": booth_batch}
+CHUNK_PAIRS = 1 << 20  # pairs per vectorized call
+EXHAUSTIVE_MAX_BITS = 16  # wider spaces are sampled by default
+DEFAULT_SAMPLES = 100000  # random pairs per run above EXHAUSTIVE_MAX_BITS
+
+# ========== Operand space ==========
+def to_signed(x, N):
+    return x - (1 << N) if x >> (N - 1) else x
+
+def expected_product(a, b, N, signed):
+    """Reference product of two N-bit patterns."""
+    if signed:
+        return to_signed(a, N) * to_signed(b, N)
+    return a * b
+
+def edge_values(N):
+    """Patterns that tend to break multipliers: 0, 1, -1, the extremes and their neighbours."""
+    top = 1 << (N - 1)
+    mask = (1 << N) - 1
+    return sorted(v for v in {0, 1, 2, mask, mask - 1, top, top - 1, top + 1} if 0 <= v <= mask)
+
+def shard_rows(N, shards, shard):
+    """Range of A patterns covered by one shard."""
+    size = 1 << N
+    return range(size * shard // shards, size * (shard + 1) // shards)
+
+def shard_sample_count(N, shards, shard, density, samples=None):
+    """Random pairs drawn in one shard: a share of samples, else density times the shard's pairs.
+
+    Integer arithmetic throughout, so 1024-bit spaces with tiny densities work.
+    """
+    if samples is not None:
+        return samples * (shard + 1) // shards - samples * shard // shards
+    rows = shard_rows(N, shards, shard)
+    return round(Fraction(density) * (rows.stop - rows.start) * (1 << N))
+
+def iter_shard_pairs(N, shards, shard, density, seed, samples=None):
+    """Yield (a, b) patterns for one shard: every pair (density 1), or a seeded random sample."""
+    rows = shard_rows(N, shards, shard)
+    if samples is None and density >= 1:
+        for a in rows:
+            for b in range(1 << N):
+                yield a, b
+        return
+    if shard == 0:
+        for a in edge_values(N):
+            for b in edge_values(N):
+                yield a, b
+    rng = random.Random(f"{seed}:{shard}")
+    for _ in range(shard_sample_count(N, shards, shard, density, samples)):
+        yield rng.randrange(rows.start, rows.stop), rng.getrandbits(N)
+
+# ========== Shard workers ==========
+def _vector_chunks(N, shards, shard, density, seed, samples=None):
+    """NumPy version of iter_shard_pairs yielding (A_vals, B_vals) arrays."""
+    rows = shard_rows(N, shards, shard)
+    size = 1 << N
+    if samples is None and density >= 1:
+        b = np.arange(size, dtype=np.int64)
+        per_chunk = max(1, CHUNK_PAIRS // size)
+        for start in range(rows.start, rows.stop, per_chunk):
+            a = np.arange(start, min(start + per_chunk, rows.stop), dtype=np.int64)
+            yield np.repeat(a, size), np.tile(b, len(a))
+        return
+    if shard == 0:
+        edges = np.array(edge_values(N), dtype=np.int64)
+        yield np.repeat(edges, len(edges)), np.tile(edges, len(edges))
+    rng = np.random.default_rng([seed, shard])
+    count = shard_sample_count(N, shards, shard, density, samples)
+    while count > 0:
+        n = min(count, CHUNK_PAIRS)
+        yield (rng.integers(rows.start, rows.stop, n, dtype=np.int64),
+               rng.integers(0, size, n, dtype=np.int64))
+        count -= n
+
+def _check_vectorized(key, N, signed, shards, shard, density, seed, samples, max_examples):
+    kernel = VECTOR_KERNELS[key]
+    pairs = mismatches = 0
+    examples = []
+    for a, b in _vector_chunks(N, shards, shard, density, seed, samples):
+        got = kernel(a, b, N, signed=signed, record_steps=False).product
+        if signed:
+            a_s = np.where(a >> (N - 1), a - (1 << N), a)
+            b_s = np.where(b >> (N - 1), b - (1 << N), b)
+            want = a_s * b_s
+        else:
+            want = a.astype(np.uint64) * b.astype(np.uint64)
+        bad = np.flatnonzero(got != want)
+        pairs += len(a)
+        mismatches += len(bad)
+        for i in bad[:max(0, max_examples - len(examples))]:
+            examples.append(_example(key, int(a[i]), int(b[i]), N, signed, int(got[i])))
+    return pairs, mismatches, examples
+
+def _check_scalar(key, N, signed, shards, shard, density, seed, samples, max_examples):
+    algorithm = get_algorithm(key)
+    pairs = mismatches = 0
+    examples = []
+    for a, b in iter_shard_pairs(N, shards, shard, density, seed, samples):
+        _, A, Q, _ = last_step(algorithm.steps(f"{a:0{N}b}", f"{b:0{N}b}", N, signed))
+        got = product_from_registers(A, Q, N, signed)[1]
+        pairs += 1
+        if got != expected_product(a, b, N, signed):
+            mismatches += 1
+            if len(examples) < max_examples:
+                examples.append(_example(key, a, b, N, signed, got))
+    return pairs, mismatches, examples
+
+def _example(key, a, b, N, signed, got):
+    if signed:
+        a, b = to_signed(a, N), to_signed(b, N)
+    return {"algorithm": key, "a": a, "b": b, "got": got, "expected": a * b}
+
+def run_shard(job):
+    """Pool entry point: check every algorithm on one shard and return its summary."""
+    shard, config = job
+    N, signed = config["bits"], config["signed"]
+    result = {"pairs": 0, "mismatches": {}, "examples": []}
+    for key in config["algorithms"]:
+        use_numpy = NUMPY_AVAILABLE and key in VECTOR_KERNELS and N <= VECTOR_MAX_BITS
+        check = _check_vectorized if use_numpy else _check_scalar
+        pairs, mismatches, examples = check(key, N, signed, config["shards"], shard, config["density"],
+                                            config["seed"], config.get("samples"), config["max_examples"])
+        result["pairs"] += pairs
+        result["mismatches"][key] = mismatches
+        result["examples"].extend(examples)
+    return shard, result
+
+# ========== Checkpointing ==========
+def load_checkpoint(path, config):
+    """Return completed shards from path, or {} when starting fresh."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        state = json.load(f)
+    if state.get("config") != config:
+        raise ValueError(f"Checkpoint {path} was written for a different run: {state.get('config')}")
+    return {int(k): v for k, v in state["done"].items()}
+
+def save_checkpoint(path, config, done):
+    """Atomically rewrite the checkpoint so a crash never leaves it half-written."""
+    if not path:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"config": config, "done": {str(k): v for k, v in sorted(done.items())}}, f)
+    os.replace(tmp, path)
+
+# ========== Driver ==========
+def verify(config, checkpoint=None, workers=None, progress=sys.stderr):
+    """Run (or resume) a verification and return the merged report dict."""
+    done = load_checkpoint(checkpoint, config)
+    pending = [s for s in range(config["shards"]) if s not in done]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    new_pairs = 0
+    jobs = [(s, config) for s in pending]
+    pool = multiprocessing.Pool(workers) if workers > 1 and len(jobs) > 1 else None
+    try:
+        results = pool.imap_unordered(run_shard, jobs) if pool else map(run_shard, jobs)
+        for shard, result in results:
+            done[shard] = result
+            new_pairs += result["pairs"]
+            save_checkpoint(checkpoint, config, done)
+            elapsed = time.perf_counter() - start
+            print(f"shard {len(done)}/{config['shards']}  {new_pairs / max(elapsed, 1e-9):,.0f} pairs/s",
+                  file=progress)
+    finally:
+        if pool:
+            pool.terminate()
+    elapsed = time.perf_counter() - start
+    mismatches = {key: sum(r["mismatches"].get(key, 0) for r in done.values()) for key in config["algorithms"]}
+    examples = [e for s in sorted(done) for e in done[s]["examples"]][:config["max_examples"]]
+    return {
+        "config": config,
+        "pairs": sum(r["pairs"] for r in done.values()),
+        "resumed_shards": config["shards"] - len(pending),
+        "elapsed": elapsed,
+        "pairs_per_second": new_pairs / elapsed if elapsed else 0.0,
+        "mismatches": mismatches,
+        "first_mismatches": examples,
+    }
+
+def build_parser():
+    p = argparse.ArgumentParser(description="Verify multiplier algorithms against a * b over the N-bit operand space.")
+    p.add_argument("--bits", type=int, default=8, help="word width N")
+    p.add_argument("--signed", action="store_true", help="verify signed (two's complement) products")
+    p.add_argument("--algorithms", default=",".join(DEFAULT_ALGORITHMS),
+                   help=f"comma-separated algorithm keys ({', '.join(ALGORITHMS)})")
+    p.add_argument("--density", type=float, default=None,
+                   help=f"fraction of the space to sample (default: 1 for N <= {EXHAUSTIVE_MAX_BITS})")
+    p.add_argument("--samples", type=int, default=None,
+                   help=f"random pairs to check instead of a density (default for N > {EXHAUSTIVE_MAX_BITS}: "
+                        f"{DEFAULT_SAMPLES:,})")
+    p.add_argument("--shards", type=int, default=None, help="number of shards (default: min(2**N, 256))")
+    p.add_argument("--seed", type=int, default=0, help="sampling seed")
+    p.add_argument("--max-mismatches", type=int, default=20, help="mismatch examples to keep")
+    p.add_argument("--checkpoint", default=None, help="JSON checkpoint file for resumable runs")
+    p.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    p.add_argument("--json", action="store_true", help="print the report as JSON")
+    return p
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        algorithms = [get_algorithm(key.strip()).key for key in args.algorithms.split(",")]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.bits < 1:
+        parser.error("--bits must be positive")
+    if args.density is not None and args.samples is not None:
+        parser.error("give either --density or --samples")
+    if args.samples is not None and args.samples < 1:
+        parser.error("--samples must be positive")
+    samples, density = args.samples, args.density
+    if samples is None and density is None:
+        if args.bits <= EXHAUSTIVE_MAX_BITS:
+            density = 1.0
+        else:
+            samples = DEFAULT_SAMPLES
+    config = {
+        "bits": args.bits,
+        "signed": args.signed,
+        "algorithms": algorithms,
+        "density": None if density is None else min(density, 1.0),
+        "samples": samples,
+        "shards": args.shards or min(1 << args.bits, 256),
+        "seed": args.seed,
+        "max_examples": args.max_mismatches,
+    }
+    try:
+        report = verify(config, checkpoint=args.checkpoint, workers=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        mode = "signed" if args.signed else "unsigned"
+        print(f"{report['pairs']:,} pairs checked ({args.bits}-bit {mode}) in {report['elapsed']:.1f}s, "
+              f"{report['pairs_per_second']:,.0f} pairs/s")
+        for key, count in report["mismatches"].items():
+            print(f"  {get_algorithm(key).label}: {count:,} mismatches")
+        for e in report["first_mismatches"]:
+            print(f"  {e['algorithm']}: {e['a']} * {e['b']} = {e['got']} (expected {e['expected']})")
+    return 1 if any(report["mismatches"].values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
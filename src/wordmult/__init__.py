@@ -0,0 +1,30 @@
+"""GUI-free core of the word multiplier simulator.
+
+Import this package (not main.py) from scripts and worker processes; it
+pulls in neither tkinter nor customtkinter.  Exporters live in
+wordmult.export and the trace cache in wordmult.tracecache.  When
+WORDMULT_LUT_DIR is set, the lookup tables in it (see wordmult.lut) are
+installed on import.  The limb engines (schoolbook, Karatsuba, Toom-3) in
+wordmult.limbs register themselves next to the bit-serial algorithms.
+"""
+import os
+
+from .core import (ALGORITHMS, DEFAULT_ALGORITHMS, LOOKUP_TABLES, MAX_BITS, Algorithm, booth_steps, collect_steps,
+                   get_algorithm, int_to_twos_complement, iter_booth4_steps, iter_booth8_steps,
+                   iter_booth_radix_steps, iter_booth_steps, iter_shift_and_add_steps, last_step,
+                   min_bits_for_signed, min_bits_for_unsigned, product_from_registers, register_algorithm,
+                   shift_and_add_steps, step_at, twos_complement_to_int)
+from .limbs import LimbAlgorithm, limb_algorithm
+from .steptrace import OP_LABELS, Op, StepTrace
+
+if os.environ.get("WORDMULT_LUT_DIR"):
+    from .lut import install_tables
+    install_tables()
+
+__all__ = [
+    "ALGORITHMS", "DEFAULT_ALGORITHMS", "LOOKUP_TABLES", "MAX_BITS", "OP_LABELS", "Algorithm", "LimbAlgorithm", "Op",
+    "StepTrace", "booth_steps", "collect_steps", "get_algorithm", "int_to_twos_complement", "iter_booth4_steps",
+    "iter_booth8_steps", "iter_booth_radix_steps", "iter_booth_steps", "iter_shift_and_add_steps", "last_step",
+    "limb_algorithm", "min_bits_for_signed", "min_bits_for_unsigned", "product_from_registers", "register_algorithm",
+    "shift_and_add_steps", "step_at", "twos_complement_to_int",
+]
@@ -0,0 +1,206 @@
+# analysis.py
+"""Aggregate statistics over many operand pairs, merged chunk by chunk.
+
+A BatchStats keeps running histograms (value -> count) of every algorithm's
+step count, additions and subtractions (plus limb products for the limb
+engines), the operations each Booth variant skips relative to
+Shift-and-Add, and the pairs whose product differs from a * b.  Traces are
+dropped as soon as their costs are counted, so memory depends on the number
+of distinct values, not on the number of pairs:
+
+    stats = BatchStats(("shift_add", "booth"), signed=True)
+    for chunk in chunked(pairs, CHUNK_PAIRS):
+        stats.merge(analyze_chunk(chunk, True, ("shift_add", "booth")))   # pool workers in the GUI
+    stats.summary("booth")
+
+Pair sources (range_pairs, wordmult.throughput.iter_random_pairs, csv_pairs) are lazy iterators, so
+a batch of millions of pairs never exists as one list.
+"""
+import csv
+from collections import Counter
+from itertools import islice
+
+from .core import get_algorithm, int_to_twos_complement, min_bits_for_signed, min_bits_for_unsigned
+from .limbs import MAX_LIMBS, limb_count
+
+CHUNK_PAIRS = 256  # pairs per pool task
+MAX_EXAMPLES = 20  # mismatching pairs kept for the report
+
+METRICS = ("steps", "additions", "subtractions", "skipped", "limb_products")
+METRIC_LABELS = {
+    "steps": "Steps",
+    "additions": "Additions",
+    "subtractions": "Subtractions",
+    "skipped": "Skipped vs Shift-and-Add",
+    "limb_products": "Limb products",
+}
+
+# ========== Histograms ==========
+class Histogram:
+    """Exact counts per integer value, mergeable across chunks and processes."""
+    __slots__ = ("bins",)
+
+    def __init__(self):
+        self.bins = Counter()
+
+    def add(self, value):
+        self.bins[value] += 1
+
+    def merge(self, other):
+        self.bins.update(other.bins)
+
+    @property
+    def count(self):
+        return sum(self.bins.values())
+
+    def mean(self):
+        n = self.count
+        return sum(v * c for v, c in self.bins.items()) / n if n else 0.0
+
+    def quantile(self, q):
+        n = self.count
+        if not n:
+            return 0
+        seen = 0
+        for value in sorted(self.bins):
+            seen += self.bins[value]
+            if seen >= q * n:
+                return value
+        return max(self.bins)
+
+    def summary(self):
+        if not self.bins:
+            return {"count": 0, "mean": 0.0, "min": 0, "p50": 0, "p90": 0, "max": 0}
+        return {"count": self.count, "mean": self.mean(), "min": min(self.bins), "p50": self.quantile(0.5),
+                "p90": self.quantile(0.9), "max": max(self.bins)}
+
+    def buckets(self, count=24):
+        """(low, high, pairs) for at most count equal-width buckets, for drawing."""
+        if not self.bins:
+            return []
+        lo, hi = min(self.bins), max(self.bins)
+        width = max(1, -(-(hi - lo + 1) // count))
+        totals = Counter()
+        for value, c in self.bins.items():
+            totals[(value - lo) // width] += c
+        return [(lo + i * width, lo + (i + 1) * width - 1, totals[i]) for i in range((hi - lo) // width + 1)]
+
+# ========== Aggregates ==========
+class BatchStats:
+    """Running aggregates of one batch; chunks computed elsewhere are folded in with merge()."""
+
+    def __init__(self, keys, signed=False):
+        self.keys = tuple(keys)
+        self.signed = signed
+        self.pairs = 0
+        self.rejected_pairs = 0  # invalid or too wide for the chosen mode
+        self.histograms = {key: {} for key in self.keys}  # key -> metric -> Histogram
+        self.mismatches = Counter()
+        self.examples = []      # {"algorithm", "a", "b", "got", "expected"}
+
+    def histogram(self, key, metric):
+        hists = self.histograms[key]
+        if metric not in hists:
+            hists[metric] = Histogram()
+        return hists[metric]
+
+    def metrics(self, key):
+        return [metric for metric in METRICS if metric in self.histograms[key]]
+
+    def merge(self, other):
+        self.pairs += other.pairs
+        self.rejected_pairs += other.rejected_pairs
+        for key, hists in other.histograms.items():
+            for metric, hist in hists.items():
+                self.histogram(key, metric).merge(hist)
+        self.mismatches.update(other.mismatches)
+        self.examples.extend(other.examples[:max(0, MAX_EXAMPLES - len(self.examples))])
+        return self
+
+    def summary(self, key):
+        """Per-metric summaries plus the mismatch count of one algorithm."""
+        return {"algorithm": key, "pairs": self.histogram(key, "steps").count, "mismatches": self.mismatches[key],
+                **{metric: self.histograms[key][metric].summary() for metric in self.metrics(key)}}
+
+def analyze_chunk(pairs, signed, keys, bits=None):
+    """Pool entry point: run every algorithm on every pair and return the chunk's BatchStats.
+
+    bits fixes the word width; by default each pair uses the smallest that fits.
+    """
+    stats = BatchStats(keys, signed)
+    algorithms = [get_algorithm(key) for key in keys]
+    booth_like = [a.key for a in algorithms if a.serial and a.key != "shift_add"]
+    limb_widths = [a.limb_bits for a in algorithms if not a.serial]
+    for a, b in pairs:
+        try:
+            if not signed and (a < 0 or b < 0):
+                raise ValueError("Unsigned mode doesn't accept negative")
+            need = min_bits_for_signed(a, b) if signed else min_bits_for_unsigned(a, b)
+            N = max(bits or need, need)
+            if any(limb_count(N, w) > MAX_LIMBS for w in limb_widths):
+                raise ValueError("too many limbs")
+        except ValueError:
+            stats.rejected_pairs += 1
+            continue
+        stats.pairs += 1
+        A_bin, B_bin = int_to_twos_complement(a, N), int_to_twos_complement(b, N)
+        adder_ops = {}
+        for algorithm in algorithms:
+            key = algorithm.key
+            steps, _, product_val = algorithm.run(A_bin, B_bin, N, signed=signed)
+            costs = algorithm.costs(steps)
+            stats.histogram(key, "steps").add(costs["iterations"])
+            stats.histogram(key, "additions").add(costs["additions"])
+            stats.histogram(key, "subtractions").add(costs["subtractions"])
+            if "limb_products" in costs:
+                stats.histogram(key, "limb_products").add(costs["limb_products"])
+            adder_ops[key] = costs["additions"] + costs["subtractions"]
+            if product_val != a * b:
+                stats.mismatches[key] += 1
+                if len(stats.examples) < MAX_EXAMPLES:
+                    stats.examples.append({"algorithm": key, "a": a, "b": b, "got": product_val, "expected": a * b})
+        if "shift_add" in adder_ops:
+            for key in booth_like:
+                stats.histogram(key, "skipped").add(adder_ops["shift_add"] - adder_ops[key])
+    return stats
+
+# ========== Pair sources ==========
+def range_pairs(lo, hi):
+    """Every (a, b) with lo <= a, b <= hi; yields (hi - lo + 1) ** 2 pairs."""
+    for a in range(lo, hi + 1):
+        for b in range(lo, hi + 1):
+            yield a, b
+
+def csv_pairs(lines, rejected=None):
+    """Pairs from CSV rows: the "a" and "b" columns under such a header (batch.py output), else the
+    first two fields ("a,b" or "a b").  Rows that are not two integers are skipped and counted in
+    rejected[0]."""
+    cols = (0, 1)
+    for line_no, row in enumerate(csv.reader(lines)):
+        if len(row) == 1:
+            row = row[0].split()
+        if not row or row[0].startswith("#"):
+            continue
+        if line_no == 0:
+            header = [cell.strip().lower() for cell in row]
+            if "a" in header and "b" in header:
+                cols = (header.index("a"), header.index("b"))
+                continue
+        try:
+            yield int(row[cols[0]]), int(row[cols[1]])
+        except (IndexError, ValueError):
+            if rejected is not None:
+                rejected[0] += 1
+
+def chunked(iterable, size=CHUNK_PAIRS):
+    """Lists of at most size items, read lazily (batch.py groups its pool tasks with this too)."""
+    if size < 1:
+        raise ValueError(f"chunk size must be positive, got {size}")
+    return _chunks(iter(iterable), size)
+
+def _chunks(iterator, size):
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,240 @@
+# core.py
+"""Two's complement helpers, the multiplier step generators and the algorithm registry.
+
+Nothing here imports a GUI toolkit, so scripts and worker processes can use
+it without a display:
+
+    from wordmult import booth_steps
+    steps, product_bin, product_val = booth_steps("00000101", "11111101", 8, signed=True)
+"""
+from collections import deque
+from itertools import islice
+
+from .profiling import PROFILER
+from .steptrace import ADD_OPS, DIGIT_OPS, SUB_OPS, Op, StepTrace
+
+# ========== Utilities ==========
+def int_to_twos_complement(x, bits):
+    """Return bits-bit two's complement representation for integer x (works for negative as well)."""
+    return format((x + (1 << bits)) % (1 << bits), f"0{bits}b")
+
+def twos_complement_to_int(binstr):
+    """Interpret binary string as two's complement signed integer."""
+    return int(binstr, 2) - (1 << len(binstr)) if binstr[0] == "1" else int(binstr, 2)
+
+MAX_BITS = 4096
+
+def _round_bits(bits):
+    """Round a required width up to a conventional register size (8, 16, 32, ... MAX_BITS)."""
+    if bits > MAX_BITS:
+        raise ValueError(f"Operands need {bits} bits; the simulator supports up to {MAX_BITS}")
+    size = 8
+    while size < bits:
+        size <<= 1
+    return size
+
+def min_bits_for_signed(a, b):
+    """Return minimum bits to represent signed operands a and b (include sign)."""
+    max_val = max(abs(a), abs(b))
+    if max_val == 0:
+        return 2  # allow for sign
+    # exact integer bit length (+1 for sign); log2 loses precision on wide values
+    bits = max_val.bit_length() + 1
+    # round up to conventional sizes
+    return _round_bits(bits)
+
+def min_bits_for_unsigned(a, b):
+    max_val = max(a, b)
+    if max_val == 0:
+        return 1
+    return _round_bits(max_val.bit_length())
+
+# ========== Algorithms (generators yielding integer register states) ==========
+def iter_shift_and_add_steps(A_bin, B_bin, N):
+    """Yield (step, A, Q, op) with A/Q as N-bit ints, one step at a time."""
+    mask = (1 << N) - 1
+    A_val = int(A_bin, 2)
+    A_reg = 0
+    Q_reg = int(B_bin, 2)
+    yield 0, A_reg, Q_reg, Op.INIT
+    for i in range(N):
+        if Q_reg & 1:
+            A_reg = (A_reg + A_val) & mask
+            op = Op.ADD
+        else:
+            op = Op.NO_ADD
+        combined = ((A_reg << N) | Q_reg) >> 1
+        A_reg, Q_reg = (combined >> N) & mask, combined & mask
+        yield i + 1, A_reg, Q_reg, op
+
+def iter_booth_steps(A_bin, B_bin, N):
+    """Yield (step, A, Q, op) for Booth's algorithm with A/Q as N-bit ints."""
+    mask = (1 << N) - 1
+    M = twos_complement_to_int(A_bin)
+    Q = twos_complement_to_int(B_bin)
+    A = 0
+    q_1 = 0
+    yield 0, A & mask, Q & mask, Op.INIT
+    for step in range(1, N + 1):
+        q0 = Q & 1
+        if (q0, q_1) == (1, 0):
+            A = A - M
+            op = Op.SUB_M
+        elif (q0, q_1) == (0, 1):
+            A = A + M
+            op = Op.ADD_M
+        else:
+            op = Op.NO_OP
+        # Arithmetic right shift on combined A,Q,q_1
+        combined = ((A & mask) << (N + 1)) | ((Q & mask) << 1) | q_1
+        # preserve sign in Python manual style: >>1 arithmetic simulated by checking sign of A
+        sign = (A >> (N - 1)) & 1
+        combined >>= 1
+        if sign:
+            combined |= (1 << (2 * N))  # keep sign extension if negative
+        A = (combined >> (N + 1)) & mask
+        Q = (combined >> 1) & mask
+        q_1 = combined & 1
+        yield step, A, Q, op
+
+def last_step(step_iter):
+    """Run a step generator to the end without keeping intermediate rows."""
+    return deque(step_iter, maxlen=1)[0]
+
+def step_at(step_iter, k):
+    """Return step k of a step generator without materializing steps 0..k-1."""
+    return next(islice(step_iter, k, None))
+
+def product_from_registers(A, Q, N, signed=False):
+    """Return (product_bin, product_val) from the final A and Q registers."""
+    product_bin = f"{((A << N) | Q) & ((1 << (2 * N)) - 1):0{2 * N}b}"
+    if signed:
+        product_val = twos_complement_to_int(product_bin)
+    else:
+        product_val = int(product_bin, 2)
+    return product_bin, product_val
+
+def collect_steps(step_iter, N, signed=False):
+    """Drain a step generator into (StepTrace, product_bin, product_val)."""
+    steps = StepTrace(N)
+    for _, A, Q, op in step_iter:
+        steps.append(A, Q, op)
+    product_bin, product_val = product_from_registers(A, Q, N, signed)
+    return steps, product_bin, product_val
+
+# (algorithm key, N) -> wordmult.lut.LookupTable; filled by lut.install_tables()
+LOOKUP_TABLES = {}
+
+# ========== Algorithms (pure functions returning steps) ==========
+def shift_and_add_steps(A_bin, B_bin, N, signed=False):
+    with PROFILER.phase("compute:shift_add"):
+        table = LOOKUP_TABLES.get(("shift_add", N)) if LOOKUP_TABLES else None
+        if table is not None:
+            return table.run(A_bin, B_bin, signed)
+        return collect_steps(iter_shift_and_add_steps(A_bin, B_bin, N), N, signed)
+
+def booth_steps(A_bin, B_bin, N, signed=False):
+    with PROFILER.phase("compute:booth"):
+        table = LOOKUP_TABLES.get(("booth", N)) if LOOKUP_TABLES else None
+        if table is not None:
+            return table.run(A_bin, B_bin, signed)
+        return collect_steps(iter_booth_steps(A_bin, B_bin, N), N, signed)
+
+# ========== Higher-radix (modified) Booth ==========
+def iter_booth_radix_steps(A_bin, B_bin, N, k):
+    """Yield (step, A, Q, op) for radix-2**k Booth, retiring k multiplier bits per iteration.
+
+    The recoder reads k + 1 overlapping bits of the multiplier into a digit in
+    [-2**(k-1), 2**(k-1)], adds digit * M to the accumulator and shifts A:Q right
+    by k.  The accumulator is kept a few bits wider than N internally (as the
+    hardware does) so +-2M .. +-4M never overflow; A shows its low N bits.
+    """
+    mask = (1 << N) - 1
+    M = twos_complement_to_int(A_bin)
+    Q_val = twos_complement_to_int(B_bin)
+    group = (1 << k) - 1
+    A = 0
+    Q = Q_val & mask
+    yield 0, A, Q, Op.INIT
+    pos = 0
+    step = 0
+    while pos < N:
+        # window of k multiplier bits plus the bit below it (sign-extended past N)
+        window = (Q_val >> pos) & group
+        below = (Q_val >> (pos - 1)) & 1 if pos else 0
+        digit = window + below - ((window >> (k - 1)) << k)
+        A += digit * M
+        shift = min(k, N - pos)
+        Q = ((Q >> shift) | ((A & ((1 << shift) - 1)) << (N - shift))) & mask
+        A >>= shift  # arithmetic: Python ints keep the sign
+        pos += shift
+        step += 1
+        yield step, A & mask, Q, DIGIT_OPS[digit]
+
+def iter_booth4_steps(A_bin, B_bin, N):
+    return iter_booth_radix_steps(A_bin, B_bin, N, 2)
+
+def iter_booth8_steps(A_bin, B_bin, N):
+    return iter_booth_radix_steps(A_bin, B_bin, N, 3)
+
+# ========== Algorithm Registry ==========
+class Algorithm:
+    """A multiplier algorithm: a step generator plus the metadata the GUI and exporters need."""
+    serial = True  # one adder pass per iteration: gate timing and the throughput model apply
+
+    def __init__(self, key, label, short, iter_steps, radix_bits=1, setup_additions=0):
+        self.key = key
+        self.family = key             # GUI pane; variants (e.g. "karatsuba/8") share their family's
+        self.label = label            # pane title / export section
+        self.short = short            # summary row prefix
+        self.iter_steps = iter_steps  # (A_bin, B_bin, N) -> iterator of (step, A, Q, op)
+        self.radix_bits = radix_bits  # multiplier bits retired per iteration
+        self.setup_additions = setup_additions  # e.g. precomputing 3M for radix-8
+        self.phase = "compute:" + key  # profiling phase name
+
+    def run(self, A_bin, B_bin, N, signed=False):
+        """Return (steps, product_bin, product_val) like shift_and_add_steps."""
+        with PROFILER.phase(self.phase):
+            table = LOOKUP_TABLES.get((self.key, N)) if LOOKUP_TABLES else None
+            if table is not None:
+                return table.run(A_bin, B_bin, signed)
+            return collect_steps(self.steps(A_bin, B_bin, N, signed), N, signed)
+
+    def steps(self, A_bin, B_bin, N, signed=False):
+        """Step iterator for one pair; the bit-serial generators read signedness from the final A:Q only."""
+        return self.iter_steps(A_bin, B_bin, N)
+
+    def costs(self, steps):
+        """Return iteration, add/subtract and shift counts for a finished trace."""
+        ops = steps.op_codes()
+        return {
+            "iterations": len(ops) - 1,
+            "additions": sum(1 for op in ops if op in ADD_OPS) + self.setup_additions,
+            "subtractions": sum(1 for op in ops if op in SUB_OPS),
+            "shifts": len(ops) - 1,
+        }
+
+ALGORITHMS = {}
+# family key -> factory(parameter string) for parameterized variants such as "karatsuba/8"
+VARIANT_FACTORIES = {}
+
+def register_algorithm(algorithm):
+    ALGORITHMS[algorithm.key] = algorithm
+    return algorithm
+
+def get_algorithm(key):
+    try:
+        return ALGORITHMS[key]
+    except KeyError:
+        family, _, parameter = key.partition("/")
+        if parameter and family in VARIANT_FACTORIES:
+            return VARIANT_FACTORIES[family](parameter)
+        raise ValueError(f"Unknown algorithm {key!r}; choose from {', '.join(ALGORITHMS)}") from None
+
+register_algorithm(Algorithm("shift_add", "Shift-and-Add", "ShiftAdd", iter_shift_and_add_steps))
+register_algorithm(Algorithm("booth", "Booth's Algorithm", "Booth", iter_booth_steps))
+register_algorithm(Algorithm("booth4", "Radix-4 Booth", "Booth-4", iter_booth4_steps, radix_bits=2))
+register_algorithm(Algorithm("booth8", "Radix-8 Booth", "Booth-8", iter_booth8_steps, radix_bits=3,
+                             setup_additions=1))
+
+DEFAULT_ALGORITHMS = ("shift_add", "booth")
@@ -0,0 +1,294 @@
+# export.py
+"""Export rows, streaming writers and the background ExportJob.
+
+reportlab and openpyxl are only imported when a PDF or XLSX export runs;
+PDF_AVAILABLE / XLSX_AVAILABLE just check that they are installed.
+"""
+import csv
+import json
+import os
+import threading
+import time
+from importlib.util import find_spec
+
+from .core import get_algorithm, int_to_twos_complement
+from .profiling import PROFILER
+
+PDF_AVAILABLE = find_spec("reportlab") is not None
+XLSX_AVAILABLE = find_spec("openpyxl") is not None
+
+# ========== Export ==========
+class ExportCancelled(Exception):
+    pass
+
+THROUGHPUT_HEADER = ["Algorithm", "Architecture", "Operations", "Cycles", "Ops/Cycle", "Latency Min",
+                     "Latency Mean", "Latency P50", "Latency P90", "Latency P99", "Latency Max", "Utilization",
+                     "Clock (gate delays)"]
+
+def throughput_row(key, report):
+    lat = report["latency"]
+    return [get_algorithm(key).label, report["architecture"], report["operations"], report["cycles"],
+            round(report["throughput"], 6), lat["min"], round(lat["mean"], 3), lat["p50"], lat["p90"], lat["p99"],
+            lat["max"], round(report["utilization"], 4),
+            "" if report["clock_period"] is None else report["clock_period"]]
+
+def iter_export_rows(operand_a, operand_b, mode, bits, results, throughput=None):
+    """Yield the rows for every exporter one at a time: steps per algorithm, summary, cost comparison.
+
+    results maps algorithm key -> (steps, product_bin, product_val).  Step rows are
+    formatted from the traces as they are written, so nothing is built up front.
+    throughput optionally maps algorithm key -> wordmult.throughput report.
+    """
+    yield ["Word Multiplier Simulation Export"]
+    yield ["Operands", f"A={operand_a}", f"B={operand_b}", f"Mode={mode}", f"Bits={bits}"]
+    for key, (steps, _, _) in results.items():
+        yield []
+        yield [f"{get_algorithm(key).label} Steps"]
+        yield ["Step", "A", "Q", "Operation"]
+        for s in steps:
+            yield list(s)
+    yield []
+    yield ["Summary"]
+    yield ["A (bin)", int_to_twos_complement(operand_a, bits)]
+    yield ["B (bin)", int_to_twos_complement(operand_b, bits)]
+    for key, (_, product_bin, product_val) in results.items():
+        short = get_algorithm(key).short
+        yield [f"{short} Product (bin)", product_bin]
+        yield [f"{short} Product (dec)", str(product_val)]
+    yield []
+    yield ["Cost Comparison"]
+    yield ["Algorithm", "Iterations", "Additions", "Subtractions", "Shifts", "Limb Products"]
+    for key, (steps, _, _) in results.items():
+        algorithm = get_algorithm(key)
+        costs = algorithm.costs(steps)
+        yield [algorithm.label, costs["iterations"], costs["additions"], costs["subtractions"], costs["shifts"],
+               costs.get("limb_products", 0)]
+    if throughput:
+        yield []
+        yield ["Throughput Model"]
+        yield THROUGHPUT_HEADER
+        for key, report in throughput.items():
+            yield throughput_row(key, report)
+
+def count_export_rows(results, throughput=None):
+    """Number of rows iter_export_rows will yield (for progress bars)."""
+    return (2 + sum(3 + len(steps) for steps, _, _ in results.values()) + 4 + 2 * len(results) + 3 + len(results)
+            + (3 + len(throughput) if throughput else 0))
+
+def build_export_rows(operand_a, operand_b, mode, bits, results, throughput=None):
+    return list(iter_export_rows(operand_a, operand_b, mode, bits, results, throughput))
+
+def iter_export_records(operand_a, operand_b, mode, bits, results, throughput=None):
+    """Yield one JSON-ready dict per export record (for JSONL): meta, steps, products, costs."""
+    yield {"type": "meta", "a": operand_a, "b": operand_b, "mode": mode, "bits": bits,
+           "algorithms": list(results)}
+    for key, (steps, _, _) in results.items():
+        for s in steps:
+            yield {"type": "step", "algorithm": key, "step": s[0], "A": s[1], "Q": s[2], "operation": s[3]}
+    for key, (steps, product_bin, product_val) in results.items():
+        yield {"type": "product", "algorithm": key, "binary": product_bin, "decimal": product_val}
+        yield {"type": "cost", "algorithm": key, **get_algorithm(key).costs(steps)}
+    for key, report in (throughput or {}).items():
+        yield {"type": "throughput", **report}
+
+def count_export_records(results, throughput=None):
+    """Number of records iter_export_records will yield."""
+    return 1 + sum(len(steps) for steps, _, _ in results.values()) + 2 * len(results) + len(throughput or ())
+
+# ========== Batch analysis ==========
+ANALYSIS_HEADER = ["Algorithm", "Metric", "Pairs", "Mean", "Min", "P50", "P90", "Max"]
+
+def iter_analysis_rows(stats, source, mode):
+    """Rows for a wordmult.analysis.BatchStats: aggregates, histograms (value, pairs) and mismatches."""
+    from .analysis import METRIC_LABELS
+    yield ["Word Multiplier Batch Analysis"]
+    yield ["Source", source, f"Mode={mode}", f"Pairs={stats.pairs}", f"Rejected={stats.rejected_pairs}"]
+    yield []
+    yield ["Aggregates"]
+    yield ANALYSIS_HEADER
+    for key in stats.keys:
+        label = get_algorithm(key).label
+        for metric in stats.metrics(key):
+            h = stats.histograms[key][metric].summary()
+            yield [label, METRIC_LABELS[metric], h["count"], round(h["mean"], 4), h["min"], h["p50"], h["p90"], h["max"]]
+    yield []
+    yield ["Mismatches vs a*b"]
+    yield ["Algorithm", "Mismatches"]
+    for key in stats.keys:
+        yield [get_algorithm(key).label, stats.mismatches[key]]
+    yield ["Algorithm", "A", "B", "Got", "Expected"]
+    for e in stats.examples:
+        yield [get_algorithm(e["algorithm"]).label, e["a"], e["b"], e["got"], e["expected"]]
+    yield []
+    yield ["Histograms"]
+    yield ["Algorithm", "Metric", "Value", "Pairs"]
+    for key in stats.keys:
+        label = get_algorithm(key).label
+        for metric in stats.metrics(key):
+            bins = stats.histograms[key][metric].bins
+            for value in sorted(bins):
+                yield [label, METRIC_LABELS[metric], value, bins[value]]
+
+def count_analysis_rows(stats):
+    metrics = sum(len(stats.metrics(key)) for key in stats.keys)
+    bins = sum(len(h.bins) for hists in stats.histograms.values() for h in hists.values())
+    return 5 + metrics + 4 + len(stats.keys) + len(stats.examples) + 3 + bins
+
+def iter_analysis_records(stats, source, mode):
+    """One JSON-ready dict per record: meta, one aggregate per algorithm (with histograms), mismatches."""
+    yield {"type": "meta", "source": source, "mode": mode, "pairs": stats.pairs,
+           "rejected": stats.rejected_pairs, "algorithms": list(stats.keys)}
+    for key in stats.keys:
+        record = {"type": "aggregate", **stats.summary(key)}
+        record["histograms"] = {metric: {str(v): c for v, c in sorted(stats.histograms[key][metric].bins.items())}
+                                for metric in stats.metrics(key)}
+        yield record
+    for e in stats.examples:
+        yield {"type": "mismatch", **e}
+
+def count_analysis_records(stats):
+    return 1 + len(stats.keys) + len(stats.examples)
+
+def _watch(rows, progress=None, cancel=None, every=256):
+    """Pass rows through, reporting progress and honouring cancel every few rows."""
+    n = 0
+    for n, r in enumerate(rows, 1):
+        if n % every == 0:
+            if cancel is not None and cancel.is_set():
+                raise ExportCancelled()
+            if progress is not None:
+                progress(n)
+        yield r
+    if progress is not None:
+        progress(n)
+
+def write_csv_rows(path, rows, progress=None, cancel=None):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        for r in _watch(rows, progress, cancel):
+            writer.writerow(r)
+
+def write_txt_rows(path, rows, progress=None, cancel=None):
+    with open(path, "w") as f:
+        for r in _watch(rows, progress, cancel):
+            f.write("  ".join([str(x) for x in r]) + "\n")
+
+def write_jsonl_records(path, records, progress=None, cancel=None):
+    with open(path, "w") as f:
+        for rec in _watch(records, progress, cancel):
+            f.write(json.dumps(rec) + "\n")
+
+def write_xlsx_rows(path, rows, progress=None, cancel=None):
+    """Stream rows into a write-only openpyxl workbook (rows go to disk as they are appended)."""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Simulation")
+    for r in _watch(rows, progress, cancel):
+        ws.append(r)
+    wb.save(path)
+
+def write_pdf_rows(path, rows, progress=None, cancel=None):
+    """Write rows as monospaced text lines, one letter-size page per ~60 lines (needs reportlab)."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas as pdfcanvas
+    c = pdfcanvas.Canvas(path, pagesize=letter)
+    w, h = letter
+    y = h - 40
+    text_obj = c.beginText(30, y)
+    text_obj.setFont("Courier", 10)
+    for r in _watch(rows, progress, cancel):
+        line = "  ".join([str(x) for x in r])
+        text_obj.textLine(line)
+        y -= 12
+        if y < 40:
+            c.drawText(text_obj)
+            c.showPage()
+            text_obj = c.beginText(30, h - 40)
+            text_obj.setFont("Courier", 10)
+            y = h - 40
+    c.drawText(text_obj)
+    c.save()
+
+# format -> (writer, uses JSON records instead of rows)
+EXPORT_WRITERS = {
+    "csv": (write_csv_rows, False),
+    "txt": (write_txt_rows, False),
+    "pdf": (write_pdf_rows, False),
+    "jsonl": (write_jsonl_records, True),
+    "xlsx": (write_xlsx_rows, False),
+}
+
+class ExportJob:
+    """Runs one exporter on a background thread; the Tk side polls its fields with after()."""
+
+    def __init__(self, fmt, path, operand_a, operand_b, mode, bits, results, throughput=None):
+        counter = count_export_records if EXPORT_WRITERS[fmt][1] else count_export_rows
+        self._setup(fmt, path, counter(results, throughput))
+        # snapshot so a new run in the GUI cannot change what is being written
+        self._args = (operand_a, operand_b, mode, bits, dict(results), dict(throughput or {}))
+
+    def _setup(self, fmt, path, total):
+        self.fmt = fmt
+        self.path = path
+        self.total = total
+        self.done_rows = 0
+        self.error = None
+        self.cancelled = False
+        self.cancel_event = threading.Event()
+        self._thread = None
+        self._task = None
+
+    def _source(self, records):
+        return iter_export_records(*self._args) if records else iter_export_rows(*self._args)
+
+    def start(self, pool=None, priority=0):
+        """Write on a thread of its own, or as a task of a wordmult.workspace.WorkerPool."""
+        if pool is not None:
+            self._task = pool.submit(self._run, priority=priority)
+        else:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def finished(self):
+        if self._task is not None:
+            return self._task.done
+        return not self._thread.is_alive()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _progress(self, n):
+        self.done_rows = n
+
+    def _run(self):
+        writer, records = EXPORT_WRITERS[self.fmt]
+        source = self._source(records)
+        try:
+            start = time.perf_counter()
+            writer(self.path, source, progress=self._progress, cancel=self.cancel_event)
+            if PROFILER.enabled:
+                PROFILER.add("export:" + self.fmt, time.perf_counter() - start, self.done_rows)
+        except ExportCancelled:
+            self.cancelled = True
+            try:
+                os.remove(self.path)  # don't leave a truncated file behind
+            except OSError:
+                pass
+        except Exception as e:
+            self.error = e
+
+class AnalysisExportJob(ExportJob):
+    """ExportJob for batch-analysis aggregates (same writers, progress and cancel)."""
+
+    def __init__(self, fmt, path, stats, source, mode):
+        counter = count_analysis_records if EXPORT_WRITERS[fmt][1] else count_analysis_rows
+        # snapshot: the batch may still be merging chunks into stats
+        from .analysis import BatchStats
+        stats = BatchStats(stats.keys, stats.signed).merge(stats)
+        self._setup(fmt, path, counter(stats))
+        self._args = (stats, source, mode)
+
+    def _source(self, records):
+        return iter_analysis_records(*self._args) if records else iter_analysis_rows(*self._args)
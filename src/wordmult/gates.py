@@ -0,0 +1,362 @@
+# gates.py
+"""Gate-level accumulator adders with event-driven timing.
+
+The register-level engines in core.py do each "Add" / "A = A - M" step as
+one Python integer operation.  This module replays those steps through a
+gate netlist of the accumulator adder (ripple-carry, carry-lookahead or
+carry-select) so every step reports how long its carries took to settle.
+
+Simulation is event-driven: applying new operands schedules only the input
+nets that actually changed, and a gate is re-evaluated only when one of its
+inputs changes, so a step costs time proportional to the switching activity
+rather than to the netlist size.  Delays are in unit gate delays
+(GATE_DELAYS); a step's delay is the time of the last change on a sum or
+carry-out net, including glitches, and the adder's static critical path is
+the worst case over all inputs.
+
+    from wordmult import get_algorithm, int_to_twos_complement
+    from wordmult.gates import time_trace
+    algorithm = get_algorithm("booth")
+    A_bin, B_bin = int_to_twos_complement(1234, 16), int_to_twos_complement(-77, 16)
+    steps = algorithm.run(A_bin, B_bin, 16, signed=True)[0]
+    timing = time_trace(algorithm, A_bin, steps, adder="lookahead")
+    timing.delays      # per step, 0 for steps that only shift
+
+Adder inputs are only driven on steps that add or subtract (operand
+isolation), so shift-only steps leave the netlist untouched.
+"""
+import argparse
+import heapq
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+from .core import DEFAULT_ALGORITHMS, get_algorithm, int_to_twos_complement, min_bits_for_signed, \
+    min_bits_for_unsigned, twos_complement_to_int
+from .steptrace import DIGIT_OPS, OP_LABELS, Op
+
+AND, OR, XOR, MUX = range(4)  # MUX inputs: (select, when 0, when 1)
+GATE_DELAYS = {AND: 1, OR: 1, XOR: 2, MUX: 2}
+INTERACTIVE_BITS = 256  # widest word the GUI times; cost grows roughly with N**2
+
+# ========== Netlists ==========
+class Netlist:
+    """An N-bit adder: inputs a, b, cin; outputs sums, cout.  Nets 0 and 1 are the constants."""
+
+    def __init__(self, kind, width):
+        self.kind = kind
+        self.width = width
+        self.nets = 2
+        self.gates = []  # (kind, input nets, output net, delay), in topological order
+        self.a = [self.net() for _ in range(width)]
+        self.b = [self.net() for _ in range(width)]
+        self.cin = self.net()
+        self.sums = []
+        self.cout = None
+
+    def net(self):
+        self.nets += 1
+        return self.nets - 1
+
+    def gate(self, kind, *inputs):
+        out = self.net()
+        self.gates.append((kind, inputs, out, GATE_DELAYS[kind]))
+        return out
+
+    def finish(self, sums, cout):
+        """Fix the outputs and precompute fanout, the all-zero state and the static critical path."""
+        self.sums, self.cout = sums, cout
+        self.outputs = frozenset(sums) | {cout}
+        self.fanout = [[] for _ in range(self.nets)]
+        for g, (_, inputs, _, _) in enumerate(self.gates):
+            for net in set(inputs):
+                self.fanout[net].append(g)
+        self.initial = [0] * self.nets
+        self.initial[1] = 1
+        arrival = [0] * self.nets
+        for kind, inputs, out, delay in self.gates:
+            self.initial[out] = _evaluate(kind, inputs, self.initial)
+            arrival[out] = max(arrival[net] for net in inputs) + delay
+        self.critical_path = max(arrival[net] for net in self.outputs)
+        return self
+
+def _evaluate(kind, inputs, values):
+    if kind == XOR:
+        return values[inputs[0]] ^ values[inputs[1]]
+    if kind == AND:
+        for net in inputs:
+            if not values[net]:
+                return 0
+        return 1
+    if kind == OR:
+        for net in inputs:
+            if values[net]:
+                return 1
+        return 0
+    return values[inputs[2]] if values[inputs[0]] else values[inputs[1]]
+
+def _ripple(nl, a, b, carry):
+    sums = []
+    for x, y in zip(a, b):
+        p = nl.gate(XOR, x, y)
+        sums.append(nl.gate(XOR, p, carry))
+        carry = nl.gate(OR, nl.gate(AND, x, y), nl.gate(AND, p, carry))
+    return sums, carry
+
+def build_ripple(width):
+    nl = Netlist("ripple", width)
+    return nl.finish(*_ripple(nl, nl.a, nl.b, nl.cin))
+
+def build_lookahead(width, group=4):
+    """Hierarchical carry-lookahead: two-level lookahead units of `group` bits, nested as a tree."""
+    nl = Netlist("lookahead", width)
+    gp = [(nl.gate(AND, x, y), nl.gate(XOR, x, y)) for x, y in zip(nl.a, nl.b)]
+    c = _Lookahead(nl, group).carries(gp, nl.cin)
+    sums = [nl.gate(XOR, p, c[i]) for i, (_, p) in enumerate(gp)]
+    return nl.finish(sums, c[-1])
+
+class _Lookahead:
+    """Builds the lookahead tree of build_lookahead() over (generate, propagate) net pairs."""
+
+    def __init__(self, nl, group):
+        self.nl = nl
+        self.group = group
+        self.memo = {}  # run of (g, p) pairs -> its group (G, P)
+
+    def chunks(self, items):
+        size = self.group
+        while size * self.group < len(items):
+            size *= self.group
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def group_gp(self, items):
+        """(G, P) of a run of (g, p) pairs."""
+        items = tuple(items)
+        if len(items) == 1:
+            return items[0]
+        if items not in self.memo:
+            if len(items) > self.group:
+                self.memo[items] = self.group_gp([self.group_gp(c) for c in self.chunks(items)])
+            else:
+                nl = self.nl
+                g = [g for g, _ in items]
+                p = [p for _, p in items]
+                terms = [g[-1]] + [nl.gate(AND, *p[j + 1:], g[j]) for j in range(len(items) - 2, -1, -1)]
+                self.memo[items] = (nl.gate(OR, *terms), nl.gate(AND, *p))
+        return self.memo[items]
+
+    def carries(self, items, c0):
+        """Carry into every position of items, plus the carry out."""
+        if len(items) > self.group:
+            parts = self.chunks(items)
+            part_carries = self.carries([self.group_gp(c) for c in parts], c0)
+            out = []
+            for part, c in zip(parts, part_carries):
+                out.extend(self.carries(part, c)[:-1])
+            return out + [part_carries[-1]]
+        nl = self.nl
+        g = [g for g, _ in items]
+        p = [p for _, p in items]
+        out = [c0]
+        for i in range(1, len(items) + 1):
+            terms = [g[i - 1]] + [nl.gate(AND, *p[j + 1:i], g[j]) for j in range(i - 2, -1, -1)]
+            terms.append(nl.gate(AND, *p[:i], c0))
+            out.append(nl.gate(OR, *terms))
+        return out
+
+def build_select(width, block=4):
+    """Carry-select: the first block ripples, later blocks ripple both carry-ins and a mux picks one."""
+    nl = Netlist("select", width)
+    sums, carry = _ripple(nl, nl.a[:block], nl.b[:block], nl.cin)
+    for start in range(block, width, block):
+        a, b = nl.a[start:start + block], nl.b[start:start + block]
+        sums0, carry0 = _ripple(nl, a, b, 0)
+        sums1, carry1 = _ripple(nl, a, b, 1)
+        sums.extend(nl.gate(MUX, carry, s0, s1) for s0, s1 in zip(sums0, sums1))
+        carry = nl.gate(OR, carry0, nl.gate(AND, carry1, carry))
+    return nl.finish(sums, carry)
+
+# key -> (label, builder)
+ADDERS = {
+    "ripple": ("Ripple-carry", build_ripple),
+    "lookahead": ("Carry-lookahead", build_lookahead),
+    "select": ("Carry-select", build_select),
+}
+
+@lru_cache(maxsize=32)
+def build_adder(kind, width):
+    """Shared, read-only netlist for an adder kind and width."""
+    try:
+        builder = ADDERS[kind][1]
+    except KeyError:
+        raise ValueError(f"Unknown adder {kind!r}; choose from {', '.join(ADDERS)}") from None
+    return builder(width)
+
+# ========== Event-driven simulation ==========
+class AdderSimulator:
+    """Holds the settled net values of one adder between additions."""
+
+    def __init__(self, netlist):
+        self.netlist = netlist
+        self.values = list(netlist.initial)
+        self.evaluations = 0  # gate evaluations so far
+        self.changes = 0      # net transitions so far
+
+    def add(self, x, y, cin=0):
+        """Drive new operands, run events until quiet; return (sum, cout, delay)."""
+        nl = self.netlist
+        delay = self._settle(self._input_events(x, y, cin))
+        total = 0
+        for i, net in enumerate(nl.sums):
+            if self.values[net]:
+                total |= 1 << i
+        return total, self.values[nl.cout], delay
+
+    def _input_events(self, x, y, cin):
+        """(net, value) for every adder input that x, y and cin change."""
+        nl, values = self.netlist, self.values
+        events = []
+        for nets, word in ((nl.a, x), (nl.b, y)):
+            for i, net in enumerate(nets):
+                if (word >> i) & 1 != values[net]:
+                    events.append((net, values[net] ^ 1))
+        if cin != values[nl.cin]:
+            events.append((nl.cin, cin))
+        return events
+
+    def _settle(self, events):
+        """Apply events at time 0 and propagate them; return the time of the last output change."""
+        nl, values = self.netlist, self.values
+        projected = list(values)  # value each net is heading to once pending events land
+        pending = {0: events}
+        times = [0]
+        gates, fanout, outputs = nl.gates, nl.fanout, nl.outputs
+        delay = 0
+        while times:
+            t = heapq.heappop(times)
+            touched = set()
+            for net, value in pending.pop(t):
+                if values[net] != value:
+                    values[net] = value
+                    self.changes += 1
+                    touched.update(fanout[net])
+                    if net in outputs:
+                        delay = t
+            self.evaluations += len(touched)
+            for g in touched:
+                kind, inputs, out, gate_delay = gates[g]
+                value = _evaluate(kind, inputs, values)
+                if value != projected[out]:
+                    projected[out] = value
+                    when = t + gate_delay
+                    if when not in pending:
+                        pending[when] = []
+                        heapq.heappush(times, when)
+                    pending[when].append((out, value))
+        return delay
+
+# ========== Multiplier steps ==========
+# Op code -> multiple of M the step adds (0: shift only)
+OP_DIGITS = {op: digit for digit, op in DIGIT_OPS.items()}
+OP_DIGITS.update({Op.INIT: 0, Op.NO_ADD: 0, Op.ADD: 1})
+
+# per run: adder key, adder width, per-step delays (0 = shift only), net transitions, static critical path
+GateTiming = namedtuple("GateTiming", "adder width delays changes critical_path")
+
+def adder_width(algorithm, N):
+    """Accumulator adder width: N, or N + k for radix-2**k Booth (room for +-2M .. +-4M)."""
+    return N if algorithm.radix_bits == 1 else N + algorithm.radix_bits
+
+def adder_operations(algorithm, A_bin, steps):
+    """Yield (step, x, y, cin) for every step that uses the adder.
+
+    x is the accumulator before the step and y the (inverted, for subtraction)
+    multiple of M, both as adder-width patterns.
+    """
+    N = steps.bits
+    k = algorithm.radix_bits
+    mask = (1 << adder_width(algorithm, N)) - 1
+    M = int(A_bin, 2) if algorithm.key == "shift_add" else twos_complement_to_int(A_bin)
+    a_col, _, ops = steps.columns()
+    acc = pos = 0  # wide accumulator of the radix-2**k engines, replayed from the digits
+    for i in range(1, len(ops)):
+        digit = OP_DIGITS[ops[i]]
+        x = a_col[i - 1] if k == 1 else acc & mask
+        if digit > 0:
+            yield i, x, (digit * M) & mask, 0
+        elif digit < 0:
+            yield i, x, ~(-digit * M) & mask, 1
+        if k > 1:
+            acc += digit * M
+            shift = min(k, N - pos)
+            acc >>= shift
+            pos += shift
+
+def time_trace(algorithm, A_bin, steps, adder="ripple"):
+    """Replay a finished trace through a gate-level adder; return its GateTiming."""
+    netlist = build_adder(adder, adder_width(algorithm, steps.bits))
+    sim = AdderSimulator(netlist)
+    delays = [0] * len(steps)
+    for i, x, y, cin in adder_operations(algorithm, A_bin, steps):
+        delays[i] = sim.add(x, y, cin)[2]
+    return GateTiming(adder, netlist.width, delays, sim.changes, netlist.critical_path)
+
+def timing_costs(timing):
+    """Summary numbers of a GateTiming: total and worst step delay vs the static critical path."""
+    return {
+        "adder": timing.adder,
+        "total_delay": sum(timing.delays),
+        "max_step_delay": max(timing.delays, default=0),
+        "critical_path": timing.critical_path,
+        "net_changes": timing.changes,
+    }
+
+# ========== CLI ==========
+def build_parser():
+    p = argparse.ArgumentParser(description="Per-step carry-propagation delay of the accumulator adder.")
+    p.add_argument("a", type=int)
+    p.add_argument("b", type=int)
+    p.add_argument("--signed", action="store_true")
+    p.add_argument("--bits", type=int, default=None, help="word width (default: smallest that fits)")
+    p.add_argument("--adder", default="ripple", help=f"{', '.join(ADDERS)} or all")
+    p.add_argument("--algorithms", default=",".join(DEFAULT_ALGORITHMS), help="comma-separated algorithm keys")
+    p.add_argument("--steps", action="store_true", help="print every step, not just the totals")
+    return p
+
+def _check_args(parser, args):
+    """The algorithms, adder keys and word width the command line asks for (parser.error otherwise)."""
+    try:
+        algorithms = [get_algorithm(k.strip()) for k in args.algorithms.split(",")]
+        for algorithm in algorithms:
+            if not algorithm.serial:
+                raise ValueError(f"{algorithm.label} is not a bit-serial algorithm")
+        if args.adder != "all" and args.adder not in ADDERS:
+            raise ValueError(f"Unknown adder {args.adder!r}; choose from {', '.join(ADDERS)} or all")
+        need = min_bits_for_signed(args.a, args.b) if args.signed else min_bits_for_unsigned(args.a, args.b)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.signed and (args.a < 0 or args.b < 0):
+        parser.error("Unsigned mode doesn't accept negative")
+    adders = list(ADDERS) if args.adder == "all" else [args.adder]
+    return algorithms, adders, max(args.bits or need, need)
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    algorithms, adders, N = _check_args(parser, args)
+    A_bin, B_bin = int_to_twos_complement(args.a, N), int_to_twos_complement(args.b, N)
+    for algorithm in algorithms:
+        steps = algorithm.run(A_bin, B_bin, N, signed=args.signed)[0]
+        for adder in adders:
+            timing = time_trace(algorithm, A_bin, steps, adder)
+            costs = timing_costs(timing)
+            print(f"{algorithm.label} / {ADDERS[adder][0]} ({timing.width}-bit): total {costs['total_delay']}, "
+                  f"worst step {costs['max_step_delay']}, critical path {costs['critical_path']} gate delays, "
+                  f"{costs['net_changes']:,} net transitions")
+            if args.steps:
+                for i, delay in enumerate(timing.delays):
+                    print(f"  {i:4d}  {OP_LABELS[steps.op_codes()[i]]:22s} {delay:4d}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+# limbs.py
+"""Multi-word (limb) multiplication: schoolbook, Karatsuba and Toom-3.
+
+The bit-serial engines in core.py retire one to three multiplier bits per
+iteration, so an N-bit product takes on the order of N adder passes.  The
+engines here split both operands into limbs of limb_bits bits (machine words)
+and build the product from limb products, the way big-integer libraries do:
+
+    schoolbook  n*n limb products, each added into the accumulator at its limb offset
+    karatsuba   3 half-size products per level instead of 4
+    toom3       5 third-size products per level (evaluation at 0, 1, -1, -2, inf),
+                Karatsuba where a three-way split leaves no top part
+
+Every step is recorded in the usual StepTrace: A:Q holds the 2N-bit value
+the step produced (a sub-product, an evaluation sum, a recombination
+result), so the last step is the product and the GUI panes, summary and
+exporters work unchanged.  Signed operands are multiplied as magnitudes and
+the result negated, as big-integer libraries do.
+
+    from wordmult import get_algorithm
+    karatsuba = get_algorithm("karatsuba/16")      # 16-bit limbs; plain "karatsuba" uses DEFAULT_LIMB_BITS
+    steps, product_bin, product_val = karatsuba.run(A_bin, B_bin, 1024, signed=True)
+    karatsuba.costs(steps)["limb_products"]
+
+    python src/bench.py limbs --widths 1024,4096 --limb-bits 32   # op counts and wall time side by side
+"""
+from .core import VARIANT_FACTORIES, Algorithm, get_algorithm, register_algorithm, twos_complement_to_int
+from .steptrace import ADD_OPS, SUB_OPS, Op
+
+DEFAULT_LIMB_BITS = 32
+LIMB_SIZES = (4, 8, 16, 32, 64)  # offered by the GUI; any width in 2..64 works
+MAX_LIMBS = 256                  # schoolbook traces grow with limbs**2
+
+SHIFT_OPS = frozenset((Op.SHIFT_ADD, Op.DOUBLE, Op.HALVE))
+
+def limb_count(N, limb_bits):
+    return -(-N // limb_bits)
+
+# ========== Engines ==========
+class _Recorder:
+    """Collects (A, Q, op) steps; A:Q is the step's value modulo 2**(2N)."""
+
+    def __init__(self, N, limb_bits):
+        self.N = N
+        self.w = limb_bits
+        self.mask = (1 << N) - 1
+        self.wide = (1 << (2 * N)) - 1
+        self.steps = []
+
+    def emit(self, op, value):
+        value &= self.wide
+        self.steps.append(((value >> self.N) & self.mask, value & self.mask, op))
+        return value
+
+    def limbs(self, *values):
+        """Limbs needed for the widest of values (Toom-3 evaluations may carry into an extra limb)."""
+        return max(1, limb_count(max(abs(v) for v in values).bit_length(), self.w))
+
+    # ----- schoolbook -----
+    def schoolbook(self, x, y, n):
+        w, lm = self.w, (1 << self.w) - 1
+        if n == 1:
+            return self.product(x, y)
+        acc = 0
+        for i in range(n):
+            xi = (x >> (i * w)) & lm
+            for j in range(n):
+                p = self.product(xi, (y >> (j * w)) & lm)
+                acc += p << ((i + j) * w)
+                self.emit(Op.SHIFT_ADD if i + j else Op.LIMB_ADD, acc)
+        return acc
+
+    def product(self, x, y):
+        p = x * y
+        self.emit(Op.LIMB_MUL, p)
+        return p
+
+    # ----- Karatsuba -----
+    def karatsuba(self, x, y, n):
+        """Subtractive Karatsuba: the middle product (x0 - x1)(y1 - y0) never needs a carry limb."""
+        if n == 1:
+            return self.product(x, y)
+        m = n // 2
+        shift = m * self.w
+        x0, x1 = x & ((1 << shift) - 1), x >> shift
+        y0, y1 = y & ((1 << shift) - 1), y >> shift
+        dx = x0 - x1
+        self.emit(Op.LIMB_SUB, dx)
+        dy = y1 - y0
+        self.emit(Op.LIMB_SUB, dy)
+        z0 = self.karatsuba(x0, y0, m)
+        z2 = self.karatsuba(x1, y1, n - m)
+        zm = self.karatsuba(abs(dx), abs(dy), n - m)  # sign kept as a flag
+        mid = z0 + z2
+        self.emit(Op.LIMB_ADD, mid)
+        if (dx < 0) != (dy < 0):
+            mid -= zm
+            self.emit(Op.LIMB_SUB, mid)
+        else:
+            mid += zm
+            self.emit(Op.LIMB_ADD, mid)
+        result = z0 + (mid << shift)
+        self.emit(Op.SHIFT_ADD, result)
+        result += z2 << (2 * shift)
+        self.emit(Op.SHIFT_ADD, result)
+        return result
+
+    # ----- Toom-3 -----
+    def _evaluate(self, v0, v1, v2):
+        """Values at 1, -1 and -2 of v0 + v1*t + v2*t**2 (6 steps)."""
+        t = v0 + v2
+        self.emit(Op.LIMB_ADD, t)
+        p1 = t + v1
+        self.emit(Op.LIMB_ADD, p1)
+        pm1 = t - v1
+        self.emit(Op.LIMB_SUB, pm1)
+        pm2 = pm1 + v2
+        self.emit(Op.LIMB_ADD, pm2)
+        pm2 <<= 1
+        self.emit(Op.DOUBLE, pm2)
+        pm2 -= v0
+        self.emit(Op.LIMB_SUB, pm2)
+        return p1, pm1, pm2
+
+    def _signed_toom3(self, x, y):
+        """Multiply evaluations that may be negative: magnitudes, then negate (sign is a flag)."""
+        p = self.toom3(abs(x), abs(y), self.limbs(x, y))
+        if (x < 0) != (y < 0) and p:
+            p = -p
+            self.emit(Op.NEGATE, p)
+        return p
+
+    def toom3(self, x, y, n):
+        k = -(-n // 3)
+        if 2 * k >= n:  # no top part to split off (1, 2 and 4 limbs)
+            return self.karatsuba(x, y, n)
+        shift = k * self.w
+        low = (1 << shift) - 1
+        x0, x1, x2 = x & low, (x >> shift) & low, x >> (2 * shift)
+        y0, y1, y2 = y & low, (y >> shift) & low, y >> (2 * shift)
+        px1, pxm1, pxm2 = self._evaluate(x0, x1, x2)
+        py1, pym1, pym2 = self._evaluate(y0, y1, y2)
+        r0 = self.toom3(x0, y0, k)
+        r1 = self._signed_toom3(px1, py1)
+        rm1 = self._signed_toom3(pxm1, pym1)
+        rm2 = self._signed_toom3(pxm2, pym2)
+        rinf = self.toom3(x2, y2, n - 2 * k)
+        # Bodrato's interpolation sequence
+        r3 = rm2 - r1
+        self.emit(Op.LIMB_SUB, r3)
+        r3 //= 3
+        self.emit(Op.DIV3, r3)
+        r1 -= rm1
+        self.emit(Op.LIMB_SUB, r1)
+        r1 >>= 1
+        self.emit(Op.HALVE, r1)
+        r2 = rm1 - r0
+        self.emit(Op.LIMB_SUB, r2)
+        r3 = r2 - r3
+        self.emit(Op.LIMB_SUB, r3)
+        r3 >>= 1
+        self.emit(Op.HALVE, r3)
+        twice = rinf << 1
+        self.emit(Op.DOUBLE, twice)
+        r3 += twice
+        self.emit(Op.LIMB_ADD, r3)
+        r2 += r1
+        self.emit(Op.LIMB_ADD, r2)
+        r2 -= rinf
+        self.emit(Op.LIMB_SUB, r2)
+        r1 -= r3
+        self.emit(Op.LIMB_SUB, r1)
+        result = r0
+        for i, r in enumerate((r1, r2, r3, rinf), 1):
+            result += r << (i * shift)
+            self.emit(Op.SHIFT_ADD, result)
+        return result
+
+METHODS = {
+    # key: (label, short, engine method)
+    "schoolbook": ("Schoolbook", "School", _Recorder.schoolbook),
+    "karatsuba": ("Karatsuba", "Karatsuba", _Recorder.karatsuba),
+    "toom3": ("Toom-3", "Toom-3", _Recorder.toom3),
+}
+
+def iter_limb_steps(method, A_bin, B_bin, N, signed=False, limb_bits=DEFAULT_LIMB_BITS):
+    """Yield (step, A, Q, op) for a limb multiplication of two N-bit operands."""
+    n = limb_count(N, limb_bits)
+    if n > MAX_LIMBS:
+        raise ValueError(f"{N}-bit operands need {n} limbs of {limb_bits} bits; "
+                         f"use limbs of at least {limb_count(N, MAX_LIMBS)} bits")
+    x = twos_complement_to_int(A_bin) if signed else int(A_bin, 2)
+    y = twos_complement_to_int(B_bin) if signed else int(B_bin, 2)
+    rec = _Recorder(N, limb_bits)
+    rec.emit(Op.INIT, 0)
+    product = METHODS[method][2](rec, abs(x), abs(y), n)
+    if (x < 0) != (y < 0) and product:
+        rec.emit(Op.NEGATE, -product)
+    for i, (A, Q, op) in enumerate(rec.steps):
+        yield i, A, Q, op
+
+# ========== Registry ==========
+class LimbAlgorithm(Algorithm):
+    """A limb engine at one limb width, registered next to the bit-serial algorithms."""
+    serial = False
+
+    def __init__(self, method, limb_bits=DEFAULT_LIMB_BITS):
+        if not 2 <= limb_bits <= 64:
+            raise ValueError(f"limb width must be 2..64 bits, got {limb_bits}")
+        label, short, _ = METHODS[method]
+        key = method if limb_bits == DEFAULT_LIMB_BITS else f"{method}/{limb_bits}"
+        super().__init__(key, f"{label} ({limb_bits}-bit limbs)", f"{short}/{limb_bits}", None)
+        self.family = method
+        self.method = method
+        self.limb_bits = limb_bits
+
+    def steps(self, A_bin, B_bin, N, signed=False):
+        return iter_limb_steps(self.method, A_bin, B_bin, N, signed, self.limb_bits)
+
+    def costs(self, steps):
+        """Step count, word-level adds/subtracts, limb shifts and limb products of a finished trace."""
+        ops = steps.op_codes()
+        return {
+            "iterations": len(ops) - 1,
+            "additions": sum(1 for op in ops if op in ADD_OPS),
+            "subtractions": sum(1 for op in ops if op in SUB_OPS),
+            "shifts": sum(1 for op in ops if op in SHIFT_OPS),
+            "limb_products": ops.count(Op.LIMB_MUL),
+            "exact_divisions": ops.count(Op.DIV3),
+        }
+
+_VARIANTS = {}
+
+def limb_algorithm(method, limb_bits=DEFAULT_LIMB_BITS):
+    """The registered algorithm for method at the default width, else a (cached) variant."""
+    if limb_bits == DEFAULT_LIMB_BITS:
+        return get_algorithm(method)
+    key = (method, limb_bits)
+    if key not in _VARIANTS:
+        _VARIANTS[key] = LimbAlgorithm(method, limb_bits)
+    return _VARIANTS[key]
+
+def _variant_factory(method):
+    def factory(parameter):
+        try:
+            return limb_algorithm(method, int(parameter))
+        except ValueError:
+            raise ValueError(f"Unknown algorithm {method + '/' + parameter!r}: the suffix is the limb "
+                             f"width in bits (2..64)") from None
+    return factory
+
+def limb_labels():
+    """Export section label -> algorithm key for every method and limb width (for reading exports back)."""
+    return {f"{label} ({w}-bit limbs)": method if w == DEFAULT_LIMB_BITS else f"{method}/{w}"
+            for method, (label, _, _) in METHODS.items() for w in range(2, 65)}
+
+for _method in METHODS:
+    register_algorithm(LimbAlgorithm(_method))
+    VARIANT_FACTORIES[_method] = _variant_factory(_method)
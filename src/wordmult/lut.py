@@ -0,0 +1,225 @@
+# lut.py
+"""Precomputed, memory-mapped trace tables for small word widths.
+
+A table holds the complete trace (A and Q registers and op code of every
+step) of one algorithm for every N-bit x N-bit operand pattern, stored as
+fixed-size records indexed by (A << N) | B.  Traces depend only on the bit
+patterns -- signed and unsigned mode differ only in how the final A:Q is read
+-- so one table serves both modes.  Once installed, shift_and_add_steps,
+booth_steps and Algorithm.run answer table widths with one O(1) record read.
+
+    PYTHONPATH=src python -m wordmult.lut build --bits 8 -o ~/.cache/wordmult/lut
+    PYTHONPATH=src python -m wordmult.lut build --bits 12 -o ~/.cache/wordmult/lut   # ~1 GB per algorithm
+    export WORDMULT_LUT_DIR=~/.cache/wordmult/lut   # installed automatically on import
+
+Record layout (little-endian): A registers, Q registers ((steps) words of
+1 or 2 bytes each), then one op-code byte per step.
+"""
+import argparse
+import mmap
+import os
+import shutil
+import struct
+import sys
+from array import array
+
+from .core import ALGORITHMS, LOOKUP_TABLES, get_algorithm, product_from_registers
+from .steptrace import Op, StepTrace
+
+MAGIC = b"WMLUT001"
+HEADER = struct.Struct("<8sHHHH16sQ")  # magic, version, N, word bytes, steps, algorithm key, pair count
+HEADER_SIZE = 64
+VERSION = 1
+MAX_BITS = 16
+LITTLE = sys.byteorder == "little"
+
+def table_path(directory, key, N):
+    return os.path.join(directory, f"{key}-{N}.lut")
+
+def _word_bytes(N):
+    return 1 if N <= 8 else 2
+
+def _layout(key, N):
+    steps = len(get_algorithm(key).run("0" * N, "0" * N, N)[0])
+    word = _word_bytes(N)
+    return steps, word, steps * (2 * word + 1)
+
+def table_size(key, N):
+    """Bytes a table for algorithm key at width N takes on disk."""
+    return HEADER_SIZE + (1 << (2 * N)) * _layout(key, N)[2]
+
+# ========== Reading ==========
+class LookupTable:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.bits, self.word, self.steps, key, count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a lookup table (version {VERSION})")
+        self.key = key.rstrip(b"\0").decode()
+        self.record = self.steps * (2 * self.word + 1)
+        if count != 1 << (2 * self.bits) or len(self._mm) != HEADER_SIZE + count * self.record:
+            raise ValueError(f"{path} is truncated or was built with a different layout")
+        self._typecode = "B" if self.word == 1 else "H"
+
+    def _column(self, start):
+        col = array(self._typecode)
+        col.frombytes(self._mm[start:start + self.steps * self.word])
+        if not LITTLE and self.word > 1:
+            col.byteswap()
+        return array("Q", col)
+
+    def steps_for(self, A_bin, B_bin):
+        """StepTrace for one operand pair, read straight from its record."""
+        offset = HEADER_SIZE + ((int(A_bin, 2) << self.bits) | int(B_bin, 2)) * self.record
+        q_off = offset + self.steps * self.word
+        ops_off = q_off + self.steps * self.word
+        return StepTrace.from_columns(self.bits, self._column(offset), self._column(q_off),
+                                      array("B", self._mm[ops_off:ops_off + self.steps]))
+
+    def run(self, A_bin, B_bin, signed=False):
+        """Same result as Algorithm.run(A_bin, B_bin, N, signed), without simulating."""
+        steps = self.steps_for(A_bin, B_bin)
+        A, Q, _ = steps.registers(self.steps - 1)
+        return (steps, *product_from_registers(A, Q, self.bits, signed))
+
+    def close(self):
+        self._mm.close()
+
+def install_tables(directory=None):
+    """Open every table in directory (default: WORDMULT_LUT_DIR) and route lookups to it.
+
+    Returns the (algorithm key, N) pairs installed.
+    """
+    directory = os.path.expanduser(directory or os.environ.get("WORDMULT_LUT_DIR", ""))
+    installed = []
+    if not directory or not os.path.isdir(directory):
+        return installed
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".lut"):
+            continue
+        try:
+            table = LookupTable(os.path.join(directory, name))
+        except (OSError, ValueError) as e:
+            print(f"skipping lookup table {name}: {e}", file=sys.stderr)
+            continue
+        if table.key in ALGORITHMS:
+            LOOKUP_TABLES[(table.key, table.bits)] = table
+            installed.append((table.key, table.bits))
+    return installed
+
+def uninstall_tables():
+    for table in LOOKUP_TABLES.values():
+        table.close()
+    LOOKUP_TABLES.clear()
+
+# ========== Building ==========
+def _records_numpy(key, N, chunk_rows=None):
+    """Record bytes for every pair, in index order, from the vectorized kernels."""
+    import numpy as np
+    from .vectorized import booth_batch, iter_sweep, shift_and_add_batch
+    kernel = shift_and_add_batch if key == "shift_add" else booth_batch
+    # kernel op values -> Op codes (Shift-and-Add: 0/1, Booth: -1/0/1, offset by one)
+    codes = (np.array([0, Op.NO_ADD, Op.ADD], dtype=np.uint8) if key == "shift_add"
+             else np.array([Op.SUB_M, Op.NO_OP, Op.ADD_M], dtype=np.uint8))
+    dtype = np.dtype("<u1" if N <= 8 else "<u2")
+    for A_vals, B_vals in iter_sweep(N, chunk_rows):
+        trace = kernel(A_vals, B_vals, N)
+        ops = np.empty((len(A_vals), N + 1), dtype=np.uint8)
+        ops[:, 0] = Op.INIT
+        ops[:, 1:] = codes[trace.ops.T + 1]
+        yield np.concatenate([
+            np.ascontiguousarray(trace.A.T, dtype=dtype).view(np.uint8),
+            np.ascontiguousarray(trace.Q.T, dtype=dtype).view(np.uint8),
+            ops,
+        ], axis=1).tobytes()
+
+def _records_scalar(key, N):
+    algorithm = get_algorithm(key)
+    word = _word_bytes(N)
+    for a in range(1 << N):
+        A_bin = format(a, f"0{N}b")
+        chunk = []
+        for b in range(1 << N):
+            steps = algorithm.run(A_bin, format(b, f"0{N}b"), N)[0]
+            a_col, q_col, ops = steps.columns()
+            chunk.append(b"".join(v.to_bytes(word, "little") for v in a_col))
+            chunk.append(b"".join(v.to_bytes(word, "little") for v in q_col))
+            chunk.append(bytes(ops))
+        yield b"".join(chunk)
+
+def build_table(directory, key, N, progress=None):
+    """Write the table for algorithm key at width N (atomically) and return its path."""
+    if not 1 <= N <= MAX_BITS:
+        raise ValueError(f"lookup tables support 1..{MAX_BITS} bits, got {N}")
+    algorithm = get_algorithm(key)
+    if not algorithm.serial:
+        raise ValueError(f"lookup tables hold bit-serial traces; {algorithm.label} is not one")
+    key = algorithm.key
+    steps, word, record = _layout(key, N)
+    count = 1 << (2 * N)
+    path = table_path(directory, key, N)
+    tmp = path + ".tmp"
+    from .vectorized import NUMPY_AVAILABLE
+    records = _records_numpy(key, N) if NUMPY_AVAILABLE and key in ("shift_add", "booth") else _records_scalar(key, N)
+    try:
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, N, word, steps, key.encode(), count).ljust(HEADER_SIZE, b"\0"))
+            written = 0
+            for chunk in records:
+                f.write(chunk)
+                written += len(chunk) // record
+                if progress is not None:
+                    progress(written, count)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+# ========== CLI ==========
+def build_parser():
+    p = argparse.ArgumentParser(description="Build precomputed trace lookup tables.")
+    sub = p.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="precompute every operand pair for one or more widths")
+    b.add_argument("--bits", default="8", help="comma-separated widths, up to 16 (default: 8)")
+    b.add_argument("--algorithms", default="shift_add,booth", help="comma-separated algorithm keys")
+    b.add_argument("-o", "--output", required=True, help="table directory")
+    b.add_argument("--force", action="store_true", help="build even if the disk looks too small")
+    i = sub.add_parser("info", help="list the tables in a directory")
+    i.add_argument("directory")
+    return p
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "info":
+        for key, N in install_tables(args.directory):
+            table = LOOKUP_TABLES[(key, N)]
+            print(f"{key:10s} {N:3d}-bit  {table.steps} steps/pair  {os.path.getsize(table.path):,} bytes")
+        return 0
+    try:
+        widths = [int(w) for w in args.bits.split(",")]
+        keys = [get_algorithm(k.strip()).key for k in args.algorithms.split(",")]
+        for key in keys:
+            if not get_algorithm(key).serial:
+                raise ValueError(f"lookup tables hold bit-serial traces; {get_algorithm(key).label} is not one")
+    except ValueError as e:
+        parser.error(str(e))
+    out = os.path.expanduser(args.output)
+    os.makedirs(out, exist_ok=True)
+    need = sum(table_size(key, N) for key in keys for N in widths)
+    free = shutil.disk_usage(out).free
+    if need > free and not args.force:
+        parser.error(f"tables need {need:,} bytes but only {free:,} are free (use --force to try anyway)")
+    for N in widths:
+        for key in keys:
+            def progress(done, total, key=key, N=N):
+                print(f"\r{key} {N}-bit: {done / total:6.1%}", end="", file=sys.stderr)
+            path = build_table(out, key, N, progress)
+            print(f"\r{key} {N}-bit: {os.path.getsize(path):,} bytes -> {path}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+# profiling.py
+"""Opt-in per-phase timing for the compute, render and export paths.
+
+Code marks a phase with ``with PROFILER.phase("name"):``.  While the
+profiler is disabled (the default) phase() hands back a shared no-op context
+manager, so an instrumented call costs one attribute check and nothing is
+recorded.  Enable it from the GUI's stats panel or with WORDMULT_PROFILE=1.
+
+    PROFILER.enabled = True
+    ...
+    PROFILER.snapshot()        # {"phases": {"frame": {"calls": ..., "total": ...}, ...}}
+    PROFILER.dump("stats.json")
+
+start_capture() / stop_capture() wrap a cProfile session around one run.
+
+Work that runs in worker processes records into the worker's own PROFILER,
+which the GUI never sees; call it through PROFILER.call() instead, which
+turns recording (and cProfile) on in the worker for just that call and
+returns what was recorded, for the parent to fold in with merge() and
+add_capture():
+
+    result, phases, stats = PROFILER.call(fn, args, phases=True, capture=True)   # in the worker
+    PROFILER.merge(phases); PROFILER.add_capture(stats)                           # in the GUI process
+"""
+import os
+import time
+from _thread import allocate_lock  # threading.Lock without importing threading
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_PHASE = _NoPhase()
+
+class _Phase:
+    __slots__ = ("profiler", "name", "items", "start")
+
+    def __init__(self, profiler, name, items):
+        self.profiler = profiler
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start, self.items)
+        return False
+
+class Profiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._phases = {}  # name -> [calls, total, max, items]
+        self._lock = allocate_lock()  # exporters record from their worker thread
+        self._capture = None
+        self._captured = []  # cProfile stats dicts from worker processes, added to the capture
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=os.environ.get("WORDMULT_PROFILE", "") not in ("", "0"))
+
+    def phase(self, name, items=0):
+        """Context manager timing one occurrence of a phase (no-op while disabled)."""
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name, items)
+
+    def add(self, name, seconds, items=0):
+        """Record one occurrence of a phase that was timed elsewhere."""
+        with self._lock:
+            entry = self._phases.get(name)
+            if entry is None:
+                self._phases[name] = [1, seconds, seconds, items]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+                entry[3] += items
+
+    def merge(self, phases):
+        """Fold in a phase table recorded elsewhere (the phases returned by call())."""
+        with self._lock:
+            for name, (calls, total, peak, items) in phases.items():
+                entry = self._phases.get(name)
+                if entry is None:
+                    self._phases[name] = [calls, total, peak, items]
+                else:
+                    entry[0] += calls
+                    entry[1] += total
+                    entry[2] = max(entry[2], peak)
+                    entry[3] += items
+
+    def call(self, fn, args, phases=False, capture=False):
+        """Run fn(*args) and return (result, phases, stats) for the caller's process to merge.
+
+        In a worker process, phases=True records the call's phases into a
+        fresh table and capture=True runs it under cProfile; both come back
+        as plain data (None when not asked for).  In the process that owns
+        the profiler the call is made directly: its phases are already
+        recorded here, and only the cProfile stats of this thread come back.
+        """
+        if not phases and not capture:
+            return fn(*args), None, None
+        from multiprocessing import parent_process
+        worker = parent_process() is not None
+        saved = self.enabled, self._phases
+        if worker and phases:
+            self.enabled, self._phases = True, {}
+        profile = None
+        if capture:
+            import cProfile
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # another profiler is active (Python 3.12+ allows one per process)
+                profile = None
+        try:
+            result = fn(*args)
+        finally:
+            if profile is not None:
+                profile.disable()
+            recorded = None
+            if worker and phases:
+                recorded = {name: tuple(entry) for name, entry in self._phases.items()}
+                self.enabled, self._phases = saved
+        stats = None
+        if profile is not None:
+            profile.create_stats()
+            stats = profile.stats
+        return result, recorded, stats
+
+    def reset(self):
+        with self._lock:
+            self._phases.clear()
+
+    def snapshot(self):
+        """Return {"enabled", "phases": {name: {calls, total, mean, max, items}}}; times in seconds."""
+        with self._lock:
+            phases = {name: {"calls": calls, "total": total, "mean": total / calls, "max": peak, "items": items}
+                      for name, (calls, total, peak, items) in sorted(self._phases.items())}
+        return {"enabled": self.enabled, "phases": phases}
+
+    def dump(self, path):
+        import json
+        data = self.snapshot()
+        data["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    # ---------- cProfile capture ----------
+    @property
+    def capturing(self):
+        return self._capture is not None
+
+    def start_capture(self):
+        """Start a cProfile session on the calling thread (one at a time)."""
+        if self._capture is not None:
+            return
+        import cProfile
+        self._captured = []
+        self._capture = cProfile.Profile()
+        self._capture.enable()
+
+    def add_capture(self, stats):
+        """Add cProfile stats returned by call() to the running capture (ignored when none is running)."""
+        if stats and self._capture is not None:
+            self._captured.append(stats)
+
+    def stop_capture(self, path=None):
+        """Stop the session; write it to path (pstats format) if given and return the pstats.Stats.
+
+        Stats collected in worker processes during the session are included.
+        """
+        if self._capture is None:
+            return None
+        import pstats
+        profile, self._capture = self._capture, None
+        profile.disable()
+        stats = pstats.Stats(profile)
+        for extra in self._captured:
+            stats.add(pstats.Stats(_CapturedStats(extra)))
+        self._captured = []
+        if path:
+            stats.dump_stats(path)
+        return stats
+
+class _CapturedStats:
+    """What pstats.Stats needs to load a stats dict that came back from a worker."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+PROFILER = Profiler.from_env()
@@ -0,0 +1,161 @@
+# steptrace.py
+"""Compact, integer-backed step traces.
+
+A StepTrace keeps the A and Q registers of every step as plain integers in
+array storage and the operation as a one-byte Op code.  Binary strings are
+only produced when a row is read, so the GUI log, canvas and exporters pay for
+formatting exactly once per row they show, and batch runs never pay at all.
+
+Indexing a trace still yields the classic (step, A_bin, Q_bin, operation)
+tuples, so existing code that does ``for s in steps`` or ``steps[:1]`` keeps
+working unchanged.
+"""
+from array import array
+
+class Op:
+    """Operation codes stored per step (plain ints; enum costs several ms at import)."""
+    INIT = 0
+    NO_ADD = 1
+    ADD = 2
+    NO_OP = 3
+    SUB_M = 4
+    ADD_M = 5
+    SUB_2M = 6
+    ADD_2M = 7
+    SUB_3M = 8
+    ADD_3M = 9
+    SUB_4M = 10
+    ADD_4M = 11
+    # limb engines (wordmult.limbs): A:Q holds the value the step produced
+    LIMB_MUL = 12
+    LIMB_ADD = 13
+    LIMB_SUB = 14
+    SHIFT_ADD = 15
+    DOUBLE = 16
+    HALVE = 17
+    DIV3 = 18
+    NEGATE = 19
+
+# indexed by Op code
+OP_LABELS = (
+    "Initialize",
+    "No Add, Shift",
+    "Add, Shift",
+    "No operation, Shift",
+    "A = A - M, Shift",
+    "A = A + M, Shift",
+    "A = A - 2M, Shift",
+    "A = A + 2M, Shift",
+    "A = A - 3M, Shift",
+    "A = A + 3M, Shift",
+    "A = A - 4M, Shift",
+    "A = A + 4M, Shift",
+    "Limb product",
+    "Add",
+    "Subtract",
+    "Shift by limbs, Add",
+    "Shift left 1",
+    "Shift right 1",
+    "Exact divide by 3",
+    "Negate",
+)
+
+# Booth recoding digit -> Op (radix-2 uses -1..1, radix-4 -2..2, radix-8 -4..4)
+DIGIT_OPS = {
+    0: Op.NO_OP,
+    1: Op.ADD_M, -1: Op.SUB_M,
+    2: Op.ADD_2M, -2: Op.SUB_2M,
+    3: Op.ADD_3M, -3: Op.SUB_3M,
+    4: Op.ADD_4M, -4: Op.SUB_4M,
+}
+
+# ops that cost an adder pass, for cost metrics
+ADD_OPS = frozenset((Op.ADD, Op.ADD_M, Op.ADD_2M, Op.ADD_3M, Op.ADD_4M, Op.LIMB_ADD, Op.SHIFT_ADD))
+SUB_OPS = frozenset((Op.SUB_M, Op.SUB_2M, Op.SUB_3M, Op.SUB_4M, Op.LIMB_SUB, Op.NEGATE))
+
+WORD_BITS = 64  # widest register that fits an array('Q') slot
+
+class StepTrace:
+    """Step-by-step register history of one multiplication."""
+    __slots__ = ("bits", "_a", "_q", "_ops")
+
+    def __init__(self, bits):
+        self.bits = bits
+        # unsigned 64-bit slots when they fit; Python ints for wider words
+        if bits <= WORD_BITS:
+            self._a = array("Q")
+            self._q = array("Q")
+        else:
+            self._a = []
+            self._q = []
+        self._ops = array("B")
+
+    @classmethod
+    def from_columns(cls, bits, a, q, ops):
+        """Build a trace around existing A/Q/op columns (e.g. arrays read from an archive)."""
+        trace = cls.__new__(cls)
+        trace.bits = bits
+        trace._a, trace._q, trace._ops = a, q, ops
+        return trace
+
+    def append(self, a, q, op):
+        """Record one step; a and q are N-bit unsigned register values."""
+        self._a.append(a)
+        self._q.append(q)
+        self._ops.append(op)
+
+    # ----- raw access -----
+    def registers(self, i):
+        """Return (A, Q, op_code) integers of step i."""
+        return self._a[i], self._q[i], self._ops[i]
+
+    def a_bin(self, i):
+        return format(self._a[i], f"0{self.bits}b")
+
+    def q_bin(self, i):
+        return format(self._q[i], f"0{self.bits}b")
+
+    def op_label(self, i):
+        return OP_LABELS[self._ops[i]]
+
+    def op_codes(self):
+        return self._ops
+
+    def columns(self):
+        """Return the raw (A, Q, ops) columns."""
+        return self._a, self._q, self._ops
+
+    # ----- tuple compatibility view -----
+    def row(self, i):
+        """Format step i as (step, A_bin, Q_bin, operation)."""
+        if i < 0:
+            i += len(self._ops)
+        return (i, self.a_bin(i), self.q_bin(i), OP_LABELS[self._ops[i]])
+
+    def __len__(self):
+        return len(self._ops)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.row(k) for k in range(*i.indices(len(self)))]
+        if not -len(self) <= i < len(self):
+            raise IndexError("step index out of range")
+        return self.row(i)
+
+    def __iter__(self):
+        for i in range(len(self._ops)):
+            yield self.row(i)
+
+    def __eq__(self, other):
+        if isinstance(other, StepTrace):
+            return (self.bits == other.bits and list(self._a) == list(other._a)
+                    and list(self._q) == list(other._q) and self._ops == other._ops)
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<StepTrace {self.bits}-bit, {len(self)} steps>"
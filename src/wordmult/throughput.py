@@ -0,0 +1,302 @@
+# throughput.py
+"""Cycle-accurate throughput model for streams of multiplications.
+
+shift_and_add_steps and friends describe one multiplication; this module
+asks how fast a unit built from the same algorithm gets through a stream of
+them.  A Microarchitecture splits the algorithm's iterations over `depth`
+pipeline stages, does `unroll` iterations per clock cycle inside a stage and
+replicates the whole unit `units` times:
+
+    Microarchitecture()                          # iterative: one iteration per cycle
+    Microarchitecture(early_termination=True)    # stop once the remaining multiplier bits are all alike
+    Microarchitecture(depth=4, unroll=None)      # unrolled, 4-stage pipeline, one stage per cycle
+    Microarchitecture(depth=None, units=2)       # one stage per iteration, two units
+
+Operations issue in order to the first unit whose first stage is free and
+move to the next stage only when it is free (a full stage stalls the one
+before it).  With early termination an operation leaves the pipeline after
+its last add/subtract step plus one cycle for the final alignment shift --
+for Booth this is exactly "the rest of the multiplier is a run of identical
+bits".
+
+    report = throughput_report(Microarchitecture(depth=4), get_algorithm("booth"), traces)
+    report["throughput"], report["latency"]["p99"], report["utilization"]
+
+Counts are in cycles; with an adder model (wordmult.gates) the clock period
+is estimated in gate delays as well.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+
+from .core import DEFAULT_ALGORITHMS, get_algorithm, int_to_twos_complement, min_bits_for_signed, \
+    min_bits_for_unsigned
+from .gates import ADDERS, adder_width, build_adder
+from .steptrace import ADD_OPS, SUB_OPS
+
+SHIFT_DELAY = 2     # operand select and shift per iteration, in gate delays
+STAGE_OVERHEAD = 2  # pipeline register setup and clock-to-output per cycle
+ADDER_OPS = ADD_OPS | SUB_OPS
+
+def _ceil_div(a, b):
+    return -(-a // b)
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list (q in 0..100): the ceil(q/100 * n)-th value."""
+    if not sorted_values:
+        return 0
+    n = len(sorted_values)
+    k = max(0, min(n - 1, math.ceil(q * n / 100) - 1))  # q * n first: 0.9 * 10 is not exactly 9
+    return sorted_values[k]
+
+# ========== Microarchitecture ==========
+class Microarchitecture:
+    """Pipeline depth, iterations per cycle and unit count of a multiplier built from one algorithm."""
+
+    def __init__(self, depth=1, units=1, unroll=1, early_termination=False, adder=None):
+        if depth is not None and depth < 1 or units < 1 or unroll is not None and unroll < 1:
+            raise ValueError("depth, units and unroll must be at least 1")
+        if adder is not None and adder not in ADDERS:
+            raise ValueError(f"Unknown adder {adder!r}; choose from {', '.join(ADDERS)}")
+        self.depth = depth                  # pipeline stages; None = one per iteration
+        self.units = units                  # identical units fed from one in-order queue
+        self.unroll = unroll                # iterations per cycle in a stage; None = a whole stage
+        self.early_termination = early_termination
+        self.adder = adder                  # adder model for the clock period estimate, or None
+
+    def describe(self):
+        depth = "one stage per iteration" if self.depth is None else \
+            "iterative" if self.depth == 1 else f"{self.depth}-stage pipeline"
+        parts = [depth]
+        if self.unroll is None:
+            parts.append("one cycle per stage")
+        elif self.unroll > 1:
+            parts.append(f"{self.unroll} iterations/cycle")
+        if self.units > 1:
+            parts.append(f"{self.units} units")
+        if self.early_termination:
+            parts.append("early termination")
+        if self.adder:
+            parts.append(ADDERS[self.adder][0].lower() + " adder")
+        return ", ".join(parts)
+
+    def as_dict(self):
+        return {"depth": self.depth, "units": self.units, "unroll": self.unroll,
+                "early_termination": self.early_termination, "adder": self.adder}
+
+    def stages(self, algorithm, iterations):
+        """Pipeline stages a unit has, counting a separate setup stage (e.g. 3M) when pipelined."""
+        stages = self._shape(iterations)[0]
+        return stages + 1 if stages > 1 and algorithm.setup_additions else stages
+
+    def _shape(self, iterations):
+        """(stages, iterations per stage, iterations per cycle) for a word needing `iterations`."""
+        stages = iterations if self.depth is None else min(self.depth, iterations)
+        stages = max(1, stages)
+        per_stage = max(1, _ceil_div(iterations, stages))
+        return stages, per_stage, per_stage if self.unroll is None else min(self.unroll, per_stage)
+
+    def stage_cycles(self, algorithm, steps):
+        """Cycles one operation spends in each stage it passes through."""
+        ops = steps.op_codes()
+        n = len(ops) - 1
+        stages, per_stage, unroll = self._shape(n)
+        last = n
+        if self.early_termination:
+            last = next((i for i in range(n, 0, -1) if ops[i] in ADDER_OPS), 0)
+        exit_stage = stages - 1 if last == n else max(0, last - 1) // per_stage
+        cycles = []
+        for j in range(exit_stage + 1):
+            lo = j * per_stage
+            work = max(0, min(lo + per_stage, last) - lo)
+            if j == exit_stage and last < n:
+                work += 1  # final alignment shift, done like one more iteration
+            cycles.append(_ceil_div(work, unroll))
+        if algorithm.setup_additions:  # e.g. precomputing 3M: its own stage when pipelined
+            if stages > 1:
+                cycles.insert(0, algorithm.setup_additions)
+            else:
+                cycles[0] += algorithm.setup_additions
+        return cycles
+
+    def latency(self, algorithm, steps):
+        """Cycles one operation takes through an idle unit."""
+        return sum(self.stage_cycles(algorithm, steps))
+
+    def clock_period(self, algorithm, N):
+        """Estimated clock period in gate delays (None without an adder model)."""
+        if self.adder is None:
+            return None
+        iterations = _ceil_div(N, algorithm.radix_bits)
+        critical = build_adder(self.adder, adder_width(algorithm, N)).critical_path
+        return self._shape(iterations)[2] * (critical + SHIFT_DELAY) + STAGE_OVERHEAD
+
+# ========== Simulation ==========
+def simulate_stream(arch, algorithm, traces, arrival_interval=0):
+    """Issue one operation per trace, in order.
+
+    Returns (latencies, service times, total cycles, busy stage-cycles per
+    unit); latency counts from arrival, service time from entering the unit.
+
+    Operation k arrives at cycle k * arrival_interval (0: the whole stream is
+    waiting at cycle 0, i.e. a saturated unit).
+    """
+    free = []  # per unit: cycle at which each stage can accept the next operation
+    busy = [0] * arch.units
+    latencies = []
+    services = []
+    total = 0
+    for k, steps in enumerate(traces):
+        occupancy = arch.stage_cycles(algorithm, steps)
+        if not free:
+            stages = arch.stages(algorithm, len(steps) - 1)
+            free = [[0] * stages for _ in range(arch.units)]
+        arrival = k * arrival_interval
+        u = min(range(arch.units), key=lambda i: free[i][0])
+        stage_free = free[u]
+        t = start = max(arrival, stage_free[0])
+        for j, c in enumerate(occupancy):
+            if j:
+                t = max(t, stage_free[j])  # wait for the next stage ...
+                stage_free[j - 1] = t      # ... holding the previous one meanwhile
+            t += c
+        stage_free[len(occupancy) - 1] = t
+        busy[u] += sum(occupancy)
+        latencies.append(t - arrival)
+        services.append(t - start)
+        total = max(total, t)
+    return latencies, services, total, busy
+
+def throughput_report(arch, algorithm, traces, arrival_interval=0):
+    """Simulate a stream and summarise cycles, throughput, latency distribution and utilization."""
+    traces = list(traces)
+    latencies, services, cycles, busy = simulate_stream(arch, algorithm, traces, arrival_interval)
+    ordered = sorted(latencies)
+    stages = arch.stages(algorithm, len(traces[0]) - 1) if traces else 1
+    capacity = cycles * stages
+    histogram = {}
+    for lat in ordered:
+        histogram[lat] = histogram.get(lat, 0) + 1
+    period = arch.clock_period(algorithm, traces[0].bits) if traces else None
+    return {
+        "algorithm": algorithm.key,
+        "architecture": arch.describe(),
+        "stages": stages,
+        "operations": len(latencies),
+        "cycles": cycles,
+        "throughput": len(latencies) / cycles if cycles else 0.0,
+        "latency": {
+            "min": ordered[0] if ordered else 0,
+            "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+            "p50": percentile(ordered, 50),
+            "p90": percentile(ordered, 90),
+            "p99": percentile(ordered, 99),
+            "max": ordered[-1] if ordered else 0,
+        },
+        "latency_histogram": histogram,
+        "service": {
+            "min": min(services, default=0),
+            "mean": sum(services) / len(services) if services else 0.0,
+            "max": max(services, default=0),
+        },
+        "utilization": sum(busy) / (capacity * arch.units) if capacity else 0.0,
+        "unit_utilization": [b / capacity if capacity else 0.0 for b in busy],
+        "clock_period": period,
+        "time": cycles * period if period is not None else None,
+    }
+
+# ========== Operand streams ==========
+def iter_random_pairs(count, N, signed=False, seed=0):
+    """Yield reproducible random operands that fit N bits (symmetric range when signed)."""
+    rng = random.Random(seed)
+    lo, hi = (1 - (1 << (N - 1)), (1 << (N - 1)) - 1) if signed else (0, (1 << N) - 1)
+    for _ in range(count):
+        yield rng.randint(lo, hi), rng.randint(lo, hi)
+
+def random_pairs(count, N, signed=False, seed=0):
+    """The pairs of iter_random_pairs() as a list."""
+    return list(iter_random_pairs(count, N, signed, seed))
+
+def stream_traces(algorithm, pairs, N, signed=False, cache=None):
+    """Yield the StepTrace of every pair at width N (through a TraceCache when given)."""
+    run = cache.run if cache is not None else None
+    for a, b in pairs:
+        A_bin, B_bin = int_to_twos_complement(a, N), int_to_twos_complement(b, N)
+        if run is not None:
+            yield run(algorithm, A_bin, B_bin, N, signed=signed)[0]
+        else:
+            yield algorithm.run(A_bin, B_bin, N, signed=signed)[0]
+
+def read_pairs(lines):
+    """Operand pairs from lines of "a b" or "a,b" (blank lines and # comments skipped)."""
+    for line in lines:
+        line = line.split("#", 1)[0].replace(",", " ").split()
+        if line:
+            yield int(line[0]), int(line[1])
+
+# ========== CLI ==========
+def build_parser():
+    p = argparse.ArgumentParser(description="Estimate sustained throughput of a multiplier unit on an operand stream.")
+    p.add_argument("pairs", nargs="?", default=None, help="file of 'a b' lines (default: --random pairs)")
+    p.add_argument("--random", type=int, default=1000, help="random operand pairs when no file is given")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--bits", type=int, default=None, help="word width (default: smallest that fits the stream)")
+    p.add_argument("--signed", action="store_true")
+    p.add_argument("--algorithms", default=",".join(DEFAULT_ALGORITHMS), help="comma-separated algorithm keys")
+    p.add_argument("--depth", default="1", help="pipeline stages, or 'all' for one per iteration (default: 1)")
+    p.add_argument("--unroll", default="1", help="iterations per cycle, or 'all' for a whole stage (default: 1)")
+    p.add_argument("--units", type=int, default=1, help="parallel units")
+    p.add_argument("--early", action="store_true", help="early termination on trailing runs of identical bits")
+    p.add_argument("--adder", default=None, help=f"estimate the clock period with a {'/'.join(ADDERS)} adder")
+    p.add_argument("--interval", type=int, default=0, help="cycles between arrivals (default: 0, saturated)")
+    p.add_argument("--json", action="store_true", help="print the reports as JSON")
+    return p
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.bits is not None and args.bits < 1:
+        parser.error(f"--bits must be at least 1, got {args.bits}")
+    try:
+        arch = Microarchitecture(depth=None if args.depth == "all" else int(args.depth), units=args.units,
+                                 unroll=None if args.unroll == "all" else int(args.unroll),
+                                 early_termination=args.early, adder=args.adder)
+        algorithms = [get_algorithm(k.strip()) for k in args.algorithms.split(",")]
+        for algorithm in algorithms:
+            if not algorithm.serial:
+                raise ValueError(f"{algorithm.label} is not a bit-serial algorithm")
+        if args.pairs is None:
+            N = args.bits or 16
+            pairs = random_pairs(args.random, N, args.signed, args.seed)
+        else:
+            with open(args.pairs) as f:
+                pairs = list(read_pairs(f))
+            need = max((min_bits_for_signed(a, b) if args.signed else min_bits_for_unsigned(a, b))
+                       for a, b in pairs)
+            N = max(args.bits or need, need)
+        if not args.signed and any(a < 0 or b < 0 for a, b in pairs):
+            raise ValueError("Unsigned mode doesn't accept negative")
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    reports = [throughput_report(arch, algorithm, stream_traces(algorithm, pairs, N, args.signed),
+                                 args.interval) for algorithm in algorithms]
+    if args.json:
+        json.dump({"bits": N, "signed": args.signed, "microarchitecture": arch.as_dict(), "reports": reports},
+                  sys.stdout, indent=2)
+        print()
+        return 0
+    print(f"{len(pairs):,} operations, {N}-bit {'signed' if args.signed else 'unsigned'}: {arch.describe()}")
+    for r in reports:
+        lat = r["latency"]
+        line = (f"  {r['algorithm']:10s} {r['cycles']:,} cycles  {r['throughput']:.4f} ops/cycle  "
+                f"latency min/p50/p90/p99/max {lat['min']}/{lat['p50']}/{lat['p90']}/{lat['p99']}/{lat['max']}  "
+                f"(service {r['service']['min']}..{r['service']['max']})  utilization {r['utilization']:.1%}")
+        if r["clock_period"] is not None:
+            line += f"  clock {r['clock_period']} gd, {r['time']:,} gd total"
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
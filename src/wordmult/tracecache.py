@@ -0,0 +1,258 @@
+# tracecache.py
+"""Memoized traces: a bounded in-memory LRU with an optional on-disk store.
+
+Entries are keyed on (A_bin, B_bin, N, signed, algorithm key) and hold the
+(steps, product_bin, product_val) triple the step functions return.  The disk
+store is a directory of JSON files (registers as hex, op codes as ints)
+shared across sessions (and machines, if the directory is shared); entries
+are data only and are validated when read, so a foreign or corrupt file is a
+miss, never code.  The store is trimmed oldest-first once it grows past its
+size limit.  Disk writes take a lock, so store() can run on a worker thread
+while the owner keeps reading from memory.
+
+    cache = TraceCache(maxsize=512, disk_dir="~/.cache/wordmult")
+    steps, product_bin, product_val = cache.run(get_algorithm("booth"), A_bin, B_bin, 8)
+    cache.stats()  # {'hits': ..., 'misses': ..., ...}
+
+Set WORDMULT_CACHE_DIR to give the GUI a persistent cache.  Trace archives
+(archive.py) can be attached as read-only sources; they are consulted after
+the disk store, so archived runs are loaded instead of recomputed.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .steptrace import OP_LABELS, StepTrace
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_DISK_LIMIT = 256 * 1024 * 1024  # bytes
+DISK_SUFFIX = ".json"
+
+# ========== Disk entry format ==========
+def encode_entry(key, value):
+    """JSON text for one cache entry: the key plus the trace columns, registers in hex."""
+    steps, product_bin, product_val = value
+    a, q, ops = steps.columns()
+    return json.dumps({"key": list(key), "bits": steps.bits, "a": [format(v, "x") for v in a],
+                       "q": [format(v, "x") for v in q], "ops": list(ops),
+                       "product_bin": product_bin, "product": product_val}, separators=(",", ":"))
+
+def decode_entry(text, key):
+    """The (steps, product_bin, product_val) stored in text for key; ValueError if it is not exactly that."""
+    try:
+        entry = json.loads(text)
+        if entry["key"] != list(key):
+            raise ValueError("entry is for another key")  # hash collision or foreign file
+        bits = entry["bits"]
+        if type(bits) is not int or bits != key[2]:
+            raise ValueError("bad word width")
+        product_bin, product_val = entry["product_bin"], entry["product"]
+        if (not isinstance(product_bin, str) or product_bin.strip("01")
+                or type(product_val) is not int):
+            raise ValueError("bad product")
+        a, q, ops = entry["a"], entry["q"], entry["ops"]
+        if not (isinstance(a, list) and isinstance(q, list) and isinstance(ops, list)
+                and len(a) == len(q) == len(ops)):
+            raise ValueError("bad step columns")
+        steps = StepTrace(bits)
+        limit = 1 << bits
+        for a_hex, q_hex, op in zip(a, q, ops):
+            A, Q = int(a_hex, 16), int(q_hex, 16)
+            if not (0 <= A < limit and 0 <= Q < limit and type(op) is int and 0 <= op < len(OP_LABELS)):
+                raise ValueError("bad step")
+            steps.append(A, Q, op)
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"malformed cache entry: {e}") from None
+    return steps, product_bin, product_val
+
+# ========== Cache ==========
+class TraceCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, disk_dir=None, disk_limit=DEFAULT_DISK_LIMIT):
+        self.maxsize = maxsize
+        self.disk_dir = os.path.expanduser(disk_dir) if disk_dir else None
+        self.disk_limit = disk_limit
+        self._memory = OrderedDict()
+        self._disk_bytes = None  # measured lazily (measure_disk()), then kept current by the writers
+        self.hits = 0         # served from memory
+        self.disk_hits = 0    # served from disk (then promoted to memory)
+        self.misses = 0
+        self.evictions = 0    # memory entries dropped
+        self.disk_evictions = 0
+        self.archive_hits = 0
+        self.archives = []    # read-only TraceArchive sources
+        self._disk_lock = threading.Lock()
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls, maxsize=DEFAULT_MAXSIZE):
+        """Cache whose disk store (if any) comes from WORDMULT_CACHE_DIR."""
+        return cls(maxsize=maxsize, disk_dir=os.environ.get("WORDMULT_CACHE_DIR") or None)
+
+    @staticmethod
+    def make_key(A_bin, B_bin, N, signed, algorithm_key):
+        return (A_bin, B_bin, N, bool(signed), algorithm_key)
+
+    # ---------- lookup ----------
+    def get(self, key):
+        """Return the cached triple for key, or None."""
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return value
+        value = self._disk_get(key)
+        if value is not None:
+            self.disk_hits += 1
+            self._remember(key, value)
+            return value
+        for archive in self.archives:
+            value = archive.get(key)
+            if value is not None:
+                self.archive_hits += 1
+                self._remember(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value, disk=True):
+        """Remember value; disk=False leaves the disk write to a later store() (e.g. on a worker thread)."""
+        self._remember(key, value)
+        if disk:
+            self._disk_put(key, value)
+
+    def store(self, items):
+        """Write (key, value) pairs to the disk store only; safe to call off the owner's thread."""
+        for key, value in items:
+            self._disk_put(key, value)
+
+    def run(self, algorithm, A_bin, B_bin, N, signed=False):
+        """Return algorithm.run(...) from the cache, computing and storing it on a miss."""
+        key = self.make_key(A_bin, B_bin, N, signed, algorithm.key)
+        value = self.get(key)
+        if value is None:
+            value = algorithm.run(A_bin, B_bin, N, signed=signed)
+            self.put(key, value)
+        return value
+
+    def attach_archive(self, archive):
+        """Serve misses from a TraceArchive before recomputing."""
+        self.archives.append(archive)
+
+    def __contains__(self, key):
+        return key in self._memory or (self.disk_dir is not None and os.path.exists(self._path(key)))
+
+    def clear(self, disk=False):
+        self._memory.clear()
+        if disk and self.disk_dir:
+            with self._disk_lock:
+                for path in self._disk_files():
+                    os.remove(path)
+                self._disk_bytes = 0
+
+    def stats(self):
+        """Counters for display; disk_bytes is 0 until the disk store has been measured or written."""
+        found = self.hits + self.disk_hits + self.archive_hits
+        lookups = found + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "archive_hits": self.archive_hits,
+            "misses": self.misses,
+            "hit_rate": found / lookups if lookups else 0.0,
+            "entries": len(self._memory),
+            "maxsize": self.maxsize,
+            "evictions": self.evictions,
+            "disk_bytes": self._disk_bytes or 0,  # read without the lock: stats() must not wait for disk I/O
+            "disk_evictions": self.disk_evictions,
+        }
+
+    # ---------- memory LRU ----------
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    # ---------- disk store ----------
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.disk_dir, digest + DISK_SUFFIX)
+
+    def _disk_get(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = decode_entry(f.read(), key)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return value
+
+    def _disk_put(self, key, value):
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        text = encode_entry(key, value)
+        with self._disk_lock:
+            self._measure_disk()
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp, path)
+            except OSError:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                return
+            self._disk_bytes += os.path.getsize(path) - old_size
+            if self._disk_bytes > self.disk_limit:
+                self._evict_disk()
+
+    def measure_disk(self):
+        """Size of the disk store in bytes, listing the directory on first use (call it off the UI thread)."""
+        if not self.disk_dir:
+            return 0
+        with self._disk_lock:
+            return self._measure_disk()
+
+    def _measure_disk(self):
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(os.path.getsize(p) for p in self._disk_files())
+        return self._disk_bytes
+
+    def _disk_files(self):
+        return [os.path.join(self.disk_dir, n) for n in os.listdir(self.disk_dir) if n.endswith(DISK_SUFFIX)]
+
+    def _evict_disk(self):
+        """Delete least recently used files until the store is back to 90% of its limit."""
+        files = []
+        for path in self._disk_files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        target = self.disk_limit * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.disk_evictions += 1
+        self._disk_bytes = total
@@ -0,0 +1,141 @@
+# vectorized.py
+"""NumPy batch kernels for Shift-and-Add and Booth.
+
+Each kernel runs the N register-update iterations of the scalar functions in
+core.py as whole-array operations over a batch of operand pairs.  Operands are
+given as integer arrays and reduced to N-bit patterns (so -3 is 0b11111101 at
+N=8), which is exactly what int_to_twos_complement feeds the scalar versions.
+Registers come back as (N + 1, batch) integer arrays, row 0 being the
+"Initialize" state; no strings are produced.
+
+Throughput is roughly 4-6 million pairs per second per core, so a full
+16-bit x 16-bit sweep (2**32 pairs) is some 15-20 minutes of CPU time per
+algorithm and mode (verify.py spreads it over its worker pool).
+
+NumPy is optional: check NUMPY_AVAILABLE before calling.
+"""
+from collections import namedtuple
+
+from .steptrace import Op, StepTrace
+
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    NUMPY_AVAILABLE = False
+
+MAX_BITS = 32  # 2N-bit products must fit a 64-bit lane
+
+# A, Q, q_1: (N + 1, batch) register arrays (q_1 is None for Shift-and-Add)
+# ops: (N, batch) int8 -- Shift-and-Add: 1 = Add, 0 = No Add
+#                         Booth: -1 = A - M, +1 = A + M, 0 = No operation
+# product_bin: (batch,) uint64 2N-bit product patterns
+# product: (batch,) decimal products, signed or unsigned per the mode
+BatchTrace = namedtuple("BatchTrace", "A Q q_1 ops product_bin product")
+
+def _require_numpy(N):
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is required for the vectorized kernels")
+    if not 1 <= N <= MAX_BITS:
+        raise ValueError(f"vectorized kernels support 1..{MAX_BITS} bits, got {N}")
+
+def _lane_dtype(N):
+    # registers plus one add/subtract stay below 2**(N + 2); int32 halves memory traffic
+    return np.int32 if N <= 16 else np.int64
+
+def _as_bits(values, N):
+    """Reduce any integer array to its N-bit two's complement pattern."""
+    return (np.asarray(values, dtype=np.int64) & ((1 << N) - 1)).astype(_lane_dtype(N))
+
+def _product(A, Q, N, signed):
+    prod = (A.astype(np.uint64) << np.uint64(N)) | Q.astype(np.uint64)
+    if not signed:
+        return prod, prod
+    if N == MAX_BITS:
+        return prod, prod.view(np.int64)
+    vals = prod.astype(np.int64)
+    return prod, np.where(vals >> (2 * N - 1), vals - (1 << (2 * N)), vals)
+
+def shift_and_add_batch(A_vals, B_vals, N, signed=False, record_steps=True):
+    """Vectorized shift_and_add_steps over arrays of multiplicands and multipliers."""
+    _require_numpy(N)
+    mask = (1 << N) - 1
+    M = _as_bits(A_vals, N)
+    Q = _as_bits(B_vals, N)
+    M, Q = np.broadcast_arrays(M, Q)
+    Q = Q.copy()
+    A = np.zeros_like(Q)
+    A_rows = Q_rows = ops = None
+    if record_steps:
+        A_rows = np.empty((N + 1,) + Q.shape, dtype=Q.dtype)
+        Q_rows = np.empty_like(A_rows)
+        ops = np.empty((N,) + Q.shape, dtype=np.int8)
+        A_rows[0], Q_rows[0] = A, Q
+    for i in range(N):
+        add = Q & 1
+        A = (A + M * add) & mask
+        Q = (Q >> 1) | ((A & 1) << (N - 1))
+        A = A >> 1
+        if record_steps:
+            A_rows[i + 1], Q_rows[i + 1], ops[i] = A, Q, add
+    product_bin, product = _product(A, Q, N, signed)
+    return BatchTrace(A_rows, Q_rows, None, ops, product_bin, product)
+
+def booth_batch(A_vals, B_vals, N, signed=False, record_steps=True):
+    """Vectorized booth_steps over arrays of multiplicands and multipliers."""
+    _require_numpy(N)
+    mask = (1 << N) - 1
+    M = _as_bits(A_vals, N)
+    M = np.where(M >> (N - 1), M - (1 << N), M)  # two's complement value of A_bin
+    Q = _as_bits(B_vals, N)
+    M, Q = np.broadcast_arrays(M, Q)
+    Q = Q.copy()
+    A = np.zeros_like(Q)
+    q_1 = np.zeros_like(Q)
+    A_rows = Q_rows = q_rows = ops = None
+    if record_steps:
+        A_rows = np.empty((N + 1,) + Q.shape, dtype=Q.dtype)
+        Q_rows = np.empty_like(A_rows)
+        q_rows = np.empty_like(A_rows)
+        ops = np.empty((N,) + Q.shape, dtype=np.int8)
+        A_rows[0], Q_rows[0], q_rows[0] = A, Q, q_1
+    for i in range(N):
+        q0 = Q & 1
+        d = q_1 - q0  # (1, 0) -> -1: A - M;  (0, 1) -> +1: A + M
+        A = (A + d * M) & mask
+        sign = A >> (N - 1)
+        q_1 = q0
+        Q = (Q >> 1) | ((A & 1) << (N - 1))
+        A = (A >> 1) | (sign << (N - 1))
+        if record_steps:
+            A_rows[i + 1], Q_rows[i + 1], q_rows[i + 1], ops[i] = A, Q, q_1, d
+    product_bin, product = _product(A, Q, N, signed)
+    return BatchTrace(A_rows, Q_rows, q_rows, ops, product_bin, product)
+
+# ========== Helpers ==========
+SA_OPS = {0: Op.NO_ADD, 1: Op.ADD}
+BOOTH_OPS = {-1: Op.SUB_M, 0: Op.NO_OP, 1: Op.ADD_M}
+
+def batch_steps(trace, index, N):
+    """Extract one column of a recorded BatchTrace as a StepTrace like the scalar functions return."""
+    codes = SA_OPS if trace.q_1 is None else BOOTH_OPS
+    A, Q = trace.A[:, index].tolist(), trace.Q[:, index].tolist()
+    steps = StepTrace(N)
+    steps.append(A[0], Q[0], Op.INIT)
+    for i, op in enumerate(trace.ops[:, index].tolist()):
+        steps.append(A[i + 1], Q[i + 1], codes[op])
+    return steps
+
+def iter_sweep(N, chunk_rows=None):
+    """Yield (A_vals, B_vals) array chunks covering every N-bit x N-bit pattern pair.
+
+    Each chunk holds chunk_rows full rows of B (default: enough rows for ~1M pairs).
+    """
+    _require_numpy(N)
+    size = 1 << N
+    chunk_rows = chunk_rows or max(1, (1 << 20) // size)
+    b = np.arange(size, dtype=np.int64)
+    for start in range(0, size, chunk_rows):
+        a = np.arange(start, min(start + chunk_rows, size), dtype=np.int64)
+        yield np.repeat(a, size), np.tile(b, len(a))
@@ -0,0 +1,239 @@
+# workspace.py
+"""Sessions and the shared worker pool behind the GUI's tabbed workspace.
+
+A Session is one tab's inputs and results as plain data: only the visible
+tab owns widgets, so dozens of hidden comparisons cost no more than their
+traces.  Every tab submits its trace computation (and exports) to one
+bounded WorkerPool; tasks run lowest priority first, and the GUI
+reprioritizes a tab's pending tasks when it is shown or hidden so the
+visible tab is always served next.
+
+    pool = WorkerPool(workers=4, processes=True)
+    task = pool.submit(compute_run, 12, -5, 8, True, ("booth",), priority=VISIBLE, group=session, cpu=True)
+    ...
+    if task.done: results = task.result   # polled from Tk with after()
+
+With processes=True, tasks submitted with cpu=True run in a process pool of
+the same size, so concurrent recomputes use every core instead of sharing
+the GIL with the Tk thread; other tasks (exports, previews) run on the
+pool's threads.
+"""
+import heapq
+import itertools
+import os
+import threading
+
+from .core import DEFAULT_ALGORITHMS, get_algorithm, int_to_twos_complement
+from .gates import INTERACTIVE_BITS, time_trace
+from .limbs import DEFAULT_LIMB_BITS
+from .profiling import PROFILER
+from .throughput import Microarchitecture, random_pairs, stream_traces, throughput_report
+
+VISIBLE, HIDDEN = 0, 1  # task priorities: the shown tab first
+STREAM_STEPS = 16384    # throughput streams: the run's pair plus random ones, ~this many steps in total
+
+# ========== Worker pool ==========
+class Task:
+    """One unit of pool work; poll done, then read result or error."""
+    __slots__ = ("fn", "args", "priority", "group", "cpu", "seq", "result", "error", "cancelled", "_done")
+
+    def __init__(self, fn, args, priority, group, cpu, seq):
+        self.fn, self.args = fn, args
+        self.priority, self.group, self.cpu, self.seq = priority, group, cpu, seq
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self._done = threading.Event()
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """Drop the task if it has not started; a running task finishes but its result should be ignored."""
+        self.cancelled = True
+
+class WorkerPool:
+    """A fixed number of worker threads draining a priority queue (optionally backed by processes)."""
+
+    def __init__(self, workers=None, processes=False):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.processes = processes
+        self._heap = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._threads = []
+        self._running = 0
+        self._executor = None
+        self._closed = False
+
+    def submit(self, fn, *args, priority=HIDDEN, group=None, cpu=False):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("worker pool is shut down")
+            task = Task(fn, args, priority, group, cpu, next(self._seq))
+            heapq.heappush(self._heap, task)
+            if len(self._threads) < self.workers:  # threads start on demand
+                thread = threading.Thread(target=self._work, daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        return task
+
+    def reprioritize(self, group, priority):
+        """Move every pending task of group to priority (running tasks are unaffected)."""
+        with self._cond:
+            for task in self._heap:
+                if task.group is group:
+                    task.priority = priority
+            heapq.heapify(self._heap)
+
+    def stats(self):
+        with self._cond:
+            return {"workers": self.workers, "running": self._running,
+                    "pending": sum(1 for task in self._heap if not task.cancelled)}
+
+    def shutdown(self):
+        """Stop taking work; pending tasks are dropped, running ones finish in the background."""
+        with self._cond:
+            self._closed = True
+            for task in self._heap:
+                task.cancelled = True
+                task._done.set()
+            self._heap.clear()
+            self._cond.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                task = heapq.heappop(self._heap)
+                if task.cancelled:
+                    task._done.set()
+                    continue
+                self._running += 1
+            try:
+                task.result = self._call(task)
+            except Exception as e:
+                task.error = e
+            finally:
+                with self._cond:
+                    self._running -= 1
+                task._done.set()
+
+    def _call(self, task):
+        if task.cpu and self.processes:
+            if self._executor is None:
+                with self._cond:
+                    if self._executor is None:
+                        self._executor = _process_executor(self.workers)
+            return self._executor.submit(task.fn, *task.args).result()
+        return task.fn(*task.args)
+
+def _process_executor(workers):
+    # forkserver/spawn: forking a process that runs Tk and worker threads is not safe
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    methods = multiprocessing.get_all_start_methods()
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"))
+
+# ========== Sessions ==========
+class Session:
+    """One workspace tab: the form inputs and the results of its last finished run."""
+    _ids = itertools.count(1)
+
+    def __init__(self, name=None):
+        self.id = next(self._ids)
+        self.name = name or f"Session {self.id}"
+        # inputs, as last entered in the form
+        self.a_raw = ""
+        self.b_raw = ""
+        self.mode = "unsigned"
+        self.algorithms = list(DEFAULT_ALGORITHMS)
+        self.compare = True
+        self.adder_model = "Off"
+        self.unit_model = "Off"
+        self.limb_bits = DEFAULT_LIMB_BITS
+        # last finished run
+        self.operand_a = None
+        self.operand_b = None
+        self.bits = 8
+        self.results = {}       # algorithm (or limb variant) key -> (steps, product_bin, product_val)
+        self.timings = {}       # algorithm key -> wordmult.gates.GateTiming
+        self.throughput = {}    # algorithm key -> wordmult.throughput report
+        self.unit_latency = {}  # algorithm key -> cycles of this pair on an idle unit
+        self.shown = 0          # steps on screen when the tab was last hidden
+        self.task = None        # pending compute Task
+        self.error = None
+
+    @property
+    def busy(self):
+        return self.task is not None
+
+    def title(self):
+        mark = " …" if self.busy else " ⚠" if self.error else ""
+        if self.operand_a is None:
+            return self.name + mark
+        return f"{self.name}: {self.operand_a}×{self.operand_b}{mark}"
+
+def compute_preview(A_bin, B_bin, bits, signed, keys, profile=False):
+    """Pool entry point for the live preview: ({key: run() result}, phases) for keys only.
+
+    Nothing else is computed or shipped back; phases is what PROFILER.call()
+    recorded in a worker process when profile is set, else None.
+    """
+    results, phases, _ = PROFILER.call(_compute_traces, (A_bin, B_bin, bits, signed, keys), phases=profile)
+    return results, phases
+
+def _compute_traces(A_bin, B_bin, bits, signed, keys):
+    return {key: get_algorithm(key).run(A_bin, B_bin, bits, signed=signed) for key in keys}
+
+def compute_run(a, b, bits, signed, keys, cached=None, adder=None, unit=None, profile=False, capture=False):
+    """Pool entry point for one session run: traces plus the optional gate timing and throughput model.
+
+    cached holds traces the caller already has (they are not recomputed);
+    adder is a wordmult.gates adder key and unit the Microarchitecture
+    arguments, or None to skip either.  profile and capture mirror the
+    GUI's PROFILER state, which a worker process does not share.  Returns
+    (results, timings, throughput, unit_latency, profiling): the first four
+    keyed by algorithm, profiling the (phases, cProfile stats) of
+    PROFILER.call() for the GUI to merge.
+    """
+    result, phases, stats = PROFILER.call(_compute_run, (a, b, bits, signed, keys, cached, adder, unit),
+                                          phases=profile, capture=capture)
+    return (*result, (phases, stats))
+
+def _compute_run(a, b, bits, signed, keys, cached, adder, unit):
+    A_bin, B_bin = int_to_twos_complement(a, bits), int_to_twos_complement(b, bits)
+    cached = cached or {}
+    results = {key: cached[key] if key in cached else get_algorithm(key).run(A_bin, B_bin, bits, signed=signed)
+               for key in keys}
+    # gate timing and the unit model describe bit-serial datapaths; limb engines skip both
+    serial = {key: steps for key, (steps, _, _) in results.items() if get_algorithm(key).serial}
+    timings = {}
+    if adder is not None and bits <= INTERACTIVE_BITS:
+        timings = {key: time_trace(get_algorithm(key), A_bin, steps, adder) for key, steps in serial.items()}
+    throughput, unit_latency = {}, {}
+    if unit is not None:
+        arch = Microarchitecture(adder=adder, **unit)
+        count = max(16, min(256, STREAM_STEPS // bits))
+        pairs = random_pairs(count - 1, bits, signed)
+        for key, steps in serial.items():
+            algorithm = get_algorithm(key)
+            # the run's own trace leads the stream; only the random rest is computed
+            traces = [steps, *stream_traces(algorithm, pairs, bits, signed)]
+            throughput[key] = throughput_report(arch, algorithm, traces)
+            unit_latency[key] = arch.latency(algorithm, steps)
+    return results, timings, throughput, unit_latency
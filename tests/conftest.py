@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the scripts and the wordmult package live in src/ (run as "python src/batch.py", not installed)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,12 @@
+import pytest
+
+from wordmult.analysis import chunked
+
+def test_chunked_keeps_order_and_remainder():
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+
+@pytest.mark.parametrize("size", [0, -1])
+def test_chunked_rejects_empty_chunks(size):
+    with pytest.raises(ValueError, match="chunk size"):
+        chunked(range(3), size)
@@ -0,0 +1,68 @@
+import csv
+import io
+
+import pytest
+
+from archive import TraceArchive, TraceArchiveWriter, read_csv, write_csv
+from wordmult import get_algorithm, int_to_twos_complement
+
+RUNS = [("booth", 5, -3, 8, True), ("shift_add", 200, 17, 8, False), ("booth4", 12345, 678, 16, False),
+        ("karatsuba/16", 3 ** 60, 7 ** 30, 100, False)]
+
+def run(key, a, b, N, signed):
+    A_bin, B_bin = int_to_twos_complement(a, N), int_to_twos_complement(b, N)
+    return A_bin, B_bin, get_algorithm(key).run(A_bin, B_bin, N, signed=signed)
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = tmp_path / "runs.wmt"
+    with TraceArchiveWriter(str(path)) as writer:
+        for key, a, b, N, signed in RUNS:
+            A_bin, B_bin, (steps, _, _) = run(key, a, b, N, signed)
+            writer.add(get_algorithm(key).key, A_bin, B_bin, N, signed, steps)
+    return path
+
+def test_round_trip(archive_path):
+    with TraceArchive(str(archive_path)) as archive:
+        assert len(archive) == len(RUNS)
+        for i, (key, a, b, N, signed) in enumerate(RUNS):
+            A_bin, B_bin, (steps, product_bin, product) = run(key, a, b, N, signed)
+            entry = archive.entry(i)
+            assert (entry.algorithm, entry.bits, entry.signed, entry.A_bin, entry.B_bin) == (
+                get_algorithm(key).key, N, signed, A_bin, B_bin)
+            loaded, loaded_bin, loaded_product = archive.load(i)
+            assert list(loaded) == list(steps)
+            assert (loaded_bin, loaded_product) == (product_bin, product)
+            assert archive.step(i, -1) == steps[-1]
+            assert archive.find(get_algorithm(key).key, A_bin, B_bin, N, signed) == i
+
+def test_csv_round_trip(archive_path, tmp_path):
+    with TraceArchive(str(archive_path)) as archive:
+        text = io.StringIO()
+        write_csv(archive, csv.writer(text))
+        copy = tmp_path / "copy.wmt"
+        with TraceArchiveWriter(str(copy)) as writer:
+            assert read_csv(csv.reader(io.StringIO(text.getvalue())), writer) == len(RUNS)
+        with TraceArchive(str(copy)) as again:
+            for i in range(len(RUNS)):
+                assert again.entry(i) == archive.entry(i)
+                assert list(again.trace(i)) == list(archive.trace(i))
+
+def test_truncated_files_are_rejected(archive_path, tmp_path):
+    data = archive_path.read_bytes()
+    for size in (0, 10, 16, 40, len(data) // 2, len(data) - 1):
+        bad = tmp_path / f"bad{size}.wmt"
+        bad.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            TraceArchive(str(bad))
+
+def test_corrupt_footer_is_rejected(archive_path, tmp_path):
+    data = bytearray(archive_path.read_bytes())
+    data[-32:-24] = (len(data) * 2).to_bytes(8, "little")  # index offset past the end
+    bad = tmp_path / "bad.wmt"
+    bad.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="truncated"):
+        TraceArchive(str(bad))
+    bad.write_bytes(b"not an archive at all, just text" * 4)
+    with pytest.raises(ValueError, match="not a trace archive"):
+        TraceArchive(str(bad))
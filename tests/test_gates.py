@@ -0,0 +1,85 @@
+import itertools
+import random
+
+import pytest
+
+from wordmult import ALGORITHMS, get_algorithm, int_to_twos_complement
+from wordmult.gates import (ADDERS, AdderSimulator, OP_DIGITS, adder_operations, adder_width, build_adder,
+                            time_trace)
+from wordmult.steptrace import ADD_OPS, SUB_OPS
+
+SERIAL = [key for key, algorithm in ALGORITHMS.items() if algorithm.serial]
+EXHAUSTIVE_BITS = 6
+
+@pytest.mark.parametrize("width", range(1, EXHAUSTIVE_BITS + 1))
+@pytest.mark.parametrize("adder", ADDERS)
+def test_every_sum_is_exact(adder, width):
+    netlist = build_adder(adder, width)
+    sim = AdderSimulator(netlist)
+    mask = (1 << width) - 1
+    for x, y, cin in itertools.product(range(1 << width), range(1 << width), (0, 1)):
+        total, cout, delay = sim.add(x, y, cin)
+        assert (total, cout) == ((x + y + cin) & mask, (x + y + cin) >> width), (x, y, cin)
+        assert 0 <= delay <= netlist.critical_path
+
+@pytest.mark.parametrize("width", [8, 13, 32, 64, 100])
+@pytest.mark.parametrize("adder", ADDERS)
+def test_random_sums_are_exact(adder, width):
+    netlist = build_adder(adder, width)
+    sim = AdderSimulator(netlist)
+    rng = random.Random(f"{adder}/{width}")
+    for _ in range(200):
+        x, y, cin = rng.getrandbits(width), rng.getrandbits(width), rng.getrandbits(1)
+        total, cout, delay = sim.add(x, y, cin)
+        assert total + (cout << width) == x + y + cin
+        assert delay <= netlist.critical_path
+
+def test_unchanged_inputs_take_no_time():
+    sim = AdderSimulator(build_adder("ripple", 8))
+    sim.add(100, 27, 1)
+    changes = sim.changes
+    assert sim.add(100, 27, 1) == (128, 0, 0)
+    assert sim.changes == changes
+
+def test_lookahead_is_faster_than_ripple():
+    assert build_adder("lookahead", 64).critical_path < build_adder("ripple", 64).critical_path
+
+def test_unknown_adder():
+    with pytest.raises(ValueError, match="Unknown adder"):
+        build_adder("carry-save", 8)
+
+def trace(key, a, b, N, signed):
+    algorithm = get_algorithm(key)
+    A_bin = int_to_twos_complement(a, N)
+    return algorithm, A_bin, algorithm.run(A_bin, int_to_twos_complement(b, N), N, signed=signed)[0]
+
+@pytest.mark.parametrize("key", SERIAL)
+def test_replay_follows_the_add_and_subtract_steps(key):
+    signed = key != "shift_add"
+    rng = random.Random(key)
+    for N in (4, 8, 16):
+        lo, hi = (1 - (1 << (N - 1)), (1 << (N - 1)) - 1) if signed else (0, (1 << (N - 1)) - 1)
+        for _ in range(20):
+            algorithm, A_bin, steps = trace(key, rng.randint(lo, hi), rng.randint(lo, hi), N, signed)
+            M = int(A_bin, 2) if not signed else int(A_bin, 2) - ((A_bin[0] == "1") << N)
+            mask = (1 << adder_width(algorithm, N)) - 1
+            ops = steps.op_codes()
+            adder_steps = [i for i in range(1, len(ops)) if ops[i] in ADD_OPS or ops[i] in SUB_OPS]
+            replayed = list(adder_operations(algorithm, A_bin, steps))
+            assert [i for i, _, _, _ in replayed] == adder_steps
+            for i, x, y, cin in replayed:
+                digit = OP_DIGITS[ops[i]]
+                assert (y + cin) & mask == (digit * M) & mask
+                if algorithm.radix_bits == 1:
+                    assert x == steps.registers(i - 1)[0]
+            timing = time_trace(algorithm, A_bin, steps, "ripple")
+            assert len(timing.delays) == len(steps)
+            assert all(timing.delays[i] == 0 for i in range(len(steps)) if i not in adder_steps)
+            assert max(timing.delays) <= timing.critical_path
+
+def test_booth_replay_reproduces_the_accumulator():
+    # radix-2 Booth: each step's A is the adder's sum shifted right arithmetically
+    algorithm, A_bin, steps = trace("booth", -45, 77, 8, True)
+    for i, x, y, cin in adder_operations(algorithm, A_bin, steps):
+        total = (x + y + cin) & 0xFF
+        assert steps.registers(i)[0] == (total >> 1) | (total & 0x80)
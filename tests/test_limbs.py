@@ -0,0 +1,73 @@
+import itertools
+import random
+
+import pytest
+
+from wordmult import get_algorithm, int_to_twos_complement
+from wordmult.limbs import MAX_LIMBS, METHODS, limb_count
+
+LIMB_BITS = (2, 3, 4, 8, 16, 32)
+SAMPLE = 64
+
+def operand_range(N, signed):
+    return (-(1 << (N - 1)), (1 << (N - 1)) - 1) if signed else (0, (1 << N) - 1)
+
+def assert_product(algorithm, a, b, N, signed):
+    steps, product_bin, product = algorithm.run(int_to_twos_complement(a, N), int_to_twos_complement(b, N), N,
+                                                signed=signed)
+    assert product == a * b, (algorithm.key, a, b, N, signed)
+    assert product_bin == int_to_twos_complement(a * b, 2 * N)
+
+@pytest.mark.parametrize("signed", [False, True])
+@pytest.mark.parametrize("limb_bits", LIMB_BITS)
+@pytest.mark.parametrize("method", METHODS)
+def test_random_pairs_match_python(method, limb_bits, signed):
+    algorithm = get_algorithm(f"{method}/{limb_bits}")
+    rng = random.Random(f"{method}/{limb_bits}/{signed}")
+    for N in itertools.chain(range(1, 33), (48, 64, 100, 128, 256)):
+        if limb_count(N, limb_bits) > MAX_LIMBS:
+            continue
+        lo, hi = operand_range(N, signed)
+        pairs = [(lo, lo), (lo, hi), (hi, hi), (0, hi)]
+        pairs += [(rng.randint(lo, hi), rng.randint(lo, hi)) for _ in range(SAMPLE)]
+        for a, b in pairs:
+            assert_product(algorithm, a, b, N, signed)
+
+@pytest.mark.parametrize("N", range(1, 7))
+@pytest.mark.parametrize("method", METHODS)
+def test_every_small_pair_matches_python(method, N):
+    algorithm = get_algorithm(f"{method}/2")
+    for signed in (False, True):
+        lo, hi = operand_range(N, signed)
+        for a, b in itertools.product(range(lo, hi + 1), repeat=2):
+            assert_product(algorithm, a, b, N, signed)
+
+@pytest.mark.parametrize("limbs", [1, 2, 4, 8, 16])
+def test_limb_product_counts(limbs):
+    N = 8 * limbs
+    A_bin = B_bin = "1" * N
+    school, karatsuba = get_algorithm("schoolbook/8"), get_algorithm("karatsuba/8")
+    assert school.costs(school.run(A_bin, B_bin, N)[0])["limb_products"] == limbs * limbs
+    assert karatsuba.costs(karatsuba.run(A_bin, B_bin, N)[0])["limb_products"] == 3 ** (limbs.bit_length() - 1)
+
+def test_toom3_needs_fewer_products():
+    N = 8 * 81
+    toom3, karatsuba = get_algorithm("toom3/8"), get_algorithm("karatsuba/8")
+    costs = toom3.costs(toom3.run("1" * N, "1" * N, N)[0])
+    assert costs["exact_divisions"] > 0
+    assert costs["limb_products"] < karatsuba.costs(karatsuba.run("1" * N, "1" * N, N)[0])["limb_products"]
+
+def test_last_step_is_the_product():
+    steps, product_bin, _ = get_algorithm("karatsuba/4").run("10110011", "01101101", 8)
+    _, A, Q, _ = steps[-1]
+    assert A + Q == product_bin
+
+def test_too_many_limbs():
+    N = 2 * (MAX_LIMBS + 1)
+    with pytest.raises(ValueError, match="limbs"):
+        get_algorithm("schoolbook/2").run("0" * N, "0" * N, N)
+
+def test_limb_width_limits():
+    for key in ("karatsuba/1", "karatsuba/65", "karatsuba/x"):
+        with pytest.raises(ValueError, match="limb"):
+            get_algorithm(key)
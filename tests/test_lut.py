@@ -0,0 +1,74 @@
+import itertools
+import random
+
+import pytest
+
+from wordmult import ALGORITHMS, LOOKUP_TABLES, collect_steps, get_algorithm
+from wordmult.lut import (LookupTable, _records_numpy, _records_scalar, build_table, install_tables, table_path,
+                          uninstall_tables)
+from wordmult.vectorized import NUMPY_AVAILABLE
+
+SERIAL = [key for key, algorithm in ALGORITHMS.items() if algorithm.serial]
+EXHAUSTIVE_BITS = 5
+
+def simulate(key, A_bin, B_bin, N, signed):
+    """The generator's result, bypassing any installed table."""
+    return collect_steps(get_algorithm(key).steps(A_bin, B_bin, N, signed), N, signed)
+
+def patterns(N):
+    return [format(v, f"0{N}b") for v in range(1 << N)]
+
+@pytest.fixture(scope="module")
+def tables(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("lut")
+    for key, N in itertools.product(SERIAL, range(1, EXHAUSTIVE_BITS + 1)):
+        build_table(str(directory), key, N)
+    for key in ("shift_add", "booth"):
+        build_table(str(directory), key, 8)
+    return directory
+
+@pytest.mark.parametrize("N", range(1, EXHAUSTIVE_BITS + 1))
+@pytest.mark.parametrize("key", SERIAL)
+def test_every_pair_matches_simulation(tables, key, N):
+    table = LookupTable(table_path(str(tables), key, N))
+    try:
+        for A_bin, B_bin in itertools.product(patterns(N), repeat=2):
+            for signed in (False, True):
+                assert table.run(A_bin, B_bin, signed) == simulate(key, A_bin, B_bin, N, signed), (A_bin, B_bin)
+    finally:
+        table.close()
+
+@pytest.mark.parametrize("key", ["shift_add", "booth"])
+def test_sampled_pairs_match_simulation_at_8_bits(tables, key):
+    rng = random.Random(key)
+    table = LookupTable(table_path(str(tables), key, 8))
+    try:
+        for _ in range(500):
+            A_bin, B_bin = format(rng.getrandbits(8), "08b"), format(rng.getrandbits(8), "08b")
+            for signed in (False, True):
+                assert table.run(A_bin, B_bin, signed) == simulate(key, A_bin, B_bin, 8, signed), (A_bin, B_bin)
+    finally:
+        table.close()
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+@pytest.mark.parametrize("N", [1, 4, 6])
+@pytest.mark.parametrize("key", ["shift_add", "booth"])
+def test_numpy_and_scalar_builders_write_the_same_records(key, N):
+    assert b"".join(_records_numpy(key, N, chunk_rows=3)) == b"".join(_records_scalar(key, N))
+
+def test_installed_tables_serve_algorithm_run(tables):
+    try:
+        installed = install_tables(str(tables))
+        assert ("booth", 4) in installed
+        assert LOOKUP_TABLES[("booth", 4)] is not None
+        for A_bin, B_bin in [("0101", "1101"), ("1000", "0111"), ("1111", "1111")]:
+            assert get_algorithm("booth").run(A_bin, B_bin, 4, signed=True) == simulate("booth", A_bin, B_bin, 4, True)
+    finally:
+        uninstall_tables()
+    assert not LOOKUP_TABLES
+
+def test_build_rejects_unsupported_requests(tmp_path):
+    with pytest.raises(ValueError):
+        build_table(str(tmp_path), "booth", 17)
+    with pytest.raises(ValueError):
+        build_table(str(tmp_path), "karatsuba", 4)
@@ -0,0 +1,69 @@
+import pytest
+
+from wordmult import get_algorithm
+from wordmult.throughput import Microarchitecture, main, percentile, random_pairs, stream_traces, throughput_report
+
+@pytest.mark.parametrize("values, q, expected", [
+    ([1, 2, 3, 4, 5], 50, 3),
+    ([1, 2, 3, 4, 5], 0, 1),
+    ([1, 2, 3, 4, 5], 100, 5),
+    ([1, 2, 3, 4], 50, 2),
+    (list(range(1, 11)), 90, 9),
+    (list(range(1, 101)), 99, 99),
+    (list(range(1, 1001)), 99.9, 999),
+    ([7], 1, 7),
+])
+def test_nearest_rank(values, q, expected):
+    assert percentile(values, q) == expected
+
+def test_empty():
+    assert percentile([], 50) == 0
+
+def stream(key, N, pairs, signed=False):
+    algorithm = get_algorithm(key)
+    return algorithm, list(stream_traces(algorithm, pairs, N, signed))
+
+@pytest.mark.parametrize("key", ["shift_add", "booth"])
+@pytest.mark.parametrize("N", [4, 8, 16])
+def test_iterative_unit_retires_one_result_per_word(key, N):
+    algorithm, traces = stream(key, N, random_pairs(50, N, signed=key == "booth"), signed=key == "booth")
+    arch = Microarchitecture()
+    assert all(arch.stage_cycles(algorithm, steps) == [N] for steps in traces)
+    report = throughput_report(arch, algorithm, traces)
+    assert report["cycles"] == 50 * N
+    assert report["throughput"] == pytest.approx(1 / N)
+    assert report["latency"]["min"] == N  # the first operation waits for nobody
+
+def test_fully_pipelined_unit_approaches_one_result_per_cycle():
+    N = 16
+    algorithm, traces = stream("booth", N, random_pairs(2000, N, signed=True), signed=True)
+    arch = Microarchitecture(depth=None, unroll=None)
+    assert arch.stages(algorithm, N) == N
+    report = throughput_report(arch, algorithm, traces)
+    assert report["cycles"] == len(traces) + N - 1  # fill once, then one result per cycle
+    assert report["throughput"] > 0.99
+    assert report["service"]["max"] == N
+
+def test_more_units_raise_throughput():
+    N = 8
+    algorithm, traces = stream("shift_add", N, random_pairs(40, N))
+    one = throughput_report(Microarchitecture(), algorithm, traces)["throughput"]
+    four = throughput_report(Microarchitecture(units=4), algorithm, traces)["throughput"]
+    assert four == pytest.approx(4 * one)
+
+def test_early_termination_lowers_latency():
+    N = 16
+    pairs = [(a, b % 256) for a, b in random_pairs(200, N)]  # multipliers with idle top bits
+    algorithm, traces = stream("shift_add", N, pairs)
+    full, early = Microarchitecture(), Microarchitecture(early_termination=True)
+    assert all(early.latency(algorithm, steps) <= full.latency(algorithm, steps) for steps in traces)
+    spaced = N  # one arrival per word time: no queueing, latency is the unit's own
+    assert (throughput_report(early, algorithm, traces, spaced)["latency"]["mean"]
+            < throughput_report(full, algorithm, traces, spaced)["latency"]["mean"])
+
+def test_cli_rejects_non_positive_widths(capsys):
+    for bits in ("0", "-4"):
+        with pytest.raises(SystemExit) as exit_info:
+            main(["--bits", bits, "--random", "5"])
+        assert exit_info.value.code == 2
+    assert "--bits must be at least 1" in capsys.readouterr().err
@@ -0,0 +1,39 @@
+import threading
+
+from wordmult import get_algorithm
+from wordmult.tracecache import TraceCache
+
+def run(a_bin, b_bin):
+    return TraceCache.make_key(a_bin, b_bin, 8, False, "booth"), get_algorithm("booth").run(a_bin, b_bin, 8)
+
+def test_disk_round_trip(tmp_path):
+    key, value = run("00010111", "00001101")
+    TraceCache(disk_dir=str(tmp_path)).put(key, value)
+    fresh = TraceCache(disk_dir=str(tmp_path))
+    steps, product_bin, product = fresh.get(key)
+    assert (list(steps), product_bin, product) == (list(value[0]), value[1], value[2])
+    assert fresh.stats()["disk_hits"] == 1
+
+def test_disk_bytes_are_counted_without_the_lock(tmp_path):
+    writer = TraceCache(disk_dir=str(tmp_path))
+    writer.store([run("00010111", "00001101"), run("11110000", "00000011")])
+    size = sum(p.stat().st_size for p in tmp_path.iterdir())
+    assert writer.stats()["disk_bytes"] == size
+
+    cache = TraceCache(disk_dir=str(tmp_path))
+    assert cache.stats()["disk_bytes"] == 0  # not measured yet; stats() never lists the directory
+    with cache._disk_lock:  # a writer is busy on another thread
+        result = []
+        reader = threading.Thread(target=lambda: result.append(cache.stats()))
+        reader.start()
+        reader.join(5)
+        assert result, "stats() waited for the disk lock"
+    assert cache.measure_disk() == size
+    assert cache.stats()["disk_bytes"] == size
+
+def test_clear_resets_the_count(tmp_path):
+    cache = TraceCache(disk_dir=str(tmp_path))
+    cache.put(*run("00010111", "00001101"))
+    cache.clear(disk=True)
+    assert cache.stats()["disk_bytes"] == 0
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from wordmult import get_algorithm, int_to_twos_complement
+from wordmult.vectorized import MAX_BITS, batch_steps, booth_batch, iter_sweep, shift_and_add_batch
+
+KERNELS = {"shift_add": shift_and_add_batch, "booth": booth_batch}
+SAMPLE = 64       # random pairs per width and mode
+EXHAUSTIVE_BITS = 6
+
+def assert_matches_scalar(key, a_vals, b_vals, N, signed):
+    trace = KERNELS[key](np.array(a_vals), np.array(b_vals), N, signed=signed)
+    algorithm = get_algorithm(key)
+    for i, (a, b) in enumerate(zip(a_vals, b_vals)):
+        steps, product_bin, product = algorithm.run(int_to_twos_complement(a, N), int_to_twos_complement(b, N), N,
+                                                     signed=signed)
+        assert batch_steps(trace, i, N) == steps, (key, N, signed, a, b)
+        assert int(trace.product_bin[i]) == int(product_bin, 2), (key, N, signed, a, b)
+        assert int(trace.product[i]) == product, (key, N, signed, a, b)
+
+@pytest.mark.parametrize("signed", [False, True], ids=["unsigned", "signed"])
+@pytest.mark.parametrize("key", sorted(KERNELS))
+@pytest.mark.parametrize("N", range(1, MAX_BITS + 1))
+def test_random_pairs_match_scalar(key, N, signed):
+    rng = random.Random(f"{key}:{N}:{signed}")
+    a_vals = [rng.getrandbits(N) for _ in range(SAMPLE)]
+    b_vals = [rng.getrandbits(N) for _ in range(SAMPLE)]
+    assert_matches_scalar(key, a_vals, b_vals, N, signed)
+
+@pytest.mark.parametrize("signed", [False, True], ids=["unsigned", "signed"])
+@pytest.mark.parametrize("key", sorted(KERNELS))
+@pytest.mark.parametrize("N", range(1, EXHAUSTIVE_BITS + 1))
+def test_every_pair_matches_scalar(key, N, signed):
+    (a_vals, b_vals), = iter_sweep(N)
+    assert len(a_vals) == 1 << (2 * N)
+    assert_matches_scalar(key, a_vals.tolist(), b_vals.tolist(), N, signed)
+
+def test_negative_operands_are_reduced_to_patterns():
+    trace = booth_batch(np.array([-3, 5]), np.array([4, -7]), 8, signed=True)
+    assert trace.product.tolist() == [-12, -35]
+
+def test_products_without_recorded_steps():
+    trace = shift_and_add_batch(np.array([15, 20, 0]), np.array([15, 3, 17]), 8, record_steps=False)
+    assert trace.A is None
+    assert trace.product.tolist() == [225, 60, 0]
+    trace = booth_batch(np.array([-127, 100, 0]), np.array([127, -3, 17]), 8, signed=True, record_steps=False)
+    assert trace.A is None and trace.q_1 is None
+    assert trace.product.tolist() == [-127 * 127, -300, 0]
+
+def test_width_limits():
+    with pytest.raises(ValueError):
+        shift_and_add_batch(np.array([1]), np.array([1]), MAX_BITS + 1)